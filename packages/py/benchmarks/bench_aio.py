@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, aio, generate  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _probe(stop: asyncio.Event, interval: float, lags: list[float]) -> None:
+    # Stand-in for the host's other coroutines: how late does a 1 ms timer fire?
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def _measure(workload, interval: float) -> tuple[float, list[float]]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe = asyncio.create_task(_probe(stop, interval, lags))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await workload()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return elapsed, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event-loop lag: inline verify() vs trustproof.aio")
+    parser.add_argument("-n", type=int, default=2000, help="tokens to verify")
+    parser.add_argument("--concurrency", type=int, default=8, help="AsyncRunner max_concurrency")
+    parser.add_argument("--processes", type=int, default=2, help="workers for the process mode")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(args.n)]
+    verifier = Verifier(public_pem)
+    runner = aio.AsyncRunner(max_concurrency=args.concurrency)
+
+    async def inline() -> None:
+        # A handler that verifies a batch inline blocks the loop throughout.
+        for token in tokens:
+            verifier.verify(token)
+
+    async def offloaded() -> None:
+        await asyncio.gather(*(aio.verify(token, verifier, runner=runner) for token in tokens))
+
+    async def batched() -> None:
+        await aio.verify_many(tokens, verifier, runner=runner)
+
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        process_runner = aio.AsyncRunner(pool, max_concurrency=args.concurrency)
+
+        async def processes() -> None:
+            await aio.verify_many(tokens, verifier, runner=process_runner)
+
+        print(
+            f"{'mode':<12} {'tokens/s':>10} {'lag p50 ms':>11} {'lag p99 ms':>11} "
+            f"{'lag max ms':>11}"
+        )
+        modes = (
+            ("inline", inline),
+            ("aio", offloaded),
+            ("aio-batch", batched),
+            ("aio-process", processes),
+        )
+        for name, workload in modes:
+            elapsed, lags = asyncio.run(_measure(workload, 0.001))
+            lags = lags or [0.0]
+            print(
+                f"{name:<12} {args.n / elapsed:>10,.0f} {statistics.median(lags):>11.2f} "
+                f"{_percentile(lags, 0.99):>11.2f} {max(lags):>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append_many, iter_jsonl_tokens, verify_chain  # noqa: E402
+from trustproof.archive import ProofArchive, write_archive  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    value = fn()
+    return time.perf_counter() - started, value
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Proof archive vs JSONL: random access and loading")
+    parser.add_argument("-n", type=int, default=20_000, help="chain length")
+    parser.add_argument("--lookups", type=int, default=200, help="random entries to read")
+    parser.add_argument("--verify", action="store_true", help="also time verify_chain from each")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    with tempfile.TemporaryDirectory() as workdir:
+        jsonl_path = Path(workdir) / "chain.jsonl"
+        archive_path = Path(workdir) / "chain.tpa"
+        claims_iter = ({**claims, "jti": f"jti_{i}"} for i in range(args.n))
+        with jsonl_path.open("w", encoding="utf-8") as handle:
+            for token in append_many(None, claims_iter, private_pem):
+                handle.write(json.dumps({"jwt": token}) + "\n")
+        write_archive(archive_path, iter_jsonl_tokens(jsonl_path))
+
+        indexes = [random.randrange(args.n) for _ in range(args.lookups)]
+
+        def jsonl_lookup() -> None:
+            # Without an index, entry i means parsing every line before it.
+            for index in indexes:
+                for position, token in enumerate(iter_jsonl_tokens(jsonl_path)):
+                    if position == index:
+                        break
+
+        def archive_lookup() -> None:
+            with ProofArchive(archive_path) as archive:
+                for index in indexes:
+                    archive[index]
+
+        print(f"{'operation':<28} {'jsonl':>12} {'archive':>12}")
+        jsonl_seconds, _ = _timed(jsonl_lookup)
+        archive_seconds, _ = _timed(archive_lookup)
+        print(
+            f"{'random lookup (us/entry)':<28} {jsonl_seconds / args.lookups * 1e6:>12.1f} "
+            f"{archive_seconds / args.lookups * 1e6:>12.1f}"
+        )
+
+        def jsonl_load() -> None:
+            list(iter_jsonl_tokens(jsonl_path))
+
+        def archive_open() -> None:
+            with ProofArchive(archive_path) as archive:
+                len(archive)
+
+        print(
+            f"{'load/open peak (KiB)':<28} {_peak_kib(jsonl_load):>12.1f} "
+            f"{_peak_kib(archive_open):>12.1f}"
+        )
+        print(
+            f"{'file size (KiB)':<28} {jsonl_path.stat().st_size / 1024:>12.1f} "
+            f"{archive_path.stat().st_size / 1024:>12.1f}"
+        )
+
+        if args.verify:
+            jsonl_seconds, _ = _timed(
+                lambda: verify_chain(iter_jsonl_tokens(jsonl_path), public_pem)
+            )
+            with ProofArchive(archive_path) as archive:
+                archive_seconds, _ = _timed(lambda: verify_chain(archive, public_pem))
+            print(f"{'verify_chain (s)':<28} {jsonl_seconds:>12.3f} {archive_seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, VerifyCache, generate, hash_payload  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _per_call_us(fn, token: str, payloads: tuple, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn(token, *payloads)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="verify() cost with and without VerifyCache")
+    parser.add_argument("-n", type=int, default=5000, help="verifications per case")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    payload_in = {"tool": "payout.initiate", "amount_cents": 12345, "currency": "USD"}
+    payload_out = {"status": "queued", "payout_id": "po_1001"}
+    token = generate(
+        {
+            **claims,
+            "hashes": {
+                "input_hash": hash_payload(payload_in),
+                "output_hash": hash_payload(payload_out),
+            },
+        },
+        private_pem,
+    )
+    plain = Verifier(public_pem)
+    cache = VerifyCache()
+    cached = Verifier(public_pem, cache=cache)
+
+    print(f"{'case':<24} {'no cache':>12} {'cache hit':>12}")
+    for name, payloads in (("token only", ()), ("with payloads", (payload_in, payload_out))):
+        before = _per_call_us(plain.verify, token, payloads, args.n)
+        after = _per_call_us(cached.verify, token, payloads, args.n)
+        print(f"{name:<24} {before:>9.1f} us {after:>9.1f} us")
+    print(f"cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
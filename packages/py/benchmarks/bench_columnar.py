@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append_many  # noqa: E402
+from trustproof._jws import decode_untrusted  # noqa: E402
+from trustproof.columnar import ColumnarClaims, export_columnar  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar claims export: size and filter scans")
+    parser.add_argument("-n", type=int, default=20_000, help="proofs in the chain")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    claims_iter = (
+        {
+            **claims,
+            "resource": {"type": "payout", "id": f"po_{i}"},
+            "result": {"decision": "deny" if i % 10 == 0 else "allow", "reason_codes": []},
+            "jti": f"jti_{i}",
+        }
+        for i in range(args.n)
+    )
+    tokens = list(append_many(None, claims_iter, private_pem))
+
+    started = time.perf_counter()
+    table, _rejected = export_columnar(tokens, public_pem)
+    export_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "claims.tpc"
+        table.save(path)
+        columnar_size = path.stat().st_size
+        started = time.perf_counter()
+        loaded = ColumnarClaims.load(path)
+        load_seconds = time.perf_counter() - started
+
+    token_size = sum(len(token) + 1 for token in tokens)
+    inspect_size = sum(
+        len(json.dumps(decode_untrusted(token), separators=(",", ":"))) + 1 for token in tokens
+    )
+    print(f"{'jsonl tokens':<24} {token_size / 1024:>10.1f} KiB")
+    print(f"{'jsonl decoded claims':<24} {inspect_size / 1024:>10.1f} KiB")
+    print(f"{'columnar':<24} {columnar_size / 1024:>10.1f} KiB")
+    print(f"{'export (verify + encode)':<24} {export_seconds:>10.3f} s")
+    print(f"{'load':<24} {load_seconds * 1000:>10.1f} ms")
+
+    started = time.perf_counter()
+    decoded = [t for t in tokens if decode_untrusted(t)["result"]["decision"] == "deny"]
+    decode_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    selected = loaded.select(decision="deny")
+    select_seconds = time.perf_counter() - started
+    assert len(decoded) == len(selected)
+    print(f"{'filter by decoding':<24} {decode_seconds * 1000:>10.1f} ms")
+    print(f"{'filter by select()':<24} {select_seconds * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
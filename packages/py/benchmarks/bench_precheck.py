@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, VerifyLimits, generate  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _per_token_us(fn, tokens: list[str]) -> float:
+    started = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost of rejecting bad tokens with and without precheck")
+    parser.add_argument("-n", type=int, default=2000, help="tokens per case")
+    parser.add_argument("--junk-bytes", type=int, default=256_000, help="size of oversized tokens")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    good = generate(claims, private_pem, kid="k1")
+    header, payload, signature = good.split(".")
+    padding = "A" * args.junk_bytes
+    cases = {
+        "valid": good,
+        "oversized payload": f"{header}.{payload}{padding}.{signature}",
+        "bad shape": f"{header}.{payload}.{signature}.{padding}",
+        "wrong kid": generate(claims, private_pem, kid="attacker"),
+        "bad signature": f"{header}.{payload}.{signature[::-1]}",
+    }
+
+    plain = Verifier(public_pem)
+    guarded = Verifier(
+        public_pem,
+        limits=VerifyLimits(max_token_bytes=16_384, max_payload_bytes=8_192, kids=["k1"]),
+    )
+
+    print(f"{'case':<20} {'no precheck':>14} {'precheck':>14}")
+    for name, token in cases.items():
+        tokens = [token] * args.n
+        before = _per_token_us(plain.verify, tokens)
+        after = _per_token_us(guarded.verify, tokens)
+        print(f"{name:<20} {before:>11.1f} us {after:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
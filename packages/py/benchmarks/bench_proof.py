@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, generate  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _measure(fn, tokens: list[str]) -> tuple[float, float]:
+    # (microseconds per token, KiB retained per 1000 results)
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = [fn(token) for token in tokens]
+    elapsed = time.perf_counter() - started
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return elapsed / len(tokens) * 1e6, retained / 1024 / len(tokens) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="verify() dicts vs verify_proof() VerifyResults")
+    parser.add_argument("-n", type=int, default=5000, help="tokens per case")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(args.n)]
+
+    print(f"{'case':<26} {'us/token':>10} {'KiB/1k kept':>12}")
+    for label, verifier in (("passing", Verifier(public_pem)), ("bad signature", Verifier(other_public))):
+        for api, fn in (
+            ("dict", lambda token: verifier.verify(token, check_replay=False)),
+            ("VerifyResult", lambda token: verifier.verify_proof(token, check_replay=False)),
+        ):
+            per_token, kept = _measure(fn, tokens)
+            print(f"{label + ' ' + api:<26} {per_token:>10.1f} {kept:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
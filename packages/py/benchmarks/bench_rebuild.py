@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append_many  # noqa: E402
+from trustproof._jws import decode_untrusted  # noqa: E402
+from trustproof.rebuild import ChainIndex, rebuild_chains  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    value = fn()
+    return time.perf_counter() - started, value
+
+
+def _peak_kib(fn) -> float:
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _naive_rebuild(tokens: list[str]) -> list[list[str]]:
+    # Baseline: decoded claims and hex-string keys held per entry.
+    by_prev: dict[str, list[tuple[str, str]]] = {}
+    for token in tokens:
+        chain = decode_untrusted(token)["chain"]
+        by_prev.setdefault(chain["prev_hash"], []).append((chain["entry_hash"], token))
+    chains = []
+    for entry_hash, token in by_prev.get("0" * 64, []):
+        chain = [token]
+        while entry_hash in by_prev:
+            entry_hash, token = by_prev[entry_hash][0]
+            chain.append(token)
+        chains.append(chain)
+    return chains
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild chains from shuffled proofs")
+    parser.add_argument("-n", type=int, default=50_000, help="proofs in total")
+    parser.add_argument("--chains", type=int, default=10, help="independent chains")
+    parser.add_argument("--verify", action="store_true", help="also verify the rebuilt chains")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens: list[str] = []
+    per_chain = args.n // args.chains
+    for chain in range(args.chains):
+        claims_iter = ({**claims, "jti": f"jti_{chain}_{i}"} for i in range(per_chain))
+        tokens.extend(append_many(None, claims_iter, private_pem))
+    random.Random(0).shuffle(tokens)
+
+    def index_only() -> None:
+        with ChainIndex(tokens) as index:
+            assert len(index.chains) == args.chains
+
+    def index_stream() -> None:
+        with ChainIndex(iter(tokens)) as index:
+            assert len(index.chains) == args.chains
+
+    results = {
+        "n": len(tokens),
+        "naive_s": round(_timed(lambda: _naive_rebuild(tokens))[0], 3),
+        "naive_peak_kib": round(_peak_kib(lambda: _naive_rebuild(tokens))),
+        "index_s": round(_timed(index_only)[0], 3),
+        "index_peak_kib": round(_peak_kib(index_only)),
+        "stream_s": round(_timed(index_stream)[0], 3),
+        "stream_peak_kib": round(_peak_kib(index_stream)),
+    }
+    if args.verify:
+        elapsed, report = _timed(lambda: rebuild_chains(tokens, public_pem))
+        assert report["ok"], report["errors"][:3]
+        results["rebuild_and_verify_s"] = round(elapsed, 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, generate  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _per_token_us(fn, tokens: list[str]) -> float:
+    started = time.perf_counter()
+    for token in tokens:
+        fn(token)
+    return (time.perf_counter() - started) / len(tokens) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-token cost of PEM decode vs Verifier")
+    parser.add_argument("-n", type=int, default=5000, help="tokens to verify")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(args.n)]
+
+    def pem_decode(token: str) -> None:
+        jwt.decode(
+            token,
+            public_pem,
+            algorithms=["EdDSA"],
+            options={"verify_aud": False, "verify_iss": False},
+        )
+
+    verifier = Verifier(public_pem)
+    fast = Verifier(public_pem, fast_path=True)
+
+    baseline = _per_token_us(pem_decode, tokens)
+    reused = _per_token_us(verifier.decode, tokens)
+    fast_decode = _per_token_us(fast.decode, tokens)
+    full = _per_token_us(verifier.verify, tokens)
+
+    print(f"jwt.decode(pem)   {baseline:8.1f} us/token")
+    print(f"Verifier.decode   {reused:8.1f} us/token  ({baseline / reused:.2f}x)")
+    print(f"fast_path decode  {fast_decode:8.1f} us/token  ({baseline / fast_decode:.2f}x)")
+    print(f"Verifier.verify   {full:8.1f} us/token  (decode + schema checks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import ChainWriter, Signer  # noqa: E402
+from trustproof.writer import FileHeadStore, MemoryHeadStore, SQLiteHeadStore  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _appends_per_sec(writer: ChainWriter, claims: dict, chains: int, per_chain: int) -> float:
+    def write(chain: int) -> None:
+        for i in range(per_chain):
+            writer.append(f"chain-{chain}", {**claims, "jti": f"{chain}-{i}"})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=chains) as pool:
+        list(pool.map(write, range(chains)))
+    writer.flush()
+    return chains * per_chain / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ChainWriter appends/s per head store")
+    parser.add_argument("--chains", type=int, default=8, help="concurrent chains (threads)")
+    parser.add_argument("-n", type=int, default=200, help="appends per chain")
+    args = parser.parse_args()
+
+    claims = _load_allow_claims()
+    private_pem, _public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+    with tempfile.TemporaryDirectory() as workdir:
+        stores = {
+            "memory": lambda: MemoryHeadStore(),
+            "file batch=1": lambda: FileHeadStore(Path(workdir) / "a.json"),
+            "file batch=64": lambda: FileHeadStore(Path(workdir) / "b.json", batch_size=64),
+            "sqlite batch=1": lambda: SQLiteHeadStore(Path(workdir) / "a.sqlite"),
+            "sqlite batch=64": lambda: SQLiteHeadStore(Path(workdir) / "b.sqlite", batch_size=64),
+        }
+        print(f"{'head store':<18} {'appends/s':>10}")
+        for name, make_store in stores.items():
+            writer = ChainWriter(signer, head_store=make_store())
+            rate = _appends_per_sec(writer, claims, args.chains, args.n)
+            print(f"{name:<18} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
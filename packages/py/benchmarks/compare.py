@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _load(path: str) -> dict[tuple[str, str], dict[str, Any]]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {
+        (result["name"], json.dumps(result["params"], sort_keys=True)): result
+        for result in report["results"]
+    }
+
+
+def _ratio(new: float | None, old: float | None) -> float | None:
+    if not new or not old:
+        return None
+    return new / old
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Diff two benchmark suite JSON files")
+    parser.add_argument("baseline", help="Results from the reference run")
+    parser.add_argument("candidate", help="Results from the run under test")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Flag throughput drops or memory growth beyond this fraction (default 0.10)",
+    )
+    args = parser.parse_args()
+
+    baseline = _load(args.baseline)
+    candidate = _load(args.candidate)
+    regressions = 0
+
+    print(f"{'benchmark':<50} {'ops/s':>10} {'memory':>10}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        speed = _ratio(new["ops_per_sec"], old["ops_per_sec"])
+        memory = _ratio(new.get("peak_memory_bytes"), old.get("peak_memory_bytes"))
+        flagged = (speed is not None and speed < 1 - args.threshold) or (
+            memory is not None and memory > 1 + args.threshold
+        )
+        regressions += flagged
+        label = f"{key[0]} {' '.join(f'{k}={v}' for k, v in json.loads(key[1]).items())}"
+        speed_text = f"{(speed - 1) * 100:+.1f}%" if speed is not None else "n/a"
+        memory_text = f"{(memory - 1) * 100:+.1f}%" if memory is not None else "n/a"
+        print(f"{label:<50} {speed_text:>10} {memory_text:>10}{'  REGRESSION' if flagged else ''}")
+
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        side = "baseline" if key in baseline else "candidate"
+        print(f"{key[0]} {key[1]} only in {side}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
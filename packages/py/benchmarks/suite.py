@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import trustproof  # noqa: E402
+from trustproof import (  # noqa: E402
+    Signer,
+    Verifier,
+    append,
+    append_many,
+    generate,
+    hash_payload,
+    iter_verify_chain,
+    verify,
+)
+
+SCHEMA_VERSION = 1
+
+# Chain lengths in entries, payload sizes in bytes.
+PROFILES: dict[str, dict[str, list[int]]] = {
+    "quick": {"chain_lengths": [10, 1_000], "payload_sizes": [1_000, 100_000]},
+    "default": {
+        "chain_lengths": [10, 1_000, 10_000],
+        "payload_sizes": [1_000, 100_000, 1_000_000],
+    },
+    "full": {
+        "chain_lengths": [10, 1_000, 10_000, 100_000, 1_000_000],
+        "payload_sizes": [1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+    },
+}
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("utf-8")
+    )
+    return private_pem, public_pem
+
+
+def _synthetic_payload(size: int) -> dict[str, Any]:
+    # Roughly `size` bytes of canonical JSON shaped like a tool call: many
+    # small records rather than one big string, so canonicalization works.
+    record = {"id": "r000000", "amount_cents": 12345, "currency": "USD", "memo": "x" * 40}
+    record_size = len(json.dumps(record, separators=(",", ":"))) + 1
+    count = max(1, size // record_size)
+    return {
+        "tool": "payout.initiate",
+        "records": [{**record, "id": f"r{i:06d}"} for i in range(count)],
+    }
+
+
+def _claims_with_payload(claims: dict[str, Any], size: int) -> dict[str, Any]:
+    base = len(json.dumps(claims, separators=(",", ":")))
+    if size <= base:
+        return dict(claims)
+    policy = {**claims["policy"], "notes": "n" * (size - base)}
+    return {**claims, "policy": policy}
+
+
+def _human_size(size: int) -> str:
+    for unit, scale in (("MB", 1_000_000), ("KB", 1_000)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return f"{size}B"
+
+
+class Suite:
+    def __init__(self, min_time: float, measure_memory: bool) -> None:
+        self.min_time = min_time
+        self.measure_memory = measure_memory
+        self.results: list[dict[str, Any]] = []
+
+    def bench(
+        self,
+        name: str,
+        params: dict[str, Any],
+        op: Callable[[], Any],
+        *,
+        units_per_op: int = 1,
+        max_iterations: int = 100_000,
+    ) -> None:
+        # Calibrate with one call, then repeat until min_time has elapsed.
+        started = time.perf_counter()
+        op()
+        first = time.perf_counter() - started
+        iterations = 1
+        elapsed = first
+        if first < self.min_time:
+            target = min(max_iterations, max(1, int(self.min_time / max(first, 1e-9))))
+            started = time.perf_counter()
+            for _ in range(target):
+                op()
+            elapsed = time.perf_counter() - started
+            iterations = target
+
+        peak = None
+        if self.measure_memory:
+            tracemalloc.start()
+            op()
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        result = {
+            "name": name,
+            "params": params,
+            "iterations": iterations,
+            "seconds": round(elapsed, 6),
+            "ops_per_sec": round(iterations * units_per_op / elapsed, 3),
+            "peak_memory_bytes": peak,
+        }
+        self.results.append(result)
+        label = " ".join(f"{key}={value}" for key, value in params.items())
+        memory = f"{peak / 1024:10.1f} KiB" if peak is not None else ""
+        print(f"{name:<22} {label:<28} {result['ops_per_sec']:>14,.1f} ops/s {memory}")
+
+
+def _run(profile: dict[str, list[int]], suite: Suite, workdir: Path) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+    verifier = Verifier(public_pem)
+
+    for size in profile["payload_sizes"]:
+        params = {"payload": _human_size(size)}
+        sized_claims = _claims_with_payload(claims, size)
+        token = generate(sized_claims, signer)
+        suite.bench("generate", params, lambda: generate(sized_claims, signer))
+        suite.bench("verify", params, lambda: verify(token, verifier))
+        suite.bench("append", params, lambda: append(token, sized_claims, signer))
+
+        payload = _synthetic_payload(size)
+        expected_claims = {
+            **claims,
+            "hashes": {"input_hash": hash_payload(payload), "output_hash": hash_payload(payload)},
+        }
+        expected_token = generate(expected_claims, signer)
+        suite.bench(
+            "verify_expected",
+            params,
+            lambda: verify(expected_token, verifier, payload, payload),
+        )
+        suite.bench("hash_payload", params, lambda: hash_payload(payload))
+
+    for length in profile["chain_lengths"]:
+        params = {"entries": length}
+        # Chains are streamed to and from a JSONL file, so memory reflects
+        # the verifier's working set rather than the token list.
+        log_path = workdir / f"chain-{length}.jsonl"
+
+        def build_chain() -> None:
+            claims_iter = ({**claims, "jti": f"jti_{i}"} for i in range(length))
+            with log_path.open("w", encoding="utf-8") as handle:
+                for token in append_many(None, claims_iter, signer):
+                    handle.write(token + "\n")
+
+        def walk_chain() -> None:
+            for record in iter_verify_chain(log_path, verifier):
+                if record["event"] == "result" and not record["ok"]:
+                    raise RuntimeError(f"Benchmark chain failed to verify: {record['errors']}")
+
+        suite.bench("append_many", params, build_chain, units_per_op=length, max_iterations=10)
+        suite.bench("verify_chain", params, walk_chain, units_per_op=length, max_iterations=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TrustProof Python benchmark suite")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument(
+        "--chain-lengths", type=int, nargs="+", help="Override the profile's chain lengths"
+    )
+    parser.add_argument(
+        "--payload-sizes", type=int, nargs="+", help="Override the profile's payload sizes (bytes)"
+    )
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per measurement")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak pass")
+    parser.add_argument("-o", "--output", default="bench-results.json", help="JSON results path")
+    args = parser.parse_args()
+
+    profile = dict(PROFILES[args.profile])
+    if args.chain_lengths:
+        profile["chain_lengths"] = args.chain_lengths
+    if args.payload_sizes:
+        profile["payload_sizes"] = args.payload_sizes
+
+    suite = Suite(args.min_time, measure_memory=not args.no_memory)
+    with tempfile.TemporaryDirectory() as workdir:
+        _run(profile, suite, Path(workdir))
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "trustproof_version": trustproof.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "min_time": args.min_time,
+        },
+        "results": suite.results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {len(suite.results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
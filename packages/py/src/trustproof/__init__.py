@@ -1,7 +1,95 @@
-from .chain import append, verify_chain
-from .generate import generate
-from .verify import verify
+from __future__ import annotations
 
-__all__ = ["__version__", "generate", "verify", "append", "verify_chain"]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chain import (
+        append,
+        append_many,
+        iter_jsonl_tokens,
+        iter_verify_chain,
+        verify_chain,
+    )
+    from .cache import VerifyCache
+    from .canonical import hash_payload
+    from ._generate import Signer, generate
+    from .keys import KeyRing
+    from .metrics import Metrics
+    from .proof import Proof, VerifyResult
+    from .replay import ReplayStore
+    from .store import ProofStore
+    from ._verify import Verifier, VerifyLimits, verify
+    from .writer import ChainWriter
+
+__all__ = [
+    "__version__",
+    "generate",
+    "verify",
+    "append",
+    "append_many",
+    "verify_chain",
+    "hash_payload",
+    "iter_verify_chain",
+    "iter_jsonl_tokens",
+    "Verifier",
+    "Signer",
+    "ChainWriter",
+    "ReplayStore",
+    "ProofStore",
+    "Metrics",
+    "VerifyLimits",
+    "KeyRing",
+    "VerifyCache",
+    "Proof",
+    "VerifyResult",
+]
 
 __version__ = "0.1.0"
+
+# Public names resolve on first access, so `import trustproof` (and the
+# `inspect` CLI path) does not pull in PyJWT and cryptography.
+_LAZY_ATTRS = {
+    "append": "chain",
+    "append_many": "chain",
+    "iter_jsonl_tokens": "chain",
+    "iter_verify_chain": "chain",
+    "verify_chain": "chain",
+    "VerifyCache": "cache",
+    "hash_payload": "canonical",
+    "Signer": "_generate",
+    "generate": "_generate",
+    "KeyRing": "keys",
+    "Metrics": "metrics",
+    "Proof": "proof",
+    "VerifyResult": "proof",
+    "ReplayStore": "replay",
+    "ProofStore": "store",
+    "Verifier": "_verify",
+    "VerifyLimits": "_verify",
+    "verify": "_verify",
+    "ChainWriter": "writer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+# Importing a submodule binds it as a package attribute, but only the first
+# time. Import the (cheap, forwarding) `generate` and `verify` submodules now
+# and drop those bindings, so the names resolve to the functions through
+# __getattr__. `from . import` would probe __getattr__ and load them eagerly.
+for _submodule in ("generate", "verify"):
+    importlib.import_module(f".{_submodule}", __name__)
+    del globals()[_submodule]
+del _submodule
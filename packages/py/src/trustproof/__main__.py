@@ -4,10 +4,17 @@ import argparse
 import base64
 import json
 import sys
+import time
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from .verify import verify as verify_token
+if TYPE_CHECKING:
+    from .proof import VerifyResult
+    from ._verify import Verifier
+
+# Commands import the verification stack (PyJWT, cryptography) when they run,
+# so `inspect` and `--help` start without it.
 
 
 def _decode_base64url_to_utf8(value: str) -> str:
@@ -39,6 +46,21 @@ def _load_public_key_pem(pubkey_arg: str) -> str:
     return _decode_base64url_to_utf8(pubkey_arg)
 
 
+def _load_verifier(pubkey_arg: str) -> Verifier:
+    # A key directory (one <kid>.pem per key) or a JWKS file selects keys by
+    # kid; anything else is a single PEM.
+    from .keys import KeyRing
+    from ._verify import Verifier
+
+    if "BEGIN PUBLIC KEY" not in pubkey_arg:
+        path = Path(pubkey_arg)
+        if path.is_dir():
+            return KeyRing.from_directory(path)
+        if path.is_file() and path.read_text(encoding="utf-8").lstrip().startswith("{"):
+            return KeyRing.from_jwks(path)
+    return Verifier(_load_public_key_pem(pubkey_arg))
+
+
 def _format_verify_summary(claims: Any) -> str:
     if not isinstance(claims, dict):
         return "✅ Verified"
@@ -84,26 +106,343 @@ def _format_not_verified(errors: list[dict[str, Any]]) -> str:
     for error in errors:
         code = error.get("code", "UNKNOWN_ERROR")
         message = error.get("message", "Unknown verification error.")
+        if "index" in error:
+            message = f"{message} (index {error['index']})"
         lines.append(f"{code}: {message}")
     return "\n".join(lines)
 
 
+_PUBKEY_HELP = "Public key PEM, base64 PEM, path, key directory (<kid>.pem) or JWKS file"
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="trustproof", description="TrustProof CLI v0")
     subparsers = parser.add_subparsers(dest="command")
 
     verify_parser = subparsers.add_parser("verify", help="Verify a signed TrustProof JWT")
     verify_parser.add_argument("jwt", help="JWT token")
-    verify_parser.add_argument("--pubkey", required=True, help="Public key PEM, base64 PEM, or path")
+    verify_parser.add_argument("--pubkey", required=True, help=_PUBKEY_HELP)
     verify_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
 
     inspect_parser = subparsers.add_parser("inspect", help="Inspect JWT payload without verification")
     inspect_parser.add_argument("jwt", help="JWT token")
     inspect_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
 
+    chain_parser = subparsers.add_parser(
+        "verify-chain", help="Verify a chain of JWTs stored one per line (JSONL)"
+    )
+    chain_parser.add_argument("file", help="Path to a JSONL proof log or proof archive")
+    chain_parser.add_argument("--pubkey", required=True, help=_PUBKEY_HELP)
+    chain_parser.add_argument(
+        "--checkpoint", help="Checkpoint file; resume from it and update it after verifying"
+    )
+    chain_parser.add_argument(
+        "--follow", action="store_true", help="Keep tailing the log and verify appended entries"
+    )
+    chain_parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds between polls with --follow"
+    )
+    chain_parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes for signature/hash checks"
+    )
+    chain_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
+    batch_parser = subparsers.add_parser(
+        "verify-batch", help="Verify independent JWTs, one per line, emitting JSONL results"
+    )
+    batch_parser.add_argument("file", nargs="?", default="-", help="Token file, or - for stdin")
+    batch_parser.add_argument("--pubkey", required=True, help=_PUBKEY_HELP)
+    batch_parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    batch_parser.add_argument(
+        "--json", action="store_true", help="Emit the final summary as JSON (on stderr)"
+    )
+
+    archive_parser = subparsers.add_parser(
+        "archive", help="Pack a JSONL proof log into a memory-mappable binary archive"
+    )
+    archive_parser.add_argument("file", help="Path to a JSONL proof log")
+    archive_parser.add_argument("output", help="Archive path to write")
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-chains",
+        help="Order unsorted proofs into chains and report forks, gaps and orphans",
+    )
+    rebuild_parser.add_argument("file", help="Path to a JSONL proof log or proof archive")
+    rebuild_parser.add_argument(
+        "--pubkey", help=f"{_PUBKEY_HELP}; verifies every rebuilt chain when given"
+    )
+    rebuild_parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes for signature/hash checks"
+    )
+    rebuild_parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+
     return parser
 
 
+def _print_pubkey_load_error(exc: Exception, as_json: bool) -> None:
+    result = {
+        "ok": False,
+        "errors": [{"code": "PUBKEY_LOAD_ERROR", "message": str(exc)}],
+    }
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print(_format_not_verified(result["errors"]), file=sys.stderr)
+
+
+def _print_input_error(exc: Exception, as_json: bool) -> None:
+    error = {"code": "INPUT_ERROR", "message": str(exc)}
+    if as_json:
+        print(json.dumps({"ok": False, "errors": [error]}, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print(f"FAIL\n{exc}", file=sys.stderr)
+
+
+def _throughput_stats(
+    latencies: list[float], elapsed: float, first_failing_index: int | None
+) -> dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def _percentile_ms(fraction: float) -> float | None:
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+    return {
+        "tokens": len(ordered),
+        "seconds": round(elapsed, 6),
+        "tokens_per_sec": round(len(ordered) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": _percentile_ms(0.50),
+        "p99_ms": _percentile_ms(0.99),
+        "first_failing_index": first_failing_index,
+    }
+
+
+def _format_stats(stats: dict[str, Any]) -> str:
+    first = stats["first_failing_index"]
+    return (
+        f"Throughput: {stats['tokens']} tokens in {stats['seconds']:.3f}s "
+        f"({stats['tokens_per_sec'] or 0:.0f} tokens/s), "
+        f"p50 {stats['p50_ms'] or 0:.3f} ms, p99 {stats['p99_ms'] or 0:.3f} ms, "
+        f"first failing index: {'none' if first is None else first}"
+    )
+
+
+def _format_chain_result(record: dict[str, Any]) -> str:
+    checkpoint = record.get("checkpoint") or {}
+    lines = ["✅ Chain verified", f"Entries: {record.get('count', 0)}"]
+    if "index" in checkpoint:
+        lines.append(f"Last index: {checkpoint['index']}")
+    lines.append(f"Head: {_short_hash(record.get('head'))}")
+    return "\n".join(lines)
+
+
+def _run_verify_chain(args: argparse.Namespace) -> int:
+    from .chain import iter_verify_chain
+    from .checkpoint import (
+        follow_chain,
+        load_checkpoint,
+        save_checkpoint,
+        verify_chain_incremental,
+    )
+
+    try:
+        verifier = _load_verifier(args.pubkey)
+    except Exception as exc:  # noqa: BLE001
+        _print_pubkey_load_error(exc, args.json)
+        return 1
+
+    try:
+        checkpoint = load_checkpoint(args.checkpoint) if args.checkpoint else None
+    except (OSError, ValueError) as exc:
+        _print_input_error(exc, args.json)
+        return 1
+    workers = args.jobs if args.jobs > 1 else None
+    latencies: list[float] = []
+    if args.follow:
+        records = follow_chain(
+            args.file,
+            verifier,
+            checkpoint,
+            checkpoint_path=args.checkpoint,
+            poll_interval=args.poll_interval,
+            workers=workers,
+        )
+    elif args.checkpoint:
+        records = verify_chain_incremental(
+            args.file, verifier, checkpoint, workers=workers, latencies=latencies
+        )
+    else:
+        records = iter_verify_chain(args.file, verifier, workers=workers, latencies=latencies)
+
+    ok = True
+    started = time.perf_counter()
+    try:
+        for record in records:
+            if record["event"] != "result":
+                continue
+            ok = record["ok"]
+            if ok and args.checkpoint and not args.follow and record.get("checkpoint"):
+                save_checkpoint(args.checkpoint, record["checkpoint"])
+            if not args.follow:
+                first_failing = None if ok else record["errors"][0].get("index")
+                record["stats"] = _throughput_stats(
+                    latencies, time.perf_counter() - started, first_failing
+                )
+            if args.json:
+                print(json.dumps(record, ensure_ascii=False, separators=(",", ":")), flush=True)
+            elif ok:
+                print(_format_chain_result(record), flush=True)
+            else:
+                print(_format_not_verified(record["errors"]), file=sys.stderr)
+            if "stats" in record and not args.json:
+                print(_format_stats(record["stats"]), file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as exc:
+        # A missing log, or a line that holds no token.
+        _print_input_error(exc, args.json)
+        return 1
+
+    return 0 if ok else 1
+
+
+_REBUILD_LISTED_CHAINS = 20
+
+
+def _format_rebuild_result(report: dict[str, Any]) -> str:
+    lines = [
+        "✅ Chains rebuilt" if report["ok"] else "❌ Chains rebuilt with errors",
+        f"Entries: {report['count']}",
+        f"Chains: {len(report['chains'])}",
+    ]
+    for number, chain in enumerate(report["chains"][:_REBUILD_LISTED_CHAINS]):
+        status = "" if "ok" not in chain else (" ok" if chain["ok"] else " FAILED")
+        lines.append(
+            f"  #{number} {chain['root']} from {_short_hash(chain['prev_hash'])}: "
+            f"{chain['length']} entries, head {_short_hash(chain['head'])}{status}"
+        )
+    if len(report["chains"]) > _REBUILD_LISTED_CHAINS:
+        lines.append(f"  … {len(report['chains']) - _REBUILD_LISTED_CHAINS} more")
+    lines.append(
+        f"Forks: {len(report['forks'])}, gaps: {len(report['gaps'])}, "
+        f"orphans: {len(report['orphans'])}, duplicates: {report['duplicates']}, "
+        f"invalid: {len(report['invalid'])}"
+    )
+    return "\n".join(lines)
+
+
+def _run_rebuild_chains(args: argparse.Namespace) -> int:
+    from .archive import ProofArchive, is_archive
+    from .chain import iter_jsonl_tokens
+    from .rebuild import rebuild_chains
+
+    verifier = None
+    if args.pubkey:
+        try:
+            verifier = _load_verifier(args.pubkey)
+        except Exception as exc:  # noqa: BLE001
+            _print_pubkey_load_error(exc, args.json)
+            return 1
+
+    workers = args.jobs if args.jobs > 1 else None
+    try:
+        if is_archive(args.file):
+            with ProofArchive(args.file) as archive:
+                report = rebuild_chains(archive, verifier, workers=workers)
+        else:
+            report = rebuild_chains(iter_jsonl_tokens(args.file), verifier, workers=workers)
+    except (OSError, ValueError) as exc:
+        print(f"FAIL\n{exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print(_format_rebuild_result(report))
+        if report["errors"]:
+            print(_format_not_verified(report["errors"]), file=sys.stderr)
+    return 0 if report["ok"] else 1
+
+
+def _iter_batch_tokens(source: str) -> Iterator[str | ValueError]:
+    # A line that holds no token is passed on as its ValueError, so it is
+    # reported as one invalid result instead of ending the batch.
+    from .chain import parse_token_line
+
+    handle = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(handle, start=1):
+            try:
+                token = parse_token_line(line, f"Line {line_number}")
+            except ValueError as exc:
+                yield ValueError(f"Line {line_number}: {exc}")
+                continue
+            if token is not None:
+                yield token
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _verify_batch_timed(
+    verifier: Verifier, tokens: list[str | ValueError]
+) -> list[tuple[VerifyResult, float | None]]:
+    from .proof import VerifyResult
+
+    timed: list[tuple[VerifyResult, float | None]] = []
+    for token in tokens:
+        if isinstance(token, ValueError):
+            error = ("INPUT_ERROR", str(token), None)
+            timed.append((VerifyResult(False, None, None, (error,)), None))
+            continue
+        started = time.perf_counter()
+        result = verifier.verify_proof(token, check_replay=False)
+        timed.append((result, time.perf_counter() - started))
+    return timed
+
+
+def _run_verify_batch(args: argparse.Namespace) -> int:
+    from ._parallel import map_chunks
+
+    try:
+        verifier = _load_verifier(args.pubkey)
+    except Exception as exc:  # noqa: BLE001
+        _print_pubkey_load_error(exc, args.json)
+        return 1
+
+    latencies: list[float] = []
+    first_failing: int | None = None
+    started = time.perf_counter()
+    results = map_chunks(
+        _verify_batch_timed,
+        _iter_batch_tokens(args.file),
+        verifier,
+        workers=args.jobs if args.jobs > 1 else None,
+    )
+    try:
+        for index, (result, elapsed) in enumerate(results):
+            if elapsed is not None:
+                latencies.append(elapsed)
+            line: dict[str, Any] = {"index": index, "ok": result.ok, "errors": result.errors}
+            claims = result.claims
+            if isinstance(claims, dict) and "jti" in claims:
+                line["jti"] = claims["jti"]
+            if not result.ok and first_failing is None:
+                first_failing = index
+            print(json.dumps(line, ensure_ascii=False, separators=(",", ":")))
+    except OSError as exc:
+        _print_input_error(exc, args.json)
+        return 1
+
+    stats = _throughput_stats(latencies, time.perf_counter() - started, first_failing)
+    if args.json:
+        print(json.dumps(stats, separators=(",", ":")), file=sys.stderr)
+    else:
+        print(_format_stats(stats), file=sys.stderr)
+    return 0 if first_failing is None else 1
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
@@ -136,19 +475,12 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.command == "verify":
         try:
-            public_key_pem = _load_public_key_pem(args.pubkey)
+            verifier = _load_verifier(args.pubkey)
         except Exception as exc:  # noqa: BLE001
-            result = {
-                "ok": False,
-                "errors": [{"code": "PUBKEY_LOAD_ERROR", "message": str(exc)}],
-            }
-            if args.json:
-                print(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
-            else:
-                print(_format_not_verified(result["errors"]), file=sys.stderr)
+            _print_pubkey_load_error(exc, args.json)
             return 1
 
-        result = verify_token(args.jwt, public_key_pem)
+        result = verifier.verify(args.jwt)
 
         if args.json:
             print(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
@@ -159,6 +491,27 @@ def main(argv: list[str] | None = None) -> int:
 
         return 0 if result.get("ok") else 1
 
+    if args.command == "verify-chain":
+        return _run_verify_chain(args)
+
+    if args.command == "verify-batch":
+        return _run_verify_batch(args)
+
+    if args.command == "archive":
+        from .archive import write_archive
+        from .chain import iter_jsonl_tokens
+
+        try:
+            summary = write_archive(args.output, iter_jsonl_tokens(args.file))
+        except (OSError, ValueError) as exc:
+            print(f"FAIL\n{exc}", file=sys.stderr)
+            return 1
+        print(json.dumps(summary, separators=(",", ":")))
+        return 0
+
+    if args.command == "rebuild-chains":
+        return _run_rebuild_chains(args)
+
     parser.print_help()
     return 1
 
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+import time
+from calendar import timegm
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+from ._jws import b64url_encode
+
+if TYPE_CHECKING:
+    from .metrics import Metrics
+
+HEX_64_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+# Same byte layout PyJWT produces: compact separators, sorted header keys.
+_PAYLOAD_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_HEADER_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+
+def _is_hex64(value: Any) -> bool:
+    return isinstance(value, str) and bool(HEX_64_RE.fullmatch(value))
+
+
+def _validate_for_generate(claims: dict[str, Any]) -> None:
+    jti = claims.get("jti")
+    if not isinstance(jti, str) or not jti.strip():
+        raise ValueError("Invalid claims: jti must be a non-empty string.")
+
+    chain = claims.get("chain")
+    if not isinstance(chain, dict):
+        raise ValueError("Invalid claims: chain must be an object.")
+
+    prev_hash = chain.get("prev_hash")
+    entry_hash = chain.get("entry_hash")
+    if not _is_hex64(prev_hash):
+        raise ValueError("Invalid claims: chain.prev_hash must be a 64-char hex string.")
+    if not _is_hex64(entry_hash):
+        raise ValueError("Invalid claims: chain.entry_hash must be a 64-char hex string.")
+
+
+def _load_ed25519_private_key(private_key_pem: str) -> Ed25519PrivateKey:
+    try:
+        private_key = load_pem_private_key(private_key_pem.encode("utf-8"), password=None)
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Invalid private key PEM: {exc}") from exc
+    if not isinstance(private_key, Ed25519PrivateKey):
+        raise ValueError("Private key must be an Ed25519 key.")
+    return private_key
+
+
+class Signer:
+    def __init__(self, private_key_pem: str) -> None:
+        self._private_key_pem = private_key_pem
+        self._private_key = _load_ed25519_private_key(private_key_pem)
+        self._header_segments: dict[str | None, bytes] = {}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Key objects are not picklable; rebuild from PEM in worker processes.
+        return (type(self), (self._private_key_pem,))
+
+    def _header_segment(self, kid: str | None) -> bytes:
+        segment = self._header_segments.get(kid)
+        if segment is None:
+            headers: dict[str, Any] = {"alg": "EdDSA", "typ": "JWT"}
+            if kid is not None:
+                if not isinstance(kid, str):
+                    raise ValueError("kid must be a string.")
+                headers["kid"] = kid
+            segment = b64url_encode(_HEADER_ENCODER.encode(headers).encode("utf-8"))
+            self._header_segments[kid] = segment
+        return segment
+
+    def encode(
+        self,
+        payload: dict[str, Any],
+        kid: str | None = None,
+        *,
+        metrics: Metrics | None = None,
+    ) -> str:
+        started = time.perf_counter() if metrics is not None else 0.0
+        for claim in TIME_CLAIMS:
+            if isinstance(payload.get(claim), datetime):
+                payload[claim] = timegm(payload[claim].utctimetuple())
+
+        signing_input = (
+            self._header_segment(kid)
+            + b"."
+            + b64url_encode(_PAYLOAD_ENCODER.encode(payload).encode("utf-8"))
+        )
+        if metrics is None:
+            signature = self._private_key.sign(signing_input)
+        else:
+            serialized = time.perf_counter()
+            signature = self._private_key.sign(signing_input)
+            metrics.observe("generate.serialize", serialized - started)
+            metrics.observe("generate.signature", time.perf_counter() - serialized)
+        return (signing_input + b"." + b64url_encode(signature)).decode("ascii")
+
+    def sign(
+        self,
+        claims: dict[str, Any],
+        kid: str | None = None,
+        *,
+        copy_claims: bool = True,
+        metrics: Metrics | None = None,
+    ) -> str:
+        if not isinstance(claims, dict):
+            raise ValueError("Claims must be a dict.")
+
+        started = time.perf_counter() if metrics is not None else 0.0
+        # copy_claims=False hands ownership of claims to the signer: iat may be
+        # filled in place and the dict must not be mutated by the caller later.
+        payload = copy.deepcopy(claims) if copy_claims else claims
+        _validate_for_generate(payload)
+        payload.setdefault("iat", int(time.time()))
+        if metrics is None:
+            return self.encode(payload, kid=kid)
+
+        metrics.observe("generate.prepare", time.perf_counter() - started)
+        token = self.encode(payload, kid=kid, metrics=metrics)
+        metrics.observe("generate.total", time.perf_counter() - started)
+        metrics.increment("generate.tokens")
+        return token
+
+
+def as_signer(private_key: str | Signer) -> Signer:
+    # PEM strings get a fresh Signer per call, so no parsed private key
+    # outlives the call; callers that sign repeatedly should keep a Signer.
+    if isinstance(private_key, Signer):
+        return private_key
+    if not isinstance(private_key, str):
+        raise ValueError("private key must be a PEM string or a Signer.")
+    return Signer(private_key)
+
+
+def generate(
+    claims: dict[str, Any],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    metrics: Metrics | None = None,
+) -> str:
+    return as_signer(private_key_pem).sign(claims, kid=kid, metrics=metrics)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+import time
+from typing import Any
+
+from jwt.exceptions import (
+    DecodeError,
+    ExpiredSignatureError,
+    ImmatureSignatureError,
+    InvalidAlgorithmError,
+    InvalidIssuedAtError,
+    InvalidTokenError,
+)
+
+BASE64URL_RE = re.compile(rb"^[A-Za-z0-9_-]*$")
+# Three base64url segments (padding tolerated, as load_compact() does).
+COMPACT_SHAPE_RE = re.compile(r"[A-Za-z0-9_-]+={0,2}\.[A-Za-z0-9_-]*={0,2}\.[A-Za-z0-9_-]+={0,2}")
+DEFAULT_MAX_HEADER_BYTES = 1024
+
+
+def b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def b64url_decode_segment(segment: bytes, name: str) -> bytes:
+    stripped = segment.rstrip(b"=")
+    padding = len(segment) - len(stripped)
+    if padding > 2 or (padding and len(segment) % 4 != 0):
+        raise DecodeError(f"Invalid {name} padding")
+    if len(stripped) % 4 == 1 or not BASE64URL_RE.fullmatch(stripped):
+        raise DecodeError(f"Invalid {name} padding")
+
+    try:
+        decoded = base64.urlsafe_b64decode(stripped + b"=" * (-len(stripped) % 4))
+    except (TypeError, binascii.Error) as exc:
+        raise DecodeError(f"Invalid {name} padding") from exc
+
+    # Reject non-canonical encodings (stray trailing bits) like PyJWT does.
+    if b64url_encode(decoded) != stripped:
+        raise DecodeError(f"Invalid {name} padding")
+    return decoded
+
+
+def load_compact(token: str | bytes) -> tuple[dict[str, Any], bytes, bytes, bytes]:
+    if isinstance(token, str):
+        try:
+            token = token.encode("ascii")
+        except UnicodeEncodeError as exc:
+            raise DecodeError("Invalid token: must be ASCII") from exc
+    if not isinstance(token, bytes):
+        raise DecodeError(f"Invalid token type. Token must be a {bytes}")
+
+    try:
+        signing_input, crypto_segment = token.rsplit(b".", 1)
+        header_segment, payload_segment = signing_input.split(b".", 1)
+    except ValueError as exc:
+        raise DecodeError("Not enough segments") from exc
+
+    header_data = b64url_decode_segment(header_segment, "header")
+    try:
+        header = json.loads(header_data)
+    except (ValueError, RecursionError) as exc:
+        raise DecodeError(f"Invalid header string: {exc}") from exc
+    if not isinstance(header, dict):
+        raise DecodeError("Invalid header string: must be a json object")
+
+    payload = b64url_decode_segment(payload_segment, "payload")
+    signature = b64url_decode_segment(crypto_segment, "crypto")
+    return header, payload, signing_input, signature
+
+
+def validate_header(header: dict[str, Any], algorithms: tuple[str, ...]) -> None:
+    if "kid" in header and not isinstance(header["kid"], str):
+        raise InvalidTokenError("Key ID header parameter must be a string")
+    if "crit" in header:
+        raise InvalidTokenError("Unsupported critical header parameters")
+    alg = header.get("alg")
+    if not alg:
+        raise InvalidAlgorithmError("Algorithm not specified")
+    if alg not in algorithms:
+        raise InvalidAlgorithmError("The specified alg value is not allowed")
+
+
+def precheck_compact(
+    token: str | bytes,
+    algorithms: tuple[str, ...],
+    *,
+    kids: frozenset[str] | None = None,
+    max_token_bytes: int | None = None,
+    max_payload_bytes: int | None = None,
+    max_header_bytes: int = DEFAULT_MAX_HEADER_BYTES,
+) -> None:
+    # Rejects by length, shape and header alone: no payload base64 or JSON,
+    # no crypto. Only the (bounded) header segment is decoded.
+    if max_token_bytes is not None and len(token) > max_token_bytes:
+        raise DecodeError(f"Token exceeds {max_token_bytes} bytes")
+    if isinstance(token, bytes):
+        try:
+            token = token.decode("ascii")
+        except UnicodeDecodeError as exc:
+            raise DecodeError("Invalid token: must be ASCII") from exc
+    if not isinstance(token, str) or not COMPACT_SHAPE_RE.fullmatch(token):
+        raise DecodeError("Token is not a compact JWS with three base64url segments")
+
+    header_segment, payload_segment, _signature_segment = token.split(".")
+    if len(header_segment) > max_header_bytes:
+        raise DecodeError(f"Header exceeds {max_header_bytes} bytes")
+    # Decoded size is 3/4 of the base64url length (padding excluded).
+    payload_length = len(payload_segment.rstrip("="))
+    if max_payload_bytes is not None and payload_length * 3 // 4 > max_payload_bytes:
+        raise DecodeError(f"Payload exceeds {max_payload_bytes} bytes")
+
+    header_data = b64url_decode_segment(header_segment.encode("ascii"), "header")
+    try:
+        header = json.loads(header_data)
+    except (ValueError, RecursionError) as exc:
+        raise DecodeError(f"Invalid header string: {exc}") from exc
+    if not isinstance(header, dict):
+        raise DecodeError("Invalid header string: must be a json object")
+    validate_header(header, algorithms)
+    if kids is not None and header.get("kid") not in kids:
+        raise InvalidTokenError("Key ID header parameter is not allowed")
+
+
+def decode_payload(payload: bytes) -> dict[str, Any]:
+    try:
+        claims = json.loads(payload)
+    except (ValueError, RecursionError) as exc:
+        raise DecodeError(f"Invalid payload string: {exc}") from exc
+    if not isinstance(claims, dict):
+        raise DecodeError("Invalid payload string: must be a json object")
+    return claims
+
+
+def decode_untrusted(token: str | bytes) -> dict[str, Any]:
+    # Claims without signature or registered-claim checks; for indexing and
+    # routing only, never for trust decisions.
+    _header, payload, _signing_input, _signature = load_compact(token)
+    return decode_payload(payload)
+
+
+def untrusted_entry_hash(token: str | bytes) -> str | None:
+    # The token's chain.entry_hash, lowercased; None when it has none.
+    try:
+        chain = decode_untrusted(token).get("chain")
+    except DecodeError:
+        return None
+    entry_hash = chain.get("entry_hash") if isinstance(chain, dict) else None
+    return entry_hash.lower() if isinstance(entry_hash, str) else None
+
+
+def validate_registered_claims(claims: dict[str, Any], now: float | None = None) -> None:
+    # Mirrors PyJWT's default checks with verify_aud/verify_iss disabled.
+    if now is None:
+        now = time.time()
+
+    if "iat" in claims:
+        try:
+            iat = int(claims["iat"])
+        except (ValueError, TypeError, OverflowError):
+            raise InvalidIssuedAtError("Issued At claim (iat) must be an integer.") from None
+        if iat > now:
+            raise ImmatureSignatureError("The token is not yet valid (iat)")
+
+    if "nbf" in claims:
+        try:
+            nbf = int(claims["nbf"])
+        except (ValueError, TypeError, OverflowError):
+            raise DecodeError("Not Before claim (nbf) must be an integer.") from None
+        if nbf > now:
+            raise ImmatureSignatureError("The token is not yet valid (nbf)")
+
+    if "exp" in claims:
+        try:
+            exp = int(claims["exp"])
+        except (ValueError, TypeError, OverflowError):
+            raise DecodeError("Expiration Time claim (exp) must be an integer.") from None
+        if exp <= now:
+            raise ExpiredSignatureError("Signature has expired")
+
+    if "sub" in claims and not isinstance(claims["sub"], str):
+        raise InvalidTokenError("Subject must be a string")
+    if "jti" in claims and not isinstance(claims["jti"], str):
+        raise InvalidTokenError("JWT ID must be a string")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def iter_chunks(items: Iterable[T], chunk_size: int) -> Iterator[list[T]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1.")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_chunks(
+    fn: Callable[..., list[R]],
+    items: Iterable[T],
+    *args: Any,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[R, None, None]:
+    # fn(*args, chunk) -> list of per-item results. Results are yielded in
+    # input order; at most 2 * workers chunks are in flight so memory stays
+    # bounded for arbitrarily long inputs.
+    chunks = iter_chunks(items, chunk_size)
+
+    if executor is None and (workers is None or workers <= 1):
+        for chunk in chunks:
+            yield from fn(*args, chunk)
+        return
+
+    owned = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    pending: deque[Future[list[R]]] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(fn, *args, chunk))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
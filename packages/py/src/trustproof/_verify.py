@@ -0,0 +1,586 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from collections.abc import Iterable
+from hashlib import sha256
+from typing import Any
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_pem_public_key,
+)
+import jwt
+from jwt import InvalidTokenError
+from jwt.exceptions import InvalidSignatureError
+
+from . import _jws
+from .cache import VerifyCache
+from .canonical import hash_payload, hash_payload_counted
+from .metrics import Metrics
+from .proof import Proof, VerifyResult, compact_errors
+from .replay import ReplayStore, ReplayStoreFull
+
+HEX_64_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+REQUIRED_FIELDS = (
+    "subject",
+    "action",
+    "resource",
+    "policy",
+    "result",
+    "hashes",
+    "timestamp",
+    "jti",
+    "chain",
+)
+ALGORITHMS = ("EdDSA",)
+DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False}
+
+
+def _is_hex64(value: Any) -> bool:
+    return isinstance(value, str) and bool(HEX_64_RE.fullmatch(value))
+
+
+def _error(code: str, message: str, details: Any | None = None) -> dict[str, Any]:
+    out: dict[str, Any] = {"code": code, "message": message}
+    if details is not None:
+        out["details"] = details
+    return out
+
+
+def _validate_claims_minimal(claims: Any) -> list[dict[str, Any]]:
+    errors: list[dict[str, Any]] = []
+    if not isinstance(claims, dict):
+        return [_error("INVALID_SCHEMA", "Claims payload must be a JSON object.")]
+
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in claims]
+    if missing_fields:
+        errors.append(
+            _error(
+                "INVALID_SCHEMA",
+                "Claims payload is missing required fields.",
+                {"missing_fields": missing_fields},
+            )
+        )
+
+    jti = claims.get("jti")
+    if not isinstance(jti, str) or not jti.strip():
+        errors.append(_error("MISSING_JTI", "Claims payload must include a non-empty jti."))
+
+    hashes = claims.get("hashes")
+    if not isinstance(hashes, dict):
+        errors.append(_error("INVALID_SCHEMA", "claims.hashes must be an object."))
+    else:
+        if not _is_hex64(hashes.get("input_hash")):
+            errors.append(
+                _error("INVALID_SCHEMA", "claims.hashes.input_hash must be a 64-char hex string.")
+            )
+        if not _is_hex64(hashes.get("output_hash")):
+            errors.append(
+                _error(
+                    "INVALID_SCHEMA", "claims.hashes.output_hash must be a 64-char hex string."
+                )
+            )
+
+    chain = claims.get("chain")
+    if not isinstance(chain, dict):
+        errors.append(_error("INVALID_SCHEMA", "claims.chain must be an object."))
+    else:
+        if not _is_hex64(chain.get("prev_hash")):
+            errors.append(
+                _error("INVALID_SCHEMA", "claims.chain.prev_hash must be a 64-char hex string.")
+            )
+        if not _is_hex64(chain.get("entry_hash")):
+            errors.append(
+                _error("INVALID_SCHEMA", "claims.chain.entry_hash must be a 64-char hex string.")
+            )
+
+    return errors
+
+
+def _key_fingerprint(public_key: Ed25519PublicKey) -> str:
+    return sha256(public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)).hexdigest()
+
+
+def _load_ed25519_public_key(public_key_pem: str) -> Ed25519PublicKey:
+    try:
+        public_key = load_pem_public_key(public_key_pem.encode("utf-8"))
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Invalid public key PEM: {exc}") from exc
+    if not isinstance(public_key, Ed25519PublicKey):
+        raise ValueError("Public key must be an Ed25519 key.")
+    return public_key
+
+
+class VerifyLimits:
+    # Precheck run before any payload decoding or signature work. Size
+    # limits are off by default; kids=None accepts any (or no) kid.
+    def __init__(
+        self,
+        *,
+        max_token_bytes: int | None = None,
+        max_payload_bytes: int | None = None,
+        max_header_bytes: int = _jws.DEFAULT_MAX_HEADER_BYTES,
+        algorithms: tuple[str, ...] = ALGORITHMS,
+        kids: Iterable[str] | None = None,
+    ) -> None:
+        unsupported = set(algorithms) - set(ALGORITHMS)
+        if unsupported:
+            raise ValueError(f"Unsupported algorithms: {sorted(unsupported)}")
+        self.max_token_bytes = max_token_bytes
+        self.max_payload_bytes = max_payload_bytes
+        self.max_header_bytes = max_header_bytes
+        self.algorithms = tuple(algorithms)
+        self.kids = frozenset(kids) if kids is not None else None
+
+    def _policy(self) -> tuple[Any, ...]:
+        return (
+            self.max_token_bytes,
+            self.max_payload_bytes,
+            self.max_header_bytes,
+            self.algorithms,
+            tuple(sorted(self.kids)) if self.kids is not None else None,
+        )
+
+    def check(self, token: str | bytes) -> None:
+        _jws.precheck_compact(
+            token,
+            self.algorithms,
+            kids=self.kids,
+            max_token_bytes=self.max_token_bytes,
+            max_payload_bytes=self.max_payload_bytes,
+            max_header_bytes=self.max_header_bytes,
+        )
+
+
+def _replay_expiry(claims: dict[str, Any], store: ReplayStore) -> float:
+    # Keep a jti for as long as its proof is acceptable: until exp when the
+    # proof carries one, otherwise for the store's TTL.
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        return float(exp)
+    return time.time() + store.ttl_seconds
+
+
+class Verifier:
+    # Tokens are checked by PyJWT against the Ed25519 key parsed here once.
+    # fast_path=True opts into trustproof's own compact JWS parser and
+    # registered-claim checks (tested against PyJWT on the fuzz corpus),
+    # which skips PyJWT's per-call overhead.
+    def __init__(
+        self,
+        public_key_pem: str,
+        replay_store: ReplayStore | None = None,
+        *,
+        strict_replay: bool = True,
+        metrics: Metrics | None = None,
+        limits: VerifyLimits | None = None,
+        cache: VerifyCache | None = None,
+        fast_path: bool = False,
+    ) -> None:
+        self.limits = limits
+        self.cache = cache
+        self.replay_store = replay_store
+        self.strict_replay = strict_replay
+        self.metrics = metrics
+        self.fast_path = fast_path
+        self._load_keys(public_key_pem)
+
+    def _load_keys(self, public_key_pem: str) -> None:
+        # KeyRing overrides this to load its kid -> PEM mapping.
+        self._public_key_pem = public_key_pem
+        self._public_key = _load_ed25519_public_key(public_key_pem)
+        self.fingerprint = _key_fingerprint(self._public_key)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Key objects are not picklable; rebuild from PEM in worker processes.
+        # Replay stores, metrics sinks and caches hold locks and connections,
+        # so workers never get one; limits are plain data and travel along.
+        return (
+            type(self),
+            (self._public_key_pem,),
+            {"limits": self.limits, "fast_path": self.fast_path},
+        )
+
+    def _key_for(self, header: dict[str, Any]) -> Ed25519PublicKey:
+        # Single-key verifiers ignore kid; KeyRing selects by it.
+        return self._public_key
+
+    def key_fingerprint(self, kid: str | None = None) -> str:
+        # Fingerprint of the key that verifies tokens carrying kid; raises
+        # KeyError when no key does. Checkpoints, cache entries and store
+        # rows are bound to it rather than to a whole KeyRing.
+        return self.fingerprint
+
+    def _token_key_fingerprint(self, token: str | bytes) -> str | None:
+        return self.fingerprint
+
+    def _key_for_token(self, token: str | bytes) -> Ed25519PublicKey:
+        # KeyRing reads the (unverified) header to pick a key; PyJWT then
+        # checks the signature over that same header.
+        return self._public_key
+
+    def decode(self, token: str) -> dict[str, Any]:
+        if self.limits is not None:
+            self.limits.check(token)
+        return self._decode(token)
+
+    def _decode(self, token: str | bytes) -> dict[str, Any]:
+        if self.fast_path:
+            return self._open(Proof(token))
+        return jwt.decode(
+            token, self._key_for_token(token), algorithms=ALGORITHMS, options=DECODE_OPTIONS
+        )
+
+    def _open(self, proof: Proof) -> dict[str, Any]:
+        if not self.fast_path:
+            # The proof keeps PyJWT's verified claims in place of its own.
+            proof._claims = jwt.decode(
+                proof.token,
+                self._key_for(proof.header),
+                algorithms=ALGORITHMS,
+                options=DECODE_OPTIONS,
+            )
+            return proof._claims
+        _jws.validate_header(proof.header, ALGORITHMS)
+        try:
+            self._key_for(proof.header).verify(proof.signature, proof.signing_input)
+        except InvalidSignature:
+            raise InvalidSignatureError("Signature verification failed") from None
+        claims = proof.claims
+        _jws.validate_registered_claims(claims)
+        return claims
+
+    def _decode_metered(self, token: str, metrics: Metrics) -> dict[str, Any]:
+        # decode() split into the phases reported to metrics. PyJWT checks
+        # the signature and registered claims in one call, reported as
+        # verify.signature; only the fast path reports verify.claims.
+        if self.limits is not None:
+            started = time.perf_counter()
+            self.limits.check(token)
+            metrics.observe("verify.precheck", time.perf_counter() - started)
+        started = time.perf_counter()
+        if not self.fast_path:
+            public_key = self._key_for_token(token)
+            decoded = time.perf_counter()
+            metrics.observe("verify.decode", decoded - started)
+            try:
+                return jwt.decode(
+                    token, public_key, algorithms=ALGORITHMS, options=DECODE_OPTIONS
+                )
+            finally:
+                metrics.observe("verify.signature", time.perf_counter() - decoded)
+        header, payload, signing_input, signature = _jws.load_compact(token)
+        _jws.validate_header(header, ALGORITHMS)
+        public_key = self._key_for(header)
+        decoded = time.perf_counter()
+        metrics.observe("verify.decode", decoded - started)
+        try:
+            public_key.verify(signature, signing_input)
+        except InvalidSignature:
+            raise InvalidSignatureError("Signature verification failed") from None
+        finally:
+            signed = time.perf_counter()
+            metrics.observe("verify.signature", signed - decoded)
+        claims = _jws.decode_payload(payload)
+        _jws.validate_registered_claims(claims)
+        metrics.observe("verify.claims", time.perf_counter() - signed)
+        return claims
+
+    def verify(
+        self,
+        token: str,
+        expected_input: dict[str, Any] | None = None,
+        expected_output: dict[str, Any] | None = None,
+        *,
+        replay_store: ReplayStore | None = None,
+        check_replay: bool = True,
+        metrics: Metrics | None = None,
+        cache: VerifyCache | None = None,
+    ) -> dict[str, Any]:
+        store = replay_store if replay_store is not None else self.replay_store
+        if not check_replay:
+            store = None
+        if cache is None:
+            cache = self.cache
+        if metrics is None:
+            metrics = self.metrics
+            if metrics is None:
+                return self._verify(token, expected_input, expected_output, store, None, cache)
+
+        started = time.perf_counter()
+        result = self._verify(token, expected_input, expected_output, store, metrics, cache)
+        metrics.observe("verify.total", time.perf_counter() - started)
+        metrics.increment("verify.ok" if result["ok"] else "verify.failed")
+        for error in result["errors"]:
+            metrics.increment(f"verify.errors.{error['code']}")
+        return result
+
+    def verify_proof(
+        self,
+        proof: Proof | str | bytes,
+        expected_input: dict[str, Any] | None = None,
+        expected_output: dict[str, Any] | None = None,
+        *,
+        replay_store: ReplayStore | None = None,
+        check_replay: bool = True,
+        metrics: Metrics | None = None,
+        cache: VerifyCache | None = None,
+    ) -> VerifyResult:
+        # verify() returning a slotted VerifyResult. Without metrics or a
+        # cache no result or error dicts are built; with either, the dict
+        # path runs and is converted.
+        parsed = proof if isinstance(proof, Proof) else None
+        token = parsed.token if parsed is not None else proof
+        metered = metrics is not None or self.metrics is not None
+        if metered or cache is not None or self.cache is not None:
+            result = self.verify(
+                token,
+                expected_input,
+                expected_output,
+                replay_store=replay_store,
+                check_replay=check_replay,
+                metrics=metrics,
+                cache=cache,
+            )
+            return VerifyResult.from_dict(result, parsed)
+
+        # The result keeps only a Proof the caller passed in; for raw tokens
+        # the decoded segments are dropped and just the claims survive.
+        try:
+            if self.limits is not None:
+                self.limits.check(token)
+            claims = self._open(parsed) if parsed is not None else self._decode(token)
+        except InvalidTokenError as exc:
+            error = ("INVALID_SIGNATURE", "JWT signature verification failed.", str(exc))
+            return VerifyResult(False, parsed, None, (error,))
+
+        errors = self._claim_errors(claims, expected_input, expected_output, None)
+        store = replay_store if replay_store is not None else self.replay_store
+        replay_risk = None
+        if check_replay and store is not None:
+            replay_risk = self._consume_jti(claims, errors, store, None)
+        return VerifyResult(not errors, parsed, claims, compact_errors(errors), replay_risk)
+
+    def _expected_hash(self, obj: Any, metrics: Metrics | None, phase: str) -> str:
+        if metrics is None:
+            return hash_payload(obj)
+        started = time.perf_counter()
+        digest, size = hash_payload_counted(obj)
+        metrics.observe(phase, time.perf_counter() - started)
+        metrics.increment("bytes_hashed", size)
+        return digest
+
+    def _verify(
+        self,
+        token: str,
+        expected_input: dict[str, Any] | None,
+        expected_output: dict[str, Any] | None,
+        store: ReplayStore | None,
+        metrics: Metrics | None,
+        cache: VerifyCache | None = None,
+    ) -> dict[str, Any]:
+        if cache is None or not isinstance(token, (str, bytes)):
+            result = self._check(token, expected_input, expected_output, metrics)
+        else:
+            result = self._check_cached(token, expected_input, expected_output, metrics, cache)
+        if store is None or "claims" not in result:
+            return result
+
+        # Only proofs that pass every other check consume their jti, so a
+        # forged or tampered token cannot burn a legitimate one. Cache hits
+        # still go through the replay store.
+        claims, errors = result["claims"], result["errors"]
+        replay_risk = self._consume_jti(claims, errors, store, metrics)
+        return {"ok": not errors, "claims": claims, "errors": errors, "replay_risk": replay_risk}
+
+    def _consume_jti(
+        self,
+        claims: dict[str, Any],
+        errors: list[dict[str, Any]],
+        store: ReplayStore,
+        metrics: Metrics | None,
+    ) -> bool:
+        if errors:
+            return False
+        started = time.perf_counter()
+        try:
+            replay_risk = not store.check_and_add(claims["jti"], _replay_expiry(claims, store))
+        except ReplayStoreFull as exc:
+            # Fails closed even with strict_replay=False: the jti could not
+            # be recorded, so a later replay would go unnoticed.
+            errors.append(_error("REPLAY_STORE_FULL", str(exc), claims["jti"]))
+            return True
+        finally:
+            if metrics is not None:
+                metrics.observe("verify.replay", time.perf_counter() - started)
+        if replay_risk and self.strict_replay:
+            errors.append(
+                _error("REPLAY_DETECTED", "Proof jti has already been seen.", claims["jti"])
+            )
+        return replay_risk
+
+    def _check_cached(
+        self,
+        token: str | bytes,
+        expected_input: dict[str, Any] | None,
+        expected_output: dict[str, Any] | None,
+        metrics: Metrics | None,
+        cache: VerifyCache,
+    ) -> dict[str, Any]:
+        # Expected payloads are hashed on every call: the hashes are part of
+        # the key. Only passing results are cached, as JSON so callers can
+        # mutate what they get back.
+        input_hash = (
+            self._expected_hash(expected_input, metrics, "verify.hash_input")
+            if expected_input is not None
+            else None
+        )
+        output_hash = (
+            self._expected_hash(expected_output, metrics, "verify.hash_output")
+            if expected_output is not None
+            else None
+        )
+        fingerprint = self._token_key_fingerprint(token)
+        if fingerprint is None:
+            # No key for this token's kid: it fails verification uncached.
+            return self._check(
+                token, expected_input, expected_output, metrics, input_hash, output_hash
+            )
+        digest = sha256(token.encode("utf-8") if isinstance(token, str) else token).digest()
+        key = (digest, fingerprint, input_hash, output_hash, self._cache_policy())
+        cached = cache.get(key)
+        if metrics is not None:
+            metrics.increment("verify.cache.hit" if cached is not None else "verify.cache.miss")
+        if cached is not None:
+            return json.loads(cached)
+
+        result = self._check(
+            token, expected_input, expected_output, metrics, input_hash, output_hash
+        )
+        if result["ok"]:
+            exp = result["claims"].get("exp")
+            expires_at = None
+            if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+                expires_at = float(exp)
+            cache.put(key, json.dumps(result, separators=(",", ":")), expires_at)
+        return result
+
+    def _cache_policy(self) -> tuple[Any, ...]:
+        # A cache shared by verifiers with different limits or parsers must
+        # not hand one's results to the other.
+        limits = self.limits._policy() if self.limits is not None else None
+        return (limits, self.fast_path, self.strict_replay)
+
+    def _check(
+        self,
+        token: str,
+        expected_input: dict[str, Any] | None,
+        expected_output: dict[str, Any] | None,
+        metrics: Metrics | None,
+        input_hash: str | None = None,
+        output_hash: str | None = None,
+    ) -> dict[str, Any]:
+        try:
+            claims = self.decode(token) if metrics is None else self._decode_metered(token, metrics)
+        except InvalidTokenError as exc:
+            return {
+                "ok": False,
+                "errors": [
+                    _error("INVALID_SIGNATURE", "JWT signature verification failed.", str(exc))
+                ],
+            }
+
+        errors = self._claim_errors(
+            claims, expected_input, expected_output, metrics, input_hash, output_hash
+        )
+        return {"ok": not errors, "claims": claims, "errors": errors}
+
+    def _claim_errors(
+        self,
+        claims: dict[str, Any],
+        expected_input: dict[str, Any] | None,
+        expected_output: dict[str, Any] | None,
+        metrics: Metrics | None,
+        input_hash: str | None = None,
+        output_hash: str | None = None,
+    ) -> list[dict[str, Any]]:
+        if metrics is None:
+            errors = _validate_claims_minimal(claims)
+        else:
+            started = time.perf_counter()
+            errors = _validate_claims_minimal(claims)
+            metrics.observe("verify.schema", time.perf_counter() - started)
+
+        if expected_input is not None and isinstance(claims, dict):
+            hashes_obj = claims.get("hashes")
+            actual_input_hash = (
+                hashes_obj.get("input_hash") if isinstance(hashes_obj, dict) else None
+            )
+            expected_input_hash = input_hash or self._expected_hash(
+                expected_input, metrics, "verify.hash_input"
+            )
+            if not isinstance(actual_input_hash, str) or (
+                actual_input_hash.lower() != expected_input_hash.lower()
+            ):
+                errors.append(
+                    _error(
+                        "INPUT_HASH_MISMATCH",
+                        "Computed input hash does not match claims.hashes.input_hash.",
+                        {"expected_hash": expected_input_hash, "actual_hash": actual_input_hash},
+                    )
+                )
+
+        if expected_output is not None and isinstance(claims, dict):
+            hashes_obj = claims.get("hashes")
+            actual_output_hash = (
+                hashes_obj.get("output_hash") if isinstance(hashes_obj, dict) else None
+            )
+            expected_output_hash = output_hash or self._expected_hash(
+                expected_output, metrics, "verify.hash_output"
+            )
+            if not isinstance(actual_output_hash, str) or (
+                actual_output_hash.lower() != expected_output_hash.lower()
+            ):
+                errors.append(
+                    _error(
+                        "OUTPUT_HASH_MISMATCH",
+                        "Computed output hash does not match claims.hashes.output_hash.",
+                        {"expected_hash": expected_output_hash, "actual_hash": actual_output_hash},
+                    )
+                )
+
+        return errors
+
+
+def as_verifier(public_key: str | Verifier) -> Verifier:
+    # PEM strings get a fresh Verifier per call; nothing is cached at module
+    # level, so callers that verify repeatedly should keep a Verifier.
+    if isinstance(public_key, Verifier):
+        return public_key
+    if not isinstance(public_key, str):
+        raise ValueError("public key must be a PEM string or a Verifier.")
+    return Verifier(public_key)
+
+
+def verify(
+    token: str,
+    public_key_pem: str | Verifier,
+    expected_input: dict[str, Any] | None = None,
+    expected_output: dict[str, Any] | None = None,
+    replay_store: ReplayStore | None = None,
+    metrics: Metrics | None = None,
+    cache: VerifyCache | None = None,
+) -> dict[str, Any]:
+    return as_verifier(public_key_pem).verify(
+        token,
+        expected_input,
+        expected_output,
+        replay_store=replay_store,
+        metrics=metrics,
+        cache=cache,
+    )
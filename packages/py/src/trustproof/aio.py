@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import weakref
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+from typing import Any, TypeVar
+
+from ._generate import Signer, as_signer
+from ._generate import generate as _generate
+from ._parallel import iter_chunks
+from ._verify import Verifier, as_verifier
+from ._verify import verify as _verify
+from .chain import append as _append
+from .chain import verify_chain as _verify_chain
+from .proof import VerifyResult
+from .replay import ReplayStore
+
+R = TypeVar("R")
+
+DEFAULT_BATCH_CHUNK_SIZE = 64
+
+
+class AsyncRunner:
+    # Runs blocking sign/verify work off the event loop. At most
+    # max_concurrency jobs are queued on the executor at once; further
+    # callers wait on a semaphore, which is the backpressure. executor=None
+    # uses the loop's default thread pool; a ProcessPoolExecutor works too
+    # (Signer/Verifier rebuild from PEM), but replay stores stay in-process.
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        if max_concurrency is None:
+            max_concurrency = min(32, (os.cpu_count() or 1) + 4)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1.")
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per loop: asyncio primitives are bound to the loop
+        # that first uses them.
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(
+                loop, asyncio.Semaphore(self.max_concurrency)
+            )
+        return semaphore
+
+    async def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(fn, *args, **kwargs)
+            )
+
+
+_default_runner = AsyncRunner()
+
+
+def configure(executor: Executor | None = None, max_concurrency: int | None = None) -> None:
+    global _default_runner
+    _default_runner = AsyncRunner(executor, max_concurrency)
+
+
+def _runner(runner: AsyncRunner | None) -> AsyncRunner:
+    return runner if runner is not None else _default_runner
+
+
+async def generate(
+    claims: dict[str, Any],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    *,
+    runner: AsyncRunner | None = None,
+) -> str:
+    return await _runner(runner).run(_generate, claims, private_key_pem, kid)
+
+
+async def append(
+    prev: str | dict[str, Any] | None,
+    next_claims: dict[str, Any],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    *,
+    runner: AsyncRunner | None = None,
+) -> str:
+    return await _runner(runner).run(_append, prev, next_claims, private_key_pem, kid)
+
+
+async def verify(
+    token: str,
+    public_key_pem: str | Verifier,
+    expected_input: dict[str, Any] | None = None,
+    expected_output: dict[str, Any] | None = None,
+    replay_store: ReplayStore | None = None,
+    *,
+    runner: AsyncRunner | None = None,
+) -> dict[str, Any]:
+    return await _runner(runner).run(
+        _verify, token, public_key_pem, expected_input, expected_output, replay_store
+    )
+
+
+async def verify_chain(
+    tokens: Iterable[str] | str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    *,
+    runner: AsyncRunner | None = None,
+) -> dict[str, Any]:
+    # Linkage is sequential, so the whole chain is one executor job; use
+    # the sync verify_chain(workers=...) inside it for very long chains.
+    # tokens goes through as given (iterable, JSONL path or archive) and is
+    # streamed in the executor; a process pool needs a path or a list.
+    return await _runner(runner).run(_verify_chain, tokens, public_key_pem)
+
+
+def _generate_batch(
+    signer: str | Signer, kid: str | None, claims_batch: list[dict[str, Any]]
+) -> list[str]:
+    return [_generate(claims, signer, kid) for claims in claims_batch]
+
+
+def _verify_batch(verifier: str | Verifier, tokens: list[str]) -> list[dict[str, Any]]:
+    return [_verify(token, verifier) for token in tokens]
+
+
+def _verify_batch_objects(verifier: Verifier, tokens: list[str]) -> list[VerifyResult]:
+    return [verifier.verify_proof(token) for token in tokens]
+
+
+async def _gather_chunks(
+    runner: AsyncRunner,
+    fn: Callable[..., list[R]],
+    items: Iterable[Any],
+    *args: Any,
+    chunk_size: int,
+) -> list[R]:
+    # Chunks amortize the executor round trip. Like _parallel.map_chunks, the
+    # input is read lazily and at most 2 * max_concurrency chunk tasks are
+    # pending at once; results are collected in input order.
+    max_in_flight = 2 * runner.max_concurrency
+    pending: deque[asyncio.Task[list[R]]] = deque()
+    results: list[R] = []
+    try:
+        for chunk in iter_chunks(items, chunk_size):
+            pending.append(asyncio.ensure_future(runner.run(fn, *args, chunk)))
+            if len(pending) >= max_in_flight:
+                results.extend(await pending.popleft())
+        while pending:
+            results.extend(await pending.popleft())
+    finally:
+        for task in pending:
+            task.cancel()
+    return results
+
+
+async def generate_many(
+    claims_batch: Iterable[dict[str, Any]],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    *,
+    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+    runner: AsyncRunner | None = None,
+) -> list[str]:
+    signer = as_signer(private_key_pem)
+    return await _gather_chunks(
+        _runner(runner), _generate_batch, claims_batch, signer, kid, chunk_size=chunk_size
+    )
+
+
+async def verify_many(
+    tokens: Iterable[str],
+    public_key_pem: str | Verifier,
+    *,
+    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+    runner: AsyncRunner | None = None,
+    as_objects: bool = False,
+) -> list[dict[str, Any]] | list[VerifyResult]:
+    # as_objects=True returns slotted VerifyResult objects instead of dicts.
+    verifier = as_verifier(public_key_pem)
+    batch = _verify_batch_objects if as_objects else _verify_batch
+    return await _gather_chunks(_runner(runner), batch, tokens, verifier, chunk_size=chunk_size)
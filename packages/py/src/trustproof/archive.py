@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, overload
+
+from . import _jws
+
+# Layout, all integers little-endian:
+#   header  magic, version, flags, reserved, count, index_offset, head (64 bytes)
+#   records count x (u32 length, token bytes), in chain order
+#   index   count x u64 offset of each record's length prefix
+# The header is written last, so a crash mid-write never leaves a file with
+# a valid magic. FLAG_HEAD marks that head holds the last entry_hash.
+MAGIC = b"TPARCH\x00\x01"
+VERSION = 1
+FLAG_HEAD = 1
+_HEADER = struct.Struct("<8sHHIQQ32s")
+_LENGTH = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+
+
+def _token_bytes(token: str | bytes) -> bytes:
+    if isinstance(token, bytes):
+        return token
+    if not isinstance(token, str):
+        raise ValueError("Archive tokens must be str or bytes.")
+    try:
+        return token.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("Archive tokens must be ASCII compact JWS strings.") from None
+
+
+def write_archive(path: str | os.PathLike[str], tokens: Iterable[str | bytes]) -> dict[str, Any]:
+    # Streams tokens to disk; only the 8-byte offsets are held in memory.
+    # The head is read from the last token without verifying it.
+    target = Path(path)
+    offsets = array("Q")
+    last: str | bytes | None = None
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(b"\0" * _HEADER.size)
+            position = _HEADER.size
+            for token in tokens:
+                data = _token_bytes(token)
+                offsets.append(position)
+                handle.write(_LENGTH.pack(len(data)))
+                handle.write(data)
+                position += _LENGTH.size + len(data)
+                last = token
+            index_offset = position
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            offsets.tofile(handle)
+
+            head = None
+            if last is not None:
+                if isinstance(last, bytes):
+                    last = last.decode("ascii")
+                head = _jws.untrusted_entry_hash(last)
+            try:
+                head_bytes = bytes.fromhex(head) if head is not None else b""
+            except ValueError:
+                head_bytes = b""
+            flags = FLAG_HEAD if len(head_bytes) == 32 else 0
+            handle.seek(0)
+            handle.write(
+                _HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    flags,
+                    0,
+                    len(offsets),
+                    index_offset,
+                    head_bytes if flags else b"",
+                )
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, target)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return {"count": len(offsets), "head": head if flags else None}
+
+
+def is_archive(path: str | os.PathLike[str]) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class ProofArchive(Sequence[str]):
+    # Read-only, memory-mapped view of an archive. Indexing decodes a single
+    # token; raw() returns a zero-copy memoryview into the map, and slices
+    # are lazy ArchiveSlice views. Release raw() views before close().
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise ValueError(f"{self.path} is not a proof archive: {exc}") from exc
+        try:
+            self._read_header()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_header(self) -> None:
+        size = len(self._map)
+        if size < _HEADER.size:
+            raise ValueError(f"{self.path} is not a proof archive (truncated header).")
+        magic, version, flags, _reserved, count, index_offset, head = _HEADER.unpack_from(
+            self._map, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a proof archive (bad magic).")
+        if version != VERSION:
+            raise ValueError(f"Unsupported proof archive version {version}.")
+        if index_offset < _HEADER.size or index_offset + count * _OFFSET.size != size:
+            raise ValueError(f"{self.path} is corrupt (index does not match file size).")
+        self._count = count
+        self._index_offset = index_offset
+        self.head = head.hex() if flags & FLAG_HEAD else None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # mmaps are not picklable; worker processes reopen the file by path.
+        return (_open_archive, (self.path,))
+
+    def __enter__(self) -> ProofArchive:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _span(self, index: int) -> tuple[int, int]:
+        (offset,) = _OFFSET.unpack_from(self._map, self._index_offset + index * _OFFSET.size)
+        start = offset + _LENGTH.size
+        if offset < _HEADER.size or start > self._index_offset:
+            raise ValueError(f"{self.path} is corrupt (record {index} has a bad offset).")
+        (length,) = _LENGTH.unpack_from(self._map, offset)
+        if start + length > self._index_offset:
+            raise ValueError(f"{self.path} is corrupt (record {index} overruns the index).")
+        return start, start + length
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("archive index out of range")
+        return index
+
+    def raw(self, index: int) -> memoryview:
+        start, end = self._span(self._position(index))
+        return memoryview(self._map)[start:end]
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ArchiveSlice: ...
+
+    def __getitem__(self, index: int | slice) -> str | ArchiveSlice:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if step != 1:
+                raise ValueError("Archive slices must be contiguous (step 1).")
+            return ArchiveSlice(self, start, max(start, stop))
+        start, end = self._span(self._position(index))
+        return self._map[start:end].decode("ascii")
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iter_range(0, self._count)
+
+    def _iter_range(self, start: int, stop: int) -> Iterator[str]:
+        data = self._map
+        for index in range(start, stop):
+            begin, end = self._span(index)
+            yield data[begin:end].decode("ascii")
+
+    def slices(self, size: int) -> Iterator[ArchiveSlice]:
+        return ArchiveSlice(self, 0, self._count).slices(size)
+
+
+class ArchiveSlice(Sequence[str]):
+    # A contiguous range of an archive. Pickles as (path, start, stop), so
+    # parallel verification ships ranges to workers rather than tokens.
+    def __init__(self, archive: ProofArchive, start: int, stop: int) -> None:
+        self.archive = archive
+        self.start = start
+        self.stop = stop
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_open_slice, (self.archive.path, self.start, self.stop))
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> ArchiveSlice: ...
+
+    def __getitem__(self, index: int | slice) -> str | ArchiveSlice:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Archive slices must be contiguous (step 1).")
+            return ArchiveSlice(self.archive, self.start + start, self.start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("archive index out of range")
+        return self.archive[self.start + index]
+
+    def __iter__(self) -> Iterator[str]:
+        return self.archive._iter_range(self.start, self.stop)
+
+    def slices(self, size: int) -> Iterator[ArchiveSlice]:
+        if size < 1:
+            raise ValueError("slice size must be >= 1.")
+        for start in range(self.start, self.stop, size):
+            yield ArchiveSlice(self.archive, start, min(start + size, self.stop))
+
+
+def _open_archive(path: str) -> ProofArchive:
+    # One map per file version per worker process, however many slices arrive.
+    stat = os.stat(path)
+    return _cached_archive(path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _cached_archive(path: str, _mtime_ns: int, _size: int) -> ProofArchive:
+    return ProofArchive(path)
+
+
+def _open_slice(path: str, start: int, stop: int) -> ArchiveSlice:
+    return ArchiveSlice(_open_archive(path), start, stop)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_CACHE_TTL_SECONDS = 300.0
+
+# (sha256(token), key fingerprint, expected input hash, expected output hash,
+#  the verifier's limits and options)
+CacheKey = tuple[bytes, str, str | None, str | None, tuple[Any, ...]]
+
+
+class VerifyCache:
+    # Bounded LRU of successful pre-replay verification results, passed as
+    # cache= to Verifier/verify. Entries expire after ttl_seconds or at the
+    # token's exp, whichever is first. The key fingerprint and the verifier's
+    # limits are part of every key, so a changed key set or a stricter
+    # verifier never hits old entries; invalidate() drops them eagerly when
+    # a key is revoked.
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Any | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, value: Any, expires_at: float | None = None) -> None:
+        now = time.time()
+        deadline = now + self.ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= now:
+            return
+        with self._lock:
+            self._entries[key] = (deadline, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, fingerprint: str | None = None) -> int:
+        # Drops every entry checked against fingerprint (all when None).
+        with self._lock:
+            if fingerprint is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [key for key in self._entries if key[1] == fingerprint]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import marshal
+from collections.abc import Iterator
+from functools import lru_cache
+from hashlib import sha256
+from json.encoder import encode_basestring
+from typing import Any
+
+# One shared encoder: json.dumps() with non-default options builds a new
+# JSONEncoder (and C encoder) on every call.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+_encode = _CANONICAL_ENCODER.encode
+
+FRAGMENT_CACHE_SIZE = 1024
+FRAGMENT_MAX_KEY_BYTES = 16 * 1024
+# Largest subtree (in JSON nodes) encoded in one shot by hash_payload().
+STREAM_NODE_BUDGET = 2048
+
+
+def canonical_json(obj: Any) -> str:
+    return _encode(obj)
+
+
+def sha256_hex(s: str) -> str:
+    return sha256(s.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _fragment_from_key(key: bytes) -> str:
+    return _encode(marshal.loads(key))
+
+
+def _canonical_fragment(obj: Any) -> str:
+    # Sub-objects such as policy/subject/result repeat across thousands of
+    # receipts. marshal gives a type-exact key (1, 1.0 and True differ) at a
+    # fraction of the cost of sorting and encoding, so repeats are served
+    # from a bounded LRU of canonical strings.
+    try:
+        key = marshal.dumps(obj)
+    except ValueError:
+        return _encode(obj)
+    if len(key) > FRAGMENT_MAX_KEY_BYTES:
+        return _encode(obj)
+    return _fragment_from_key(key)
+
+
+def compute_canonical_event_material(claims: dict[str, Any]) -> str:
+    # Keys are emitted in sorted order, byte-identical to
+    # canonical_json({field: claims[field] for field in the eight fields}).
+    return "".join(
+        (
+            '{"action":',
+            _encode(claims["action"]),
+            ',"hashes":',
+            _encode(claims["hashes"]),
+            ',"jti":',
+            _encode(claims["jti"]),
+            ',"policy":',
+            _canonical_fragment(claims["policy"]),
+            ',"resource":',
+            _encode(claims["resource"]),
+            ',"result":',
+            _canonical_fragment(claims["result"]),
+            ',"subject":',
+            _canonical_fragment(claims["subject"]),
+            ',"timestamp":',
+            _encode(claims["timestamp"]),
+            "}",
+        )
+    )
+
+
+def _budget_left(obj: Any, budget: int) -> int:
+    # Remaining node budget after counting obj; negative once exceeded, so
+    # large subtrees are detected without walking them completely.
+    if isinstance(obj, dict):
+        children: Any = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    else:
+        return budget - 1
+    budget -= 1 + len(children)
+    if budget < 0:
+        return budget
+    for child in children:
+        if isinstance(child, (dict, list, tuple)):
+            budget = _budget_left(child, budget + 1)
+            if budget < 0:
+                return budget
+    return budget
+
+
+def _key_prefix(key: Any) -> str:
+    if isinstance(key, str):
+        return f"{encode_basestring(key)}:"
+    # Let the encoder apply its own key coercion (1 -> "1", True -> "true");
+    # strip the braces and the placeholder value, keeping '"<key>":'.
+    return _encode({key: 0})[1:-2]
+
+
+def _iter_canonical_chunks(obj: Any) -> Iterator[str]:
+    # Yields canonical_json(obj) in pieces. Subtrees within the node budget
+    # go through the C encoder in one shot (runs of small siblings share one
+    # call); only oversized containers are walked here.
+    if not isinstance(obj, (dict, list, tuple)) or _budget_left(obj, STREAM_NODE_BUDGET) >= 0:
+        yield _encode(obj)
+        return
+
+    is_dict = isinstance(obj, dict)
+    items: list[Any] = [(key, obj[key]) for key in sorted(obj)] if is_dict else list(obj)
+    yield "{" if is_dict else "["
+
+    separator = ""
+    batch: list[Any] = []
+    budget = STREAM_NODE_BUDGET
+    for item in items:
+        value = item[1] if is_dict else item
+        left = _budget_left(value, budget)
+        if left < 0 and batch:
+            yield separator + _encode(dict(batch) if is_dict else batch)[1:-1]
+            separator = ","
+            batch = []
+            budget = STREAM_NODE_BUDGET
+            left = _budget_left(value, budget)
+        if left >= 0:
+            batch.append(item)
+            budget = left
+            continue
+
+        yield separator + (_key_prefix(item[0]) if is_dict else "")
+        separator = ","
+        yield from _iter_canonical_chunks(value)
+
+    if batch:
+        yield separator + _encode(dict(batch) if is_dict else batch)[1:-1]
+    yield "}" if is_dict else "]"
+
+
+def hash_payload_counted(obj: Any) -> tuple[str, int]:
+    # hash_payload() plus the number of canonical UTF-8 bytes hashed.
+    digest = sha256()
+    size = 0
+    for chunk in _iter_canonical_chunks(obj):
+        data = chunk.encode("utf-8")
+        size += len(data)
+        digest.update(data)
+    return digest.hexdigest(), size
+
+
+def hash_payload(obj: Any) -> str:
+    # sha256_hex(canonical_json(obj)) without materializing the whole
+    # canonical string and its UTF-8 copy for large payloads.
+    digest = sha256()
+    for chunk in _iter_canonical_chunks(obj):
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
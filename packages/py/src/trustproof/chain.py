@@ -2,12 +2,27 @@ from __future__ import annotations
 
 import copy
 import json
+import os
 import re
-from hashlib import sha256
-from typing import Any
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 import jwt
 
+from ._parallel import DEFAULT_CHUNK_SIZE, map_chunks
+from .canonical import (  # noqa: F401 - canonical_json is re-exported
+    canonical_json,
+    compute_canonical_event_material,
+    sha256_hex,
+)
+
+if TYPE_CHECKING:
+    from ._generate import Signer
+    from .metrics import Metrics
+    from ._verify import Verifier
+
 GENESIS_PREV_HASH = "0" * 64
 HEX_64_RE = re.compile(r"^[0-9a-fA-F]{64}$")
 
@@ -27,29 +42,6 @@ def _error(code: str, message: str, index: int | None = None) -> dict[str, Any]:
     return out
 
 
-def canonical_json(obj: Any) -> str:
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-
-
-def sha256_hex(s: str) -> str:
-    return sha256(s.encode("utf-8")).hexdigest()
-
-
-def compute_canonical_event_material(claims: dict[str, Any]) -> str:
-    return canonical_json(
-        {
-            "subject": claims["subject"],
-            "action": claims["action"],
-            "resource": claims["resource"],
-            "policy": claims["policy"],
-            "result": claims["result"],
-            "hashes": claims["hashes"],
-            "timestamp": claims["timestamp"],
-            "jti": claims["jti"],
-        }
-    )
-
-
 def compute_entry_hash(prev_hash_hex: str, canonical_event_material: str) -> str:
     if not _is_hex64(prev_hash_hex):
         raise ValueError("prev_hash_hex must be a 64-char hex string.")
@@ -68,15 +60,10 @@ def _extract_prev_entry_hash(prev_payload: Any, label: str) -> str:
     return normalize_hex(prev_hash)
 
 
-def append(
-    prev: str | dict[str, Any] | None,
-    next_claims: dict[str, Any],
-    private_key_pem: str,
-    kid: str | None = None,
-) -> str:
+def resolve_prev_hash(prev: str | dict[str, Any] | None) -> str:
     if prev is None:
-        prev_hash = GENESIS_PREV_HASH
-    elif isinstance(prev, str):
+        return GENESIS_PREV_HASH
+    if isinstance(prev, str):
         untrusted_payload = jwt.decode(
             prev,
             options={
@@ -86,12 +73,13 @@ def append(
                 "verify_exp": False,
             },
         )
-        prev_hash = _extract_prev_entry_hash(untrusted_payload, "Previous JWT payload")
-    elif isinstance(prev, dict):
-        prev_hash = _extract_prev_entry_hash(prev, "Previous claims")
-    else:
-        raise ValueError("prev must be None, a JWT string, or a claims dict.")
+        return _extract_prev_entry_hash(untrusted_payload, "Previous JWT payload")
+    if isinstance(prev, dict):
+        return _extract_prev_entry_hash(prev, "Previous claims")
+    raise ValueError("prev must be None, a JWT string, or a claims dict.")
 
+
+def link_claims(prev_hash: str, next_claims: dict[str, Any]) -> dict[str, Any]:
     if not isinstance(next_claims, dict):
         raise ValueError("next_claims must be a dict.")
 
@@ -104,100 +92,331 @@ def append(
 
     canonical_event_material = compute_canonical_event_material(claims_to_sign)
     chain["entry_hash"] = compute_entry_hash(prev_hash, canonical_event_material)
+    return claims_to_sign
+
+
+def append(
+    prev: str | dict[str, Any] | None,
+    next_claims: dict[str, Any],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+) -> str:
+    prev_hash = resolve_prev_hash(prev)
+    claims_to_sign = link_claims(prev_hash, next_claims)
+
+    from ._generate import as_signer
+
+    return as_signer(private_key_pem).sign(claims_to_sign, kid=kid, copy_claims=False)
+
 
-    from .generate import generate
-
-    return generate(claims_to_sign, private_key_pem, kid=kid)
-
-
-def verify_chain(tokens: list[str], public_key_pem: str) -> dict[str, Any]:
-    previous_entry_hash: str | None = None
-
-    from .verify import verify
-
-    for index, token in enumerate(tokens):
-        proof_result = verify(token, public_key_pem)
-        if not proof_result.get("ok"):
-            return {
-                "ok": False,
-                "errors": [
-                    _error(
-                        "INVALID_PROOF",
-                        "Proof signature/schema verification failed.",
-                        index=index,
-                    )
-                ],
-            }
-
-        claims = proof_result.get("claims")
-        if not isinstance(claims, dict):
-            return {
-                "ok": False,
-                "errors": [_error("INVALID_PROOF", "Proof claims are missing.", index=index)],
-            }
-
-        chain = claims.get("chain")
-        if not isinstance(chain, dict):
-            return {
-                "ok": False,
-                "errors": [_error("INVALID_PROOF", "Proof chain is missing.", index=index)],
-            }
-
-        prev_hash = chain.get("prev_hash")
-        entry_hash = chain.get("entry_hash")
-        if not _is_hex64(prev_hash) or not _is_hex64(entry_hash):
-            return {
-                "ok": False,
-                "errors": [
-                    _error(
-                        "INVALID_PROOF",
-                        "Proof chain hashes must be 64-char hex strings.",
-                        index=index,
-                    )
-                ],
-            }
-
-        prev_hash_norm = normalize_hex(prev_hash)
-        entry_hash_norm = normalize_hex(entry_hash)
+def _sign_linked(signer: Signer, kid: str | None, linked: list[dict[str, Any]]) -> list[str]:
+    return [signer.sign(claims, kid=kid, copy_claims=False) for claims in linked]
 
+
+def append_many(
+    prev: str | dict[str, Any] | None,
+    claims_iter: Iterable[dict[str, Any]],
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    *,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    # entry_hash depends only on the previous entry_hash and the canonical
+    # event material, so links are computed in one sequential pass and only
+    # the signatures fan out. Tokens are yielded in chain order.
+    from ._generate import as_signer
+
+    signer = as_signer(private_key_pem)
+    prev_hash = resolve_prev_hash(prev)
+
+    def _linked() -> Iterator[dict[str, Any]]:
+        nonlocal prev_hash
+        for next_claims in claims_iter:
+            claims_to_sign = link_claims(prev_hash, next_claims)
+            prev_hash = claims_to_sign["chain"]["entry_hash"]
+            yield claims_to_sign
+
+    return map_chunks(
+        _sign_linked,
+        _linked(),
+        signer,
+        kid,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+    )
+
+
+def _check_entry(
+    verifier: Verifier, token: str, metrics: Metrics | None = None
+) -> tuple[dict[str, Any] | None, str, str]:
+    # Per-entry work that does not depend on neighbouring entries: signature,
+    # schema and entry_hash recomputation. Returns normalized chain hashes.
+    # Re-auditing a chain must not consume jtis in a replay store.
+    # Only ok/claims are used, so the slotted result avoids per-entry dicts.
+    proof_result = verifier.verify_proof(token, check_replay=False, metrics=metrics)
+    if not proof_result.ok:
+        return (
+            _error("INVALID_PROOF", "Proof signature/schema verification failed."),
+            "",
+            "",
+        )
+
+    claims = proof_result.claims
+    if not isinstance(claims, dict):
+        return _error("INVALID_PROOF", "Proof claims are missing."), "", ""
+
+    chain = claims.get("chain")
+    if not isinstance(chain, dict):
+        return _error("INVALID_PROOF", "Proof chain is missing."), "", ""
+
+    prev_hash = chain.get("prev_hash")
+    entry_hash = chain.get("entry_hash")
+    if not _is_hex64(prev_hash) or not _is_hex64(entry_hash):
+        return (
+            _error("INVALID_PROOF", "Proof chain hashes must be 64-char hex strings."),
+            "",
+            "",
+        )
+
+    prev_hash_norm = normalize_hex(prev_hash)
+    entry_hash_norm = normalize_hex(entry_hash)
+
+    if metrics is None:
         canonical_event_material = compute_canonical_event_material(claims)
         recomputed_entry_hash = compute_entry_hash(prev_hash_norm, canonical_event_material)
-        if recomputed_entry_hash.lower() != entry_hash_norm:
-            return {
-                "ok": False,
-                "errors": [
-                    _error(
-                        "CHAIN_ENTRY_HASH_MISMATCH",
-                        "chain.entry_hash does not match recomputed entry hash.",
-                        index=index,
-                    )
-                ],
-            }
-
-        if index == 0:
-            if prev_hash_norm != GENESIS_PREV_HASH:
-                return {
+    else:
+        started = time.perf_counter()
+        canonical_event_material = compute_canonical_event_material(claims)
+        canonicalized = time.perf_counter()
+        recomputed_entry_hash = compute_entry_hash(prev_hash_norm, canonical_event_material)
+        metrics.observe("chain.canonical_material", canonicalized - started)
+        metrics.observe("chain.entry_hash", time.perf_counter() - canonicalized)
+        metrics.increment("bytes_hashed", len(prev_hash_norm) + len(canonical_event_material))
+    if recomputed_entry_hash.lower() != entry_hash_norm:
+        return (
+            _error(
+                "CHAIN_ENTRY_HASH_MISMATCH",
+                "chain.entry_hash does not match recomputed entry hash.",
+            ),
+            prev_hash_norm,
+            entry_hash_norm,
+        )
+
+    return None, prev_hash_norm, entry_hash_norm
+
+
+def _check_entries(
+    verifier: Verifier, tokens: list[str]
+) -> list[tuple[dict[str, Any] | None, str, str]]:
+    return [_check_entry(verifier, token) for token in tokens]
+
+
+def _check_entries_timed(
+    verifier: Verifier, tokens: list[str]
+) -> list[tuple[tuple[dict[str, Any] | None, str, str], float]]:
+    timed = []
+    for token in tokens:
+        started = time.perf_counter()
+        check = _check_entry(verifier, token)
+        timed.append((check, time.perf_counter() - started))
+    return timed
+
+
+def _check_entries_metered(
+    verifier: Verifier, metrics: Metrics, tokens: list[str]
+) -> list[tuple[tuple[dict[str, Any] | None, str, str], float]]:
+    timed = []
+    for token in tokens:
+        started = time.perf_counter()
+        check = _check_entry(verifier, token, metrics)
+        timed.append((check, time.perf_counter() - started))
+    return timed
+
+
+def _check_archive_slices(
+    check_fn: Any, verifier: Verifier, slices: list[Any]
+) -> list[Any]:
+    return [check for part in slices for check in check_fn(verifier, part)]
+
+
+def _link_error(
+    index: int,
+    check: tuple[dict[str, Any] | None, str, str],
+    previous_entry_hash: str | None,
+) -> dict[str, Any] | None:
+    entry_error, prev_hash_norm, _entry_hash_norm = check
+    if entry_error is not None:
+        return {**entry_error, "index": index}
+
+    if previous_entry_hash is None:
+        if prev_hash_norm != GENESIS_PREV_HASH:
+            return _error(
+                "CHAIN_GENESIS_PREV_HASH_INVALID",
+                "Genesis proof chain.prev_hash must be 64 zeros.",
+                index=index,
+            )
+    elif prev_hash_norm != previous_entry_hash:
+        return _error(
+            "CHAIN_LINK_MISMATCH",
+            "chain.prev_hash does not match previous proof chain.entry_hash.",
+            index=index,
+        )
+    return None
+
+
+def parse_token_line(line: str, where: str) -> str | None:
+    text = line.strip()
+    if not text:
+        return None
+    if text[0] == '"':
+        token = json.loads(text)
+    elif text[0] == "{":
+        record = json.loads(text)
+        token = record.get("jwt", record.get("token")) if isinstance(record, dict) else None
+    else:
+        token = text
+    if not isinstance(token, str):
+        raise ValueError(f"{where} does not contain a JWT string.")
+    return token
+
+
+def iter_jsonl_tokens(path: str | os.PathLike[str]) -> Iterator[str]:
+    # One token per line: a bare compact JWS, a JSON string, or an object
+    # with a "jwt"/"token" field (the shape of examples/output/*/proofs.json).
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            token = parse_token_line(line, f"Line {line_number}")
+            if token is not None:
+                yield token
+
+
+def iter_verify_chain(
+    source: Iterable[str] | str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    *,
+    progress_every: int = 0,
+    start_index: int = 0,
+    previous_entry_hash: str | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    latencies: list[float] | None = None,
+    metrics: Metrics | None = None,
+) -> Iterator[dict[str, Any]]:
+    # source is an iterable of tokens, a JSONL path, or a proof archive
+    # (path or ProofArchive), which process workers read by range.
+    # latencies, when given, collects the per-entry check time in seconds
+    # for every entry consumed (measured in the worker that checked it).
+    # metrics receives per-entry phases when checks run in this process or
+    # a thread pool; process workers report only the "chain.*" totals.
+    from .archive import ArchiveSlice, ProofArchive, is_archive
+    from ._verify import as_verifier
+
+    verifier = as_verifier(public_key_pem)
+    if previous_entry_hash is not None:
+        if not _is_hex64(previous_entry_hash):
+            raise ValueError("previous_entry_hash must be a 64-char hex string.")
+        previous_entry_hash = normalize_hex(previous_entry_hash)
+    opened = None
+    if isinstance(source, (str, os.PathLike)):
+        if is_archive(source):
+            source = opened = ProofArchive(source)
+        else:
+            source = iter_jsonl_tokens(source)
+
+    # Signature/schema/hash checks fan out in chunks; linkage is checked here
+    # in order, so the first failing index matches the sequential walk. Only
+    # the previous entry_hash is retained between entries.
+    in_process = isinstance(executor, ThreadPoolExecutor) or (
+        executor is None and (workers is None or workers <= 1)
+    )
+    check_args: tuple[Any, ...] = (verifier,)
+    if metrics is not None and in_process:
+        check_fn: Any = _check_entries_metered
+        check_args = (verifier, metrics)
+    elif metrics is not None or latencies is not None:
+        check_fn = _check_entries_timed
+    else:
+        check_fn = _check_entries
+    timed = check_fn is not _check_entries
+    if isinstance(source, (ProofArchive, ArchiveSlice)) and not in_process:
+        # Workers map the archive themselves: each job is a (path, start,
+        # stop) range rather than a list of token strings.
+        checks = map_chunks(
+            _check_archive_slices,
+            source.slices(chunk_size),
+            check_fn,
+            verifier,
+            workers=workers,
+            executor=executor,
+            chunk_size=1,
+        )
+    else:
+        checks = map_chunks(
+            check_fn,
+            source,
+            *check_args,
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+    count = 0
+    try:
+        for index, check in enumerate(checks, start=start_index):
+            if timed:
+                check, elapsed = check
+                if latencies is not None:
+                    latencies.append(elapsed)
+                if metrics is not None:
+                    metrics.observe("chain.entry", elapsed)
+            failure = _link_error(index, check, previous_entry_hash)
+            if failure is not None:
+                if metrics is not None:
+                    metrics.increment("chain.entries", count)
+                    metrics.increment(f"chain.errors.{failure['code']}")
+                yield {"event": "error", **failure}
+                yield {
+                    "event": "result",
                     "ok": False,
-                    "errors": [
-                        _error(
-                            "CHAIN_GENESIS_PREV_HASH_INVALID",
-                            "Genesis proof chain.prev_hash must be 64 zeros.",
-                            index=index,
-                        )
-                    ],
+                    "errors": [failure],
+                    "count": count,
+                    "head": previous_entry_hash,
                 }
-        elif prev_hash_norm != previous_entry_hash:
-            return {
-                "ok": False,
-                "errors": [
-                    _error(
-                        "CHAIN_LINK_MISMATCH",
-                        "chain.prev_hash does not match previous proof chain.entry_hash.",
-                        index=index,
-                    )
-                ],
-            }
-
-        previous_entry_hash = entry_hash_norm
-
-    return {"ok": True, "errors": []}
+                return
+            previous_entry_hash = check[2]
+            count += 1
+            if progress_every and count % progress_every == 0:
+                yield {"event": "progress", "count": count, "head": previous_entry_hash}
+    finally:
+        checks.close()
+        if opened is not None:
+            opened.close()
+
+    if metrics is not None:
+        metrics.increment("chain.entries", count)
+    yield {"event": "result", "ok": True, "errors": [], "count": count, "head": previous_entry_hash}
+
+
+def verify_chain(
+    tokens: Iterable[str] | str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    *,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    metrics: Metrics | None = None,
+) -> dict[str, Any]:
+    for record in iter_verify_chain(
+        tokens,
+        public_key_pem,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+        metrics=metrics,
+    ):
+        pass
+    # The stream always ends with its result record.
+    return {"ok": record["ok"], "errors": record["errors"]}
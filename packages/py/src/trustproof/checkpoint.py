@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any
+
+import jwt
+from jwt import InvalidTokenError
+
+from . import _jws
+from ._fs import write_json_atomic
+from ._parallel import DEFAULT_CHUNK_SIZE
+from ._verify import Verifier, as_verifier
+from .archive import ProofArchive, is_archive
+from .chain import _is_hex64, iter_verify_chain, parse_token_line
+
+CHECKPOINT_VERSION = 1
+
+
+def _error(code: str, message: str, index: int | None = None) -> dict[str, Any]:
+    out: dict[str, Any] = {"code": code, "message": message}
+    if index is not None:
+        out["index"] = index
+    return out
+
+
+def _failed(error: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield {"event": "error", **error}
+    yield {"event": "result", "ok": False, "errors": [error], "count": 0, "head": None}
+
+
+def _checkpoint_problem(checkpoint: Any) -> str | None:
+    if not isinstance(checkpoint, dict):
+        return "not a JSON object"
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return f"unsupported version {checkpoint.get('version')!r}"
+    for name in ("chain_id", "entry_hash", "key_fingerprint"):
+        if not _is_hex64(checkpoint.get(name)):
+            return f"{name} must be a 64-char hex string"
+    for name, optional in (("index", False), ("offset", True)):
+        value = checkpoint.get(name)
+        if value is None and optional:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            return f"{name} must be a non-negative integer"
+    if checkpoint.get("kid") is not None and not isinstance(checkpoint["kid"], str):
+        return "kid must be a string"
+    return None
+
+
+def load_checkpoint(path: str | os.PathLike[str]) -> dict[str, Any] | None:
+    # Raises ValueError for truncated, hand-edited or foreign files.
+    checkpoint_path = Path(path)
+    if not checkpoint_path.exists():
+        return None
+    try:
+        checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise ValueError(f"Invalid checkpoint file {checkpoint_path}: {exc}") from exc
+    problem = _checkpoint_problem(checkpoint)
+    if problem is not None:
+        raise ValueError(f"Invalid checkpoint file {checkpoint_path}: {problem}.")
+    return checkpoint
+
+
+def save_checkpoint(path: str | os.PathLike[str], checkpoint: dict[str, Any]) -> None:
+    write_json_atomic(path, checkpoint)
+
+
+def _untrusted_kid(token: str) -> str | None:
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except InvalidTokenError:
+        return None
+    return kid if isinstance(kid, str) else None
+
+
+def _iter_complete_lines(path: Path, offset: int) -> Iterator[tuple[str, int]]:
+    # Only newline-terminated lines are consumed; a partially written last
+    # line is left for the next run (or the next poll in follow mode).
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        position = offset
+        for raw_line in handle:
+            if not raw_line.endswith(b"\n"):
+                return
+            position += len(raw_line)
+            token = parse_token_line(raw_line.decode("utf-8"), f"Byte offset {position}")
+            if token is not None:
+                yield token, position
+
+
+def _first_token(path: Path) -> str | None:
+    for token, _offset in _iter_complete_lines(path, 0):
+        return token
+    return None
+
+
+def verify_chain_incremental(
+    source: Iterable[str] | str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    checkpoint: dict[str, Any] | None = None,
+    *,
+    progress_every: int = 0,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    latencies: list[float] | None = None,
+) -> Iterator[dict[str, Any]]:
+    # A JSONL file is read from the checkpoint's byte offset, a proof archive
+    # from the checkpoint's record index; any other iterable must yield only
+    # the entries appended after the checkpoint. Progress and result records
+    # carry the updated checkpoint.
+    kwargs: dict[str, Any] = {
+        "progress_every": progress_every,
+        "workers": workers,
+        "executor": executor,
+        "chunk_size": chunk_size,
+        "latencies": latencies,
+    }
+    if isinstance(source, (str, os.PathLike)) and is_archive(source):
+        with ProofArchive(source) as archive:
+            yield from _verify_incremental(archive, public_key_pem, checkpoint, **kwargs)
+        return
+    yield from _verify_incremental(source, public_key_pem, checkpoint, **kwargs)
+
+
+def _verify_incremental(
+    source: Iterable[str] | str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    checkpoint: dict[str, Any] | None = None,
+    *,
+    progress_every: int = 0,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    latencies: list[float] | None = None,
+) -> Iterator[dict[str, Any]]:
+    verifier = as_verifier(public_key_pem)
+    is_file = isinstance(source, (str, os.PathLike))
+
+    chain_id: str | None = None
+    start_index = 0
+    previous_entry_hash: str | None = None
+    offset = 0
+    skip = 0
+    if checkpoint is not None:
+        problem = _checkpoint_problem(checkpoint)
+        if problem is not None:
+            yield from _failed(_error("CHECKPOINT_INVALID", f"Checkpoint is invalid: {problem}."))
+            return
+        # Bound to the key of the kid that signed the checkpointed entry, so
+        # adding or rotating other KeyRing keys keeps the checkpoint valid.
+        try:
+            key_fingerprint = verifier.key_fingerprint(checkpoint.get("kid"))
+        except KeyError:
+            key_fingerprint = None
+        if checkpoint.get("key_fingerprint") != key_fingerprint:
+            yield from _failed(
+                _error(
+                    "CHECKPOINT_KEY_MISMATCH",
+                    "Checkpoint was recorded with a different public key.",
+                )
+            )
+            return
+        chain_id = checkpoint["chain_id"]
+        start_index = checkpoint["index"] + 1
+        previous_entry_hash = checkpoint["entry_hash"]
+        offset = checkpoint.get("offset") or 0
+        # Checkpoints taken over a plain iterable have no byte offset; a file
+        # resumed from one skips the already verified lines without crypto.
+        skip = start_index if checkpoint.get("offset") is None else 0
+
+    offsets: deque[int] = deque()
+    if isinstance(source, ProofArchive):
+        # Archives are indexed: resume by record index, with no byte offset
+        # in the checkpoint, and hand iter_verify_chain a lazy slice.
+        if checkpoint is not None:
+            if start_index > len(source):
+                yield from _failed(
+                    _error("CHECKPOINT_MISMATCH", "Proof archive is shorter than the checkpoint.")
+                )
+                return
+            if not len(source) or _jws.untrusted_entry_hash(source[0]) != chain_id:
+                yield from _failed(
+                    _error(
+                        "CHECKPOINT_MISMATCH", "Proof archive does not match checkpoint chain_id."
+                    )
+                )
+                return
+        elif len(source):
+            chain_id = _jws.untrusted_entry_hash(source[0])
+        tokens: Iterable[str] = source[start_index:]
+    elif is_file:
+        path = Path(source)  # type: ignore[arg-type]
+        if checkpoint is not None:
+            if offset > path.stat().st_size:
+                yield from _failed(
+                    _error("CHECKPOINT_MISMATCH", "Proof log is shorter than the checkpoint.")
+                )
+                return
+            first = _first_token(path)
+            if first is None or _jws.untrusted_entry_hash(first) != chain_id:
+                yield from _failed(
+                    _error("CHECKPOINT_MISMATCH", "Proof log does not match checkpoint chain_id.")
+                )
+                return
+            skipped = 0
+            for _token, end_offset in itertools.islice(_iter_complete_lines(path, 0), skip):
+                offset = end_offset
+                skipped += 1
+            if skipped < skip:
+                yield from _failed(
+                    _error("CHECKPOINT_MISMATCH", "Proof log is shorter than the checkpoint.")
+                )
+                return
+
+        def _tokens() -> Iterator[str]:
+            for token, end_offset in _iter_complete_lines(path, offset):
+                offsets.append(end_offset)
+                yield token
+
+        tokens = _tokens()
+    else:
+        tokens = source  # type: ignore[assignment]
+
+    if chain_id is None:
+        tokens_iter = iter(tokens)
+        first = next(tokens_iter, None)
+        if first is None:
+            yield {"event": "result", "ok": True, "errors": [], "count": 0, "head": None}
+            return
+        chain_id = _jws.untrusted_entry_hash(first)
+        tokens = itertools.chain((first,), tokens_iter)
+
+    kids: deque[str | None] = deque()
+
+    def _tracked(tokens: Iterable[str]) -> Iterator[str]:
+        for token in tokens:
+            kids.append(_untrusted_kid(token))
+            yield token
+
+    consumed = 0
+    current_offset: int | None = offset if is_file else None
+    current_kid = checkpoint.get("kid") if checkpoint is not None else None
+    records = iter_verify_chain(
+        _tracked(tokens),
+        verifier,
+        progress_every=progress_every or chunk_size,
+        start_index=start_index,
+        previous_entry_hash=previous_entry_hash,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+        latencies=latencies,
+    )
+    for record in records:
+        if record["event"] == "error":
+            yield record
+            continue
+
+        count = record["count"]
+        while consumed < count:
+            if is_file:
+                current_offset = offsets.popleft()
+            current_kid = kids.popleft()
+            consumed += 1
+        if count:
+            record["checkpoint"] = {
+                "version": CHECKPOINT_VERSION,
+                "chain_id": chain_id,
+                "index": start_index + count - 1,
+                "entry_hash": record["head"],
+                "kid": current_kid,
+                "key_fingerprint": verifier.key_fingerprint(current_kid),
+                "offset": current_offset,
+            }
+        else:
+            record["checkpoint"] = checkpoint
+        if record["event"] == "progress" and not progress_every:
+            continue
+        yield record
+
+
+def follow_chain(
+    path: str | os.PathLike[str],
+    public_key_pem: str | Verifier,
+    checkpoint: dict[str, Any] | None = None,
+    *,
+    checkpoint_path: str | os.PathLike[str] | None = None,
+    poll_interval: float = 1.0,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    # Tails a growing proof log: each poll verifies only the newly appended
+    # lines and persists the checkpoint. Stops at the first failure.
+    verifier = as_verifier(public_key_pem)
+    while True:
+        for record in verify_chain_incremental(
+            path,
+            verifier,
+            checkpoint,
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+        ):
+            if record["event"] != "result":
+                yield record
+                continue
+            if not record["ok"]:
+                yield record
+                return
+            if record["count"]:
+                checkpoint = record["checkpoint"]
+                if checkpoint_path is not None:
+                    save_checkpoint(checkpoint_path, checkpoint)
+                yield record
+        time.sleep(poll_interval)
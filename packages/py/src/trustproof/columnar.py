@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any
+
+from . import _jws
+from ._parallel import DEFAULT_CHUNK_SIZE, map_chunks
+from ._time import to_epoch
+from ._verify import Verifier, as_verifier
+
+MAGIC = b"TPCOLS\x00\x01"
+VERSION = 1
+SIGNATURE_BYTES = 64
+
+# Matches generate._PAYLOAD_ENCODER, so fragments re-join into the exact
+# signed payload bytes for proofs this library produced.
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+# Whole-value dictionaries: these repeat across most entries of a chain.
+# resource is split into a dictionary-coded type and a plain id column.
+DICTIONARY_FIELDS = ("subject", "action", "policy", "result", "resource_type")
+STRING_FIELDS = ("jti", "timestamp", "resource_id")
+_HASH_PAIRS = {"hashes": ("input_hash", "output_hash"), "chain": ("prev_hash", "entry_hash")}
+
+
+class _Dictionary:
+    # Distinct values plus one uint32 code per row; code 0 means absent.
+    def __init__(self, values: list[str] | None = None) -> None:
+        self.values: list[str | None] = [None, *(values or [])]
+        self._codes_by_value = {value: code for code, value in enumerate(self.values)}
+        self.codes = array("I")
+
+    def add(self, value: str | None) -> None:
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = self._codes_by_value[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str | None:
+        return self.values[self.codes[row]]
+
+
+class _Strings:
+    # Variable-length UTF-8 values in one buffer with uint64 end offsets.
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.ends = array("Q")
+
+    def add(self, value: str) -> None:
+        self.data += value.encode("utf-8")
+        self.ends.append(len(self.data))
+
+    def __getitem__(self, row: int) -> str:
+        start = self.ends[row - 1] if row else 0
+        return self.data[start : self.ends[row]].decode("utf-8")
+
+
+def _hash_pair(value: Any, keys: tuple[str, str]) -> bytes | None:
+    # 64 raw bytes when value is exactly {keys[0]: hex, keys[1]: hex} with
+    # lowercase hex, so the JSON fragment can be rebuilt byte for byte.
+    if not isinstance(value, dict) or list(value) != list(keys):
+        return None
+    out = b""
+    for key in keys:
+        digest = value[key]
+        if not isinstance(digest, str) or len(digest) != 64 or digest != digest.lower():
+            return None
+        try:
+            out += bytes.fromhex(digest)
+        except ValueError:
+            return None
+    return out
+
+
+class ColumnarClaims:
+    # Claims of many proofs as typed columns. Repeated sub-objects are stored
+    # once per distinct value; rows keep the header, signature and every
+    # claim needed to rebuild the original token for re-verification. Fields
+    # that do not fit a column (unexpected shapes, custom claims) go to a
+    # per-row JSON "extra" object; a row whose rebuild would not match the
+    # original token keeps the raw token instead.
+    def __init__(self) -> None:
+        self._count = 0
+        self._dictionaries = {
+            name: _Dictionary() for name in ("header", "shape", *DICTIONARY_FIELDS)
+        }
+        self._strings = {name: _Strings() for name in (*STRING_FIELDS, "extra")}
+        self._hashes = {name: bytearray() for name in _HASH_PAIRS}
+        self._signatures = bytearray()
+        self._iat = array("q")
+        self._ts = array("d")
+        self._raw: dict[int, str] = {}
+        self._shapes: dict[int, list[str]] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, token: str) -> int:
+        # Does not verify the token; export_columnar() does.
+        _header, payload, signing_input, signature = _jws.load_compact(token)
+        claims = _jws.decode_payload(payload)
+        if len(signature) != SIGNATURE_BYTES:
+            raise ValueError("Only Ed25519 (64-byte) signatures can be stored.")
+        row = self._count
+        extra: dict[str, Any] = {}
+        dictionaries, strings = self._dictionaries, self._strings
+
+        dictionaries["header"].add(signing_input.split(b".", 1)[0].decode("ascii"))
+        dictionaries["shape"].add(_encode(list(claims)))
+        for field in ("subject", "action", "policy", "result"):
+            dictionaries[field].add(_encode(claims[field]) if field in claims else None)
+
+        resource = claims.get("resource")
+        if (
+            isinstance(resource, dict)
+            and list(resource) == ["type", "id"]
+            and isinstance(resource["id"], str)
+        ):
+            dictionaries["resource_type"].add(_encode(resource["type"]))
+            strings["resource_id"].add(resource["id"])
+        else:
+            dictionaries["resource_type"].add(None)
+            strings["resource_id"].add("")
+            if "resource" in claims:
+                extra["resource"] = resource
+
+        for field in ("jti", "timestamp"):
+            value = claims.get(field)
+            strings[field].add(value if isinstance(value, str) else "")
+            if field in claims and not isinstance(value, str):
+                extra[field] = value
+        epoch = to_epoch(claims.get("timestamp"))
+        self._ts.append(epoch if epoch is not None else math.nan)
+
+        for field, keys in _HASH_PAIRS.items():
+            pair = _hash_pair(claims.get(field), keys)
+            self._hashes[field] += pair if pair is not None else bytes(64)
+            if pair is None and field in claims:
+                extra[field] = claims[field]
+
+        iat = claims.get("iat")
+        if type(iat) is int and -(2**63) <= iat < 2**63:
+            self._iat.append(iat)
+        else:
+            self._iat.append(0)
+            if "iat" in claims:
+                extra["iat"] = iat
+
+        known = {"subject", "action", "policy", "result", "resource", "jti", "timestamp", "iat"}
+        for field, value in claims.items():
+            if field not in known and field not in _HASH_PAIRS:
+                extra[field] = value
+        strings["extra"].add(_encode(extra) if extra else "")
+        self._signatures += signature
+        self._count += 1
+
+        if self.token(row) != token:
+            self._raw[row] = token
+        return row
+
+    def extend(self, tokens: Iterable[str]) -> None:
+        for token in tokens:
+            self.add(token)
+
+    def _shape(self, row: int) -> list[str]:
+        code = self._dictionaries["shape"].codes[row]
+        shape = self._shapes.get(code)
+        if shape is None:
+            shape = self._shapes[code] = json.loads(self._dictionaries["shape"].values[code])
+        return shape
+
+    def _fragment(self, field: str, row: int) -> str:
+        if field in ("subject", "action", "policy", "result"):
+            return self._dictionaries[field][row]
+        if field == "resource":
+            resource_type = self._dictionaries["resource_type"][row]
+            resource_id = _encode(self._strings["resource_id"][row])
+            return f'{{"type":{resource_type},"id":{resource_id}}}'
+        if field in ("jti", "timestamp"):
+            return _encode(self._strings[field][row])
+        if field in _HASH_PAIRS:
+            pair = self._hashes[field][row * 64 : row * 64 + 64]
+            first, second = _HASH_PAIRS[field]
+            return f'{{"{first}":"{pair[:32].hex()}","{second}":"{pair[32:].hex()}"}}'
+        if field == "iat":
+            return str(self._iat[row])
+        raise KeyError(field)
+
+    def _payload_json(self, row: int) -> str:
+        extra_json = self._strings["extra"][row]
+        extra = json.loads(extra_json) if extra_json else {}
+        parts = []
+        for field in self._shape(row):
+            fragment = _encode(extra[field]) if field in extra else self._fragment(field, row)
+            parts.append(f"{_encode(field)}:{fragment}")
+        return "{" + ",".join(parts) + "}"
+
+    def _row(self, row: int) -> int:
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("row out of range")
+        return row
+
+    def token(self, row: int) -> str:
+        row = self._row(row)
+        raw = self._raw.get(row)
+        if raw is not None:
+            return raw
+        payload = _jws.b64url_encode(self._payload_json(row).encode("utf-8")).decode("ascii")
+        signature = self._signatures[row * SIGNATURE_BYTES : (row + 1) * SIGNATURE_BYTES]
+        return ".".join(
+            (
+                self._dictionaries["header"][row],
+                payload,
+                _jws.b64url_encode(bytes(signature)).decode("ascii"),
+            )
+        )
+
+    def claims(self, row: int) -> dict[str, Any]:
+        row = self._row(row)
+        raw = self._raw.get(row)
+        if raw is not None:
+            return _jws.decode_untrusted(raw)
+        return json.loads(self._payload_json(row))
+
+    def iter_claims(self, rows: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+        for row in range(self._count) if rows is None else rows:
+            yield self.claims(row)
+
+    def iter_tokens(self, rows: Iterable[int] | None = None) -> Iterator[str]:
+        for row in range(self._count) if rows is None else rows:
+            yield self.token(row)
+
+    def _matching_codes(self, name: str, predicate: Any) -> set[int]:
+        # Decodes each distinct value once, never the rows.
+        codes = set()
+        for code, value in enumerate(self._dictionaries[name].values):
+            if value is not None and predicate(json.loads(value)):
+                codes.add(code)
+        return codes
+
+    def select(
+        self,
+        *,
+        decision: str | None = None,
+        action: str | None = None,
+        resource_type: str | None = None,
+        subject_type: str | None = None,
+        subject_id: str | None = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> list[int]:
+        # Row numbers matching every given filter, computed from the code and
+        # timestamp columns. since/until accept the forms ProofStore.query does
+        # and, like it, select the half-open range since <= timestamp < until.
+        checks: list[tuple[array, set[int]]] = []
+        if decision is not None:
+            checks.append(
+                (
+                    self._dictionaries["result"].codes,
+                    self._matching_codes(
+                        "result", lambda v: isinstance(v, dict) and v.get("decision") == decision
+                    ),
+                )
+            )
+        if action is not None:
+            checks.append(
+                (self._dictionaries["action"].codes, self._matching_codes("action", action.__eq__))
+            )
+        if resource_type is not None:
+            checks.append(
+                (
+                    self._dictionaries["resource_type"].codes,
+                    self._matching_codes("resource_type", resource_type.__eq__),
+                )
+            )
+        for key, wanted in (("type", subject_type), ("id", subject_id)):
+            if wanted is not None:
+                checks.append(
+                    (
+                        self._dictionaries["subject"].codes,
+                        self._matching_codes(
+                            "subject",
+                            lambda v, key=key, wanted=wanted: isinstance(v, dict)
+                            and v.get(key) == wanted,
+                        ),
+                    )
+                )
+        low = to_epoch(since) if since is not None else None
+        high = to_epoch(until) if until is not None else None
+        if (since is not None and low is None) or (until is not None and high is None):
+            raise ValueError("since/until must be epoch seconds, ISO 8601 strings or datetimes.")
+
+        rows = []
+        ts = self._ts
+        for row in range(self._count):
+            if any(codes[row] not in allowed for codes, allowed in checks):
+                continue
+            if low is not None and not ts[row] >= low:
+                continue
+            if high is not None and not ts[row] < high:
+                continue
+            rows.append(row)
+        return rows
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        # magic, u32 meta length, JSON meta, then the column buffers in the
+        # order meta["columns"] lists them.
+        buffers: list[tuple[str, str, bytes]] = []
+        for name, dictionary in self._dictionaries.items():
+            buffers.append((f"codes.{name}", "I", dictionary.codes.tobytes()))
+        for name, strings in self._strings.items():
+            buffers.append((f"data.{name}", "B", bytes(strings.data)))
+            buffers.append((f"ends.{name}", "Q", strings.ends.tobytes()))
+        for name, pairs in self._hashes.items():
+            buffers.append((f"pairs.{name}", "B", bytes(pairs)))
+        buffers.append(("signatures", "B", bytes(self._signatures)))
+        buffers.append(("iat", "q", self._iat.tobytes()))
+        buffers.append(("ts", "d", self._ts.tobytes()))
+        meta = {
+            "version": VERSION,
+            "count": self._count,
+            "byteorder": sys.byteorder,
+            "dictionaries": {
+                name: dictionary.values[1:] for name, dictionary in self._dictionaries.items()
+            },
+            "columns": [[name, typecode, len(data)] for name, typecode, data in buffers],
+            "raw": {str(row): token for row, token in self._raw.items()},
+        }
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+
+        target = Path(path)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(MAGIC)
+                handle.write(len(meta_bytes).to_bytes(4, "little"))
+                handle.write(meta_bytes)
+                for _name, _typecode, data in buffers:
+                    handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> ColumnarClaims:
+        data = Path(path).read_bytes()
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a columnar claims file.")
+        start = len(MAGIC) + 4
+        meta_length = int.from_bytes(data[len(MAGIC) : start], "little")
+        try:
+            meta = json.loads(data[start : start + meta_length])
+        except ValueError as exc:
+            raise ValueError(f"{path} has a corrupt header: {exc}") from exc
+        if meta.get("version") != VERSION:
+            raise ValueError(f"Unsupported columnar claims version {meta.get('version')}.")
+
+        columns: dict[str, Any] = {}
+        position = start + meta_length
+        for name, typecode, length in meta["columns"]:
+            chunk = data[position : position + length]
+            if len(chunk) != length:
+                raise ValueError(f"{path} is truncated (column {name}).")
+            position += length
+            if typecode == "B":
+                columns[name] = bytearray(chunk)
+            else:
+                column = array(typecode)
+                column.frombytes(chunk)
+                if meta["byteorder"] != sys.byteorder:
+                    column.byteswap()
+                columns[name] = column
+
+        table = cls()
+        table._count = meta["count"]
+        for name, values in meta["dictionaries"].items():
+            dictionary = table._dictionaries[name] = _Dictionary(values)
+            dictionary.codes = columns[f"codes.{name}"]
+        for name, strings in table._strings.items():
+            strings.data = columns[f"data.{name}"]
+            strings.ends = columns[f"ends.{name}"]
+        for name in table._hashes:
+            table._hashes[name] = columns[f"pairs.{name}"]
+        table._signatures = columns["signatures"]
+        table._iat = columns["iat"]
+        table._ts = columns["ts"]
+        table._raw = {int(row): token for row, token in meta["raw"].items()}
+        return table
+
+
+def _verified_tokens(verifier: Verifier, tokens: list[str]) -> list[str | None]:
+    return [
+        token if verifier.verify(token, check_replay=False)["ok"] else None for token in tokens
+    ]
+
+
+def export_columnar(
+    tokens: Iterable[str],
+    public_key_pem: str | Verifier,
+    *,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[ColumnarClaims, list[int]]:
+    # Verifies every token and stores the ones that pass. Returns the table
+    # and the input positions of tokens that failed verification.
+    verifier = as_verifier(public_key_pem)
+    table = ColumnarClaims()
+    rejected = []
+    results = map_chunks(
+        _verified_tokens,
+        tokens,
+        verifier,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+    )
+    for index, token in enumerate(results):
+        if token is None:
+            rejected.append(index)
+        else:
+            table.add(token)
+    return table, rejected
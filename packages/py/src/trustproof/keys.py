@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Mapping
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+import jwt
+from jwt import InvalidTokenError
+
+from ._verify import Verifier, VerifyLimits, _key_fingerprint, _load_ed25519_public_key
+from .cache import VerifyCache
+from .metrics import Metrics
+from .replay import ReplayStore
+
+
+def _jwk_to_pem(jwk: Any) -> str:
+    if not isinstance(jwk, dict):
+        raise ValueError("JWKS keys must be JSON objects.")
+    if jwk.get("kty") != "OKP" or jwk.get("crv") != "Ed25519":
+        raise ValueError(f"Unsupported JWK (kid={jwk.get('kid')!r}): expected OKP/Ed25519.")
+    x = jwk.get("x")
+    if not isinstance(x, str):
+        raise ValueError(f"JWK kid={jwk.get('kid')!r} is missing x.")
+    try:
+        raw = base64.urlsafe_b64decode(x + "=" * (-len(x) % 4))
+        public_key = Ed25519PublicKey.from_public_bytes(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError(f"JWK kid={jwk.get('kid')!r} has an invalid x: {exc}") from exc
+    return public_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode("ascii")
+
+
+class KeyRing(Verifier):
+    # A Verifier over several Ed25519 keys, selected by the token header's
+    # kid with one dict lookup; keys are parsed once when added. Tokens
+    # without a kid use default_kid, or are rejected when it is None.
+    def __init__(
+        self,
+        keys: Mapping[str, str],
+        replay_store: ReplayStore | None = None,
+        *,
+        default_kid: str | None = None,
+        strict_replay: bool = True,
+        metrics: Metrics | None = None,
+        limits: VerifyLimits | None = None,
+        cache: VerifyCache | None = None,
+        fast_path: bool = False,
+    ) -> None:
+        self.default_kid = default_kid
+        super().__init__(
+            keys,  # type: ignore[arg-type]
+            replay_store,
+            strict_replay=strict_replay,
+            metrics=metrics,
+            limits=limits,
+            cache=cache,
+            fast_path=fast_path,
+        )
+        if default_kid is not None and default_kid not in self._keys:
+            raise ValueError(f"default_kid {default_kid!r} is not in the key ring.")
+
+    def _load_keys(self, keys: Mapping[str, str]) -> None:  # type: ignore[override]
+        self._pems: dict[str, str] = {}
+        self._keys: dict[str, Ed25519PublicKey] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._set_fingerprint()
+        for kid, public_key_pem in keys.items():
+            self.add(kid, public_key_pem)
+
+    @classmethod
+    def from_directory(cls, path: str | Path, **kwargs: Any) -> KeyRing:
+        # One PEM per file; the file name without .pem is the kid.
+        keys = {
+            entry.stem: entry.read_text(encoding="utf-8")
+            for entry in sorted(Path(path).glob("*.pem"))
+            if entry.is_file()
+        }
+        if not keys:
+            raise ValueError(f"No *.pem public keys found in {path}.")
+        return cls(keys, **kwargs)
+
+    @classmethod
+    def from_jwks(cls, jwks: str | Path | Mapping[str, Any], **kwargs: Any) -> KeyRing:
+        # A JWKS document ({"keys": [...]}) as a mapping, JSON text or path.
+        if isinstance(jwks, Path) or (isinstance(jwks, str) and not jwks.lstrip().startswith("{")):
+            jwks = Path(jwks).read_text(encoding="utf-8")
+        if isinstance(jwks, str):
+            try:
+                jwks = json.loads(jwks)
+            except ValueError as exc:
+                raise ValueError(f"Invalid JWKS JSON: {exc}") from exc
+        entries = jwks.get("keys") if isinstance(jwks, Mapping) else None
+        if not isinstance(entries, list) or not entries:
+            raise ValueError("JWKS must contain a non-empty keys array.")
+        keys: dict[str, str] = {}
+        for jwk in entries:
+            kid = jwk.get("kid") if isinstance(jwk, dict) else None
+            if not isinstance(kid, str) or not kid:
+                raise ValueError("Every JWKS key needs a non-empty string kid.")
+            keys[kid] = _jwk_to_pem(jwk)
+        return cls(keys, **kwargs)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (
+            type(self),
+            (dict(self._pems),),
+            {
+                "limits": self.limits,
+                "default_kid": self.default_kid,
+                "fast_path": self.fast_path,
+            },
+        )
+
+    def __contains__(self, kid: object) -> bool:
+        return kid in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._keys)
+
+    def _set_fingerprint(self) -> None:
+        # Identifies the exact set of kid -> key. Checkpoints, store rows and
+        # cached results use the signing kid's key_fingerprint() instead, so
+        # rotating one key leaves the others' state valid.
+        material = "\n".join(f"{kid}:{self._fingerprints[kid]}" for kid in sorted(self._keys))
+        self.fingerprint = sha256(material.encode("utf-8")).hexdigest()
+
+    def key_fingerprint(self, kid: str | None = None) -> str:
+        return self._fingerprints[kid if kid is not None else self.default_kid]
+
+    def _token_key_fingerprint(self, token: str | bytes) -> str | None:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid", self.default_kid)
+        except InvalidTokenError:
+            return None
+        return self._fingerprints.get(kid)
+
+    def _drop_cached(self, fingerprint: str | None) -> None:
+        if fingerprint is not None and self.cache is not None:
+            self.cache.invalidate(fingerprint)
+
+    def add(self, kid: str, public_key_pem: str) -> None:
+        # Replacing kid's key drops results cached for the old key only.
+        if not isinstance(kid, str) or not kid:
+            raise ValueError("kid must be a non-empty string.")
+        public_key = _load_ed25519_public_key(public_key_pem)
+        fingerprint = _key_fingerprint(public_key)
+        previous = self._fingerprints.get(kid)
+        self._keys[kid] = public_key
+        self._pems[kid] = public_key_pem
+        self._fingerprints[kid] = fingerprint
+        self._set_fingerprint()
+        if previous != fingerprint:
+            self._drop_cached(previous)
+
+    def remove(self, kid: str) -> None:
+        # Revokes kid; results cached for its key are dropped.
+        if kid not in self._keys:
+            return
+        del self._keys[kid]
+        del self._pems[kid]
+        previous = self._fingerprints.pop(kid)
+        if self.default_kid == kid:
+            self.default_kid = None
+        self._set_fingerprint()
+        self._drop_cached(previous)
+
+    def _key_for_token(self, token: str | bytes) -> Ed25519PublicKey:
+        return self._key_for(jwt.get_unverified_header(token))
+
+    def _key_for(self, header: dict[str, Any]) -> Ed25519PublicKey:
+        kid = header.get("kid", self.default_kid)
+        if kid is None:
+            raise InvalidTokenError("Token header has no kid and the key ring has no default")
+        public_key = self._keys.get(kid)
+        if public_key is None:
+            raise InvalidTokenError(f"Unknown kid: {kid!r}")
+        return public_key
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from hashlib import sha256
+from typing import Any
+
+from jwt import InvalidTokenError
+
+from . import _jws
+from ._generate import Signer, as_signer
+from ._verify import Verifier, as_verifier
+from .chain import _is_hex64, normalize_hex
+
+# RFC 6962 Merkle Tree Hash over the raw 32-byte entry hashes, with domain
+# separated leaf (0x00) and interior (0x01) hashing.
+MERKLE_ALG = "rfc6962-sha256"
+
+
+def _error(code: str, message: str, index: int | None = None) -> dict[str, Any]:
+    out: dict[str, Any] = {"code": code, "message": message}
+    if index is not None:
+        out["index"] = index
+    return out
+
+
+def _leaf_hash(entry_hash: str) -> bytes:
+    if not _is_hex64(entry_hash):
+        raise ValueError("entry_hash must be a 64-char hex string.")
+    return sha256(b"\x00" + bytes.fromhex(entry_hash)).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return sha256(b"\x01" + left + right).digest()
+
+
+class MerkleTree:
+    # levels[0] holds leaf hashes; levels[k] holds the parents of complete
+    # pairs in levels[k - 1]. A trailing odd node is promoted unchanged,
+    # which gives the same root as RFC 6962's split at the largest power of
+    # two. Appends cost O(log n); the prefix of every level is also the tree
+    # for any earlier size, so proofs can target a previously signed root.
+    # chain_id is the first entry_hash, the id checkpoints use for a chain.
+    def __init__(self, entry_hashes: Iterable[str] = ()) -> None:
+        self._levels: list[list[bytes]] = [[]]
+        self.chain_id: str | None = None
+        for entry_hash in entry_hashes:
+            self.append(entry_hash)
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str]) -> MerkleTree:
+        # Reads chain.entry_hash without checking signatures; build from a
+        # chain that verify_chain() has accepted.
+        tree = cls()
+        for token in tokens:
+            chain = _jws.decode_untrusted(token).get("chain")
+            entry_hash = chain.get("entry_hash") if isinstance(chain, dict) else None
+            tree.append(entry_hash)
+        return tree
+
+    @property
+    def size(self) -> int:
+        return len(self._levels[0])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, entry_hash: str) -> int:
+        node = _leaf_hash(entry_hash)
+        if self.chain_id is None:
+            self.chain_id = normalize_hex(entry_hash)
+        levels = self._levels
+        level = 0
+        while True:
+            nodes = levels[level]
+            nodes.append(node)
+            if len(nodes) % 2:
+                break
+            node = _node_hash(nodes[-2], nodes[-1])
+            level += 1
+            if level == len(levels):
+                levels.append([])
+        return self.size - 1
+
+    def _check_size(self, size: int | None) -> int:
+        if size is None:
+            size = self.size
+        if not 0 <= size <= self.size:
+            raise ValueError(f"size must be between 0 and {self.size}.")
+        return size
+
+    def _carries(self, size: int) -> list[bytes | None]:
+        # carries[k] is the node promoted into level k from below (the hash
+        # of the incomplete right edge), or None when level k has no tail.
+        carries: list[bytes | None] = []
+        carry: bytes | None = None
+        level = 0
+        while size >> level:
+            carries.append(carry)
+            count = size >> level
+            if count % 2:
+                last = self._levels[level][count - 1]
+                carry = last if carry is None else _node_hash(last, carry)
+            level += 1
+        carries.append(carry)
+        return carries
+
+    def root(self, size: int | None = None) -> str:
+        size = self._check_size(size)
+        if size == 0:
+            return sha256(b"").hexdigest()
+        return self._carries(size)[-1].hex()  # type: ignore[union-attr]
+
+    def inclusion_proof(self, index: int, size: int | None = None) -> list[str]:
+        size = self._check_size(size)
+        if not 0 <= index < size:
+            raise ValueError(f"index must be between 0 and {size - 1}.")
+        carries = self._carries(size)
+        path: list[str] = []
+        position = index
+        level = 0
+        while (size >> level) + (carries[level] is not None) > 1:
+            count = size >> level
+            nodes = self._levels[level]
+            if position % 2:
+                path.append(nodes[position - 1].hex())
+            elif position + 1 < count:
+                path.append(nodes[position + 1].hex())
+            elif position + 1 == count and carries[level] is not None:
+                path.append(carries[level].hex())  # type: ignore[union-attr]
+            position //= 2
+            level += 1
+        return path
+
+
+def root_from_inclusion_proof(entry_hash: str, index: int, size: int, proof: list[str]) -> str:
+    # RFC 6962 section 2.1.1 audit path verification, iterative form.
+    if not 0 <= index < size:
+        raise ValueError("index must be within the tree size.")
+    node = _leaf_hash(entry_hash)
+    position, last = index, size - 1
+    for sibling_hex in proof:
+        if not _is_hex64(sibling_hex):
+            raise ValueError("Inclusion proof entries must be 64-char hex strings.")
+        sibling = bytes.fromhex(sibling_hex)
+        if last == 0:
+            raise ValueError("Inclusion proof is longer than the tree height.")
+        if position % 2 or position == last:
+            node = _node_hash(sibling, node)
+            while not position % 2 and position:
+                position //= 2
+                last //= 2
+        else:
+            node = _node_hash(node, sibling)
+        position //= 2
+        last //= 2
+    if last != 0:
+        raise ValueError("Inclusion proof is shorter than the tree height.")
+    return node.hex()
+
+
+def sign_root(
+    tree: MerkleTree,
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+    *,
+    size: int | None = None,
+) -> str:
+    # The root is bound to its chain, so it cannot vouch for another one.
+    size = tree._check_size(size)
+    if tree.chain_id is None:
+        raise ValueError("Cannot sign the root of an empty tree.")
+    payload = {
+        "merkle": {
+            "alg": MERKLE_ALG,
+            "chain_id": tree.chain_id,
+            "size": size,
+            "root": tree.root(size),
+        },
+        "iat": int(time.time()),
+    }
+    return as_signer(private_key_pem).encode(payload, kid=kid)
+
+
+def verify_inclusion(
+    token: str,
+    index: int,
+    proof: list[str],
+    signed_root: str,
+    public_key_pem: str | Verifier,
+    *,
+    chain_id: str,
+) -> dict[str, Any]:
+    # Checks one receipt (signature and schema), the signed root of chain_id
+    # (the chain's first entry_hash), and the audit path between them:
+    # O(log n) hashes instead of the whole chain.
+    if not _is_hex64(chain_id):
+        raise ValueError("chain_id must be a 64-char hex string.")
+    verifier = as_verifier(public_key_pem)
+
+    result = verifier.verify(token, check_replay=False)
+    if not result["ok"]:
+        return {
+            "ok": False,
+            "errors": [_error("INVALID_PROOF", "Proof signature/schema verification failed.", index)],
+        }
+
+    try:
+        root_claims = verifier.decode(signed_root)
+    except InvalidTokenError:
+        return {
+            "ok": False,
+            "errors": [_error("INVALID_SIGNED_ROOT", "Signed Merkle root verification failed.")],
+        }
+    merkle = root_claims.get("merkle")
+    if (
+        not isinstance(merkle, dict)
+        or merkle.get("alg") != MERKLE_ALG
+        or not _is_hex64(merkle.get("chain_id"))
+        or not isinstance(merkle.get("size"), int)
+        or not _is_hex64(merkle.get("root"))
+    ):
+        return {
+            "ok": False,
+            "errors": [_error("INVALID_SIGNED_ROOT", "Signed Merkle root payload is malformed.")],
+        }
+    if normalize_hex(merkle["chain_id"]) != normalize_hex(chain_id):
+        return {
+            "ok": False,
+            "errors": [
+                _error("CHAIN_ID_MISMATCH", "Signed Merkle root belongs to a different chain.")
+            ],
+        }
+
+    entry_hash = result["claims"]["chain"]["entry_hash"]
+    if index == 0 and normalize_hex(entry_hash) != normalize_hex(chain_id):
+        return {
+            "ok": False,
+            "errors": [
+                _error("CHAIN_ID_MISMATCH", "The first entry_hash is not the chain_id.", index)
+            ],
+        }
+    try:
+        computed = root_from_inclusion_proof(entry_hash, index, merkle["size"], proof)
+    except ValueError as exc:
+        return {"ok": False, "errors": [_error("INCLUSION_PROOF_INVALID", str(exc), index)]}
+    if computed != normalize_hex(merkle["root"]):
+        return {
+            "ok": False,
+            "errors": [
+                _error(
+                    "INCLUSION_PROOF_INVALID",
+                    "Inclusion proof does not lead to the signed Merkle root.",
+                    index,
+                )
+            ],
+        }
+    return {
+        "ok": True,
+        "errors": [],
+        "root": computed,
+        "size": merkle["size"],
+        "chain_id": normalize_hex(chain_id),
+    }
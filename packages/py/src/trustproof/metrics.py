@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds in seconds: 10us .. 10s, roughly three buckets per decade.
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Metrics:
+    # Instrumentation sink passed as metrics= to verify/verify_chain/generate.
+    # Phases are dotted names ("verify.signature"); counters include
+    # "verify.errors.<CODE>" and "bytes_hashed". Calls are made only when a
+    # sink is supplied, so metrics=None costs a None check per phase.
+    def observe(self, phase: str, seconds: float) -> None:
+        pass
+
+    def increment(self, name: str, value: int = 1) -> None:
+        pass
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+
+class InMemoryMetrics(Metrics):
+    # Thread-safe fixed-bucket histograms per phase plus counters, for
+    # scraping via snapshot(). Quantiles are bucket upper bounds.
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty ascending sequence.")
+        self.buckets = tuple(buckets)
+        self._histograms: dict[str, _Histogram] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                # The extra slot counts observations above the last bound.
+                histogram = self._histograms[phase] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[slot] += 1
+            histogram.count += 1
+            histogram.total += seconds
+            if seconds < histogram.minimum:
+                histogram.minimum = seconds
+            if seconds > histogram.maximum:
+                histogram.maximum = seconds
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def _quantile(self, histogram: _Histogram, fraction: float) -> float:
+        rank = fraction * histogram.count
+        seen = 0
+        for slot, count in enumerate(histogram.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[slot] if slot < len(self.buckets) else histogram.maximum
+        return histogram.maximum
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            phases = {
+                phase: {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "min": histogram.minimum,
+                    "max": histogram.maximum,
+                    "p50": self._quantile(histogram, 0.50),
+                    "p99": self._quantile(histogram, 0.99),
+                    "buckets": [
+                        [bound, count]
+                        for bound, count in zip((*self.buckets, "+Inf"), histogram.counts)
+                    ],
+                }
+                for phase, histogram in self._histograms.items()
+            }
+            return {"phases": phases, "counters": dict(self._counters)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any
+
+from . import _jws
+
+# (code, message, details); details is None when the dict shape omits it.
+CompactError = tuple[str, str, Any]
+
+
+class Proof:
+    # A compact JWS split and base64-decoded once. The payload JSON is only
+    # parsed when a claim is first read, so proofs that fail the signature
+    # check (or are only routed by header) never build a claims dict.
+    __slots__ = ("token", "header", "signing_input", "signature", "_payload", "_claims")
+
+    def __init__(self, token: str | bytes) -> None:
+        # Raises jwt.DecodeError for anything that is not a compact JWS.
+        self.token = token
+        self.header, self._payload, self.signing_input, self.signature = _jws.load_compact(token)
+        self._claims: dict[str, Any] | None = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Ship the token alone; the receiver re-splits it.
+        return (type(self), (self.token,))
+
+    def __repr__(self) -> str:
+        return f"Proof(kid={self.kid!r}, {len(self.token)} bytes)"
+
+    @property
+    def kid(self) -> str | None:
+        return self.header.get("kid")
+
+    @property
+    def claims(self) -> dict[str, Any]:
+        # Untrusted until a Verifier has checked this proof.
+        if self._claims is None:
+            self._claims = _jws.decode_payload(self._payload)
+        return self._claims
+
+    def __getitem__(self, name: str) -> Any:
+        return self.claims[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.claims.get(name, default)
+
+    @property
+    def jti(self) -> Any:
+        return self.claims.get("jti")
+
+    @property
+    def prev_hash(self) -> Any:
+        chain = self.claims.get("chain")
+        return chain.get("prev_hash") if isinstance(chain, dict) else None
+
+    @property
+    def entry_hash(self) -> Any:
+        chain = self.claims.get("chain")
+        return chain.get("entry_hash") if isinstance(chain, dict) else None
+
+
+_NO_ERRORS: tuple[CompactError, ...] = ()
+
+
+def compact_errors(errors: list[dict[str, Any]]) -> tuple[CompactError, ...]:
+    if not errors:
+        return _NO_ERRORS
+    return tuple((error["code"], error["message"], error.get("details")) for error in errors)
+
+
+class VerifyResult:
+    # Slotted counterpart of the verify() result dict. Errors are kept as
+    # (code, message, details) tuples, passing results share one empty
+    # tuple, and claims are the verified proof's own dict; to_dict() (or
+    # the errors property) builds the dict shape on request.
+    __slots__ = ("ok", "proof", "claims", "_errors", "replay_risk")
+
+    def __init__(
+        self,
+        ok: bool,
+        proof: Proof | None,
+        claims: dict[str, Any] | None,
+        errors: tuple[CompactError, ...] = _NO_ERRORS,
+        replay_risk: bool | None = None,
+    ) -> None:
+        self.ok = ok
+        self.proof = proof
+        # None when the signature did not verify, like the dict's missing "claims".
+        self.claims = claims
+        self._errors = errors
+        self.replay_risk = replay_risk
+
+    @classmethod
+    def from_dict(cls, result: dict[str, Any], proof: Proof | None = None) -> VerifyResult:
+        return cls(
+            result["ok"],
+            proof,
+            result.get("claims"),
+            compact_errors(result["errors"]),
+            result.get("replay_risk"),
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Results coming back from worker processes leave the proof behind.
+        return (type(self), (self.ok, None, self.claims, self._errors, self.replay_risk))
+
+    def __repr__(self) -> str:
+        return f"VerifyResult(ok={self.ok!r}, codes={self.codes!r})"
+
+    @property
+    def codes(self) -> tuple[str, ...]:
+        return tuple(code for code, _message, _details in self._errors)
+
+    @property
+    def errors(self) -> list[dict[str, Any]]:
+        errors = []
+        for code, message, details in self._errors:
+            error: dict[str, Any] = {"code": code, "message": message}
+            if details is not None:
+                error["details"] = details
+            errors.append(error)
+        return errors
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"ok": self.ok}
+        if self.claims is not None:
+            out["claims"] = self.claims
+        out["errors"] = self.errors
+        if self.replay_risk is not None:
+            out["replay_risk"] = self.replay_risk
+        return out
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+class ReplayStore(ABC):
+    # Contract: check_and_add() atomically records jti until expires_at (unix
+    # seconds) and returns True only the first time a live jti is seen.
+    ttl_seconds: float = DEFAULT_TTL_SECONDS
+
+    @abstractmethod
+    def check_and_add(self, jti: str, expires_at: float) -> bool: ...
+
+    def live_jtis(self) -> Iterable[str] | None:
+        # Unexpired jtis, used to warm a BloomReplayStore; None when the
+        # store cannot list them.
+        return None
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self.check_and_add(jti, expires_at)
+
+
+class ReplayStoreFull(RuntimeError):
+    # Raised instead of dropping a live jti: forgetting one would let its
+    # replay pass as new, so a full store fails closed.
+    pass
+
+
+class MemoryReplayStore(ReplayStore):
+    # Entries sit in a dict for lookups and in a heap ordered by expiry, so
+    # expired jtis are purged from the front regardless of access order.
+    # When max_entries live jtis are held, new ones raise ReplayStoreFull.
+    def __init__(
+        self,
+        max_entries: int = 1_000_000,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired(self, now: float) -> None:
+        entries, expiry = self._entries, self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, jti = heapq.heappop(expiry)
+            # Skip heap records left behind when a jti was re-added.
+            if entries.get(jti) == expires_at:
+                del entries[jti]
+
+    def live_jtis(self) -> list[str]:
+        now = time.time()
+        with self._lock:
+            return [jti for jti, expires_at in self._entries.items() if expires_at > now]
+
+    def check_and_add(self, jti: str, expires_at: float) -> bool:
+        now = time.time()
+        with self._lock:
+            seen_until = self._entries.get(jti)
+            if seen_until is not None and seen_until > now:
+                return False
+            self._purge_expired(now)
+            if jti not in self._entries and len(self._entries) >= self.max_entries:
+                raise ReplayStoreFull(
+                    f"Replay store holds {self.max_entries} unexpired jtis."
+                )
+            self._entries[jti] = expires_at
+            heapq.heappush(self._expiry, (expires_at, jti))
+            return True
+
+
+class BloomReplayStore(ReplayStore):
+    # A Bloom filter answers "definitely new" for most fresh jtis without
+    # touching the exact backing store; possible hits fall through to it.
+    # Bits are never cleared (that could let a replay through), so an
+    # over-full filter only costs extra backing-store lookups. The filter is
+    # warmed from the backing's live jtis when built, so it must be the only
+    # writer to that backing from then on; a store shared with other
+    # processes, or one that cannot list its jtis, is checked on every call.
+    def __init__(
+        self,
+        backing: ReplayStore,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1.")
+        self.backing = backing
+        self.ttl_seconds = backing.ttl_seconds
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+        live = backing.live_jtis()
+        self._warmed = live is not None
+        for jti in live or ():
+            self._set_bits(self._positions(jti))
+
+    def _positions(self, jti: str) -> list[int]:
+        # One blake2b call yields every probe (32 bits each, up to 16 probes);
+        # beyond that, double hashing derives the rest.
+        num_bits = self.num_bits
+        digest = blake2b(jti.encode("utf-8"), digest_size=64).digest()
+        probes = struct.unpack("<16I", digest)
+        if self.num_hashes <= 16:
+            return [probe % num_bits for probe in probes[: self.num_hashes]]
+        h1, h2 = probes[0], probes[1] | 1
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def _set_bits(self, positions: list[int]) -> None:
+        bits = self._bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def check_and_add(self, jti: str, expires_at: float) -> bool:
+        positions = self._positions(jti)
+        bits = self._bits
+        with self._lock:
+            maybe_seen = True
+            for p in positions:
+                if not bits[p >> 3] & (1 << (p & 7)):
+                    maybe_seen = False
+                    bits[p >> 3] |= 1 << (p & 7)
+            # Held across the backing call: two threads racing on one new
+            # jti must not both see "definitely new".
+            if maybe_seen or not self._warmed:
+                return self.backing.check_and_add(jti, expires_at)
+            self.backing.add(jti, expires_at)
+            return True
+
+
+class SQLiteReplayStore(ReplayStore):
+    # New jtis are buffered and written in one transaction per batch_size
+    # records (or on flush()/close()); a crash loses at most one batch.
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        batch_size: int = 512,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = batch_size
+        self._pending: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS replay_jti ("
+                "jti TEXT PRIMARY KEY, expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+
+    def _seen_locked(self, jti: str, now: float) -> bool:
+        pending = self._pending.get(jti)
+        if pending is not None:
+            return pending > now
+        row = self._conn.execute(
+            "SELECT expires_at FROM replay_jti WHERE jti = ?", (jti,)
+        ).fetchone()
+        return row is not None and row[0] > now
+
+    def _record_locked(self, jti: str, expires_at: float) -> None:
+        self._pending[jti] = expires_at
+        if len(self._pending) >= self.batch_size:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO replay_jti (jti, expires_at) VALUES (?, ?)",
+                self._pending.items(),
+            )
+        self._pending.clear()
+
+    def check_and_add(self, jti: str, expires_at: float) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._seen_locked(jti, now):
+                return False
+            self._record_locked(jti, expires_at)
+            return True
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._record_locked(jti, expires_at)
+
+    def live_jtis(self) -> Iterator[str]:
+        with self._lock:
+            self._flush_locked()
+            cursor = self._conn.execute(
+                "SELECT jti FROM replay_jti WHERE expires_at > ?", (time.time(),)
+            )
+            while rows := cursor.fetchmany(4096):
+                for (jti,) in rows:
+                    yield jti
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM replay_jti WHERE expires_at <= ?", (time.time(),)
+                )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from typing import Any
+
+from jwt import InvalidTokenError
+
+from . import _jws
+from ._generate import Signer, as_signer
+from ._parallel import map_chunks
+from ._verify import Verifier, as_verifier
+from .chain import _is_hex64, iter_verify_chain, normalize_hex
+
+
+def _error(code: str, message: str, index: int | None = None) -> dict[str, Any]:
+    out: dict[str, Any] = {"code": code, "message": message}
+    if index is not None:
+        out["index"] = index
+    return out
+
+
+def sign_chain_checkpoint(
+    chain_id: str,
+    index: int,
+    entry_hash: str,
+    private_key_pem: str | Signer,
+    kid: str | None = None,
+) -> str:
+    if not _is_hex64(chain_id) or not _is_hex64(entry_hash):
+        raise ValueError("chain_id and entry_hash must be 64-char hex strings.")
+    if not isinstance(index, int) or index < 0:
+        raise ValueError("index must be a non-negative integer.")
+    payload = {
+        "chain_checkpoint": {
+            "chain_id": normalize_hex(chain_id),
+            "index": index,
+            "entry_hash": normalize_hex(entry_hash),
+        },
+        "iat": int(time.time()),
+    }
+    return as_signer(private_key_pem).encode(payload, kid=kid)
+
+
+def iter_chain_checkpoints(
+    tokens: Iterable[str],
+    private_key_pem: str | Signer,
+    every: int,
+    kid: str | None = None,
+) -> Iterator[str]:
+    # Issuer side: signs a checkpoint after every `every` entries. Entry
+    # hashes are read without signature checks, so pass the issuer's own
+    # chain (or one that verify_chain() has accepted).
+    if every < 1:
+        raise ValueError("every must be >= 1.")
+    signer = as_signer(private_key_pem)
+    chain_id: str | None = None
+    for index, token in enumerate(tokens):
+        entry_hash = _jws.untrusted_entry_hash(token)
+        if entry_hash is None:
+            raise ValueError(f"Token {index} has no chain.entry_hash.")
+        if chain_id is None:
+            chain_id = entry_hash
+        if (index + 1) % every == 0:
+            yield sign_chain_checkpoint(chain_id, index, entry_hash, signer, kid=kid)
+
+
+def decode_chain_checkpoint(token: str, public_key_pem: str | Verifier) -> dict[str, Any]:
+    try:
+        claims = as_verifier(public_key_pem).decode(token)
+    except InvalidTokenError as exc:
+        raise ValueError(f"Chain checkpoint signature verification failed: {exc}") from exc
+    checkpoint = claims.get("chain_checkpoint")
+    if (
+        not isinstance(checkpoint, dict)
+        or not _is_hex64(checkpoint.get("chain_id"))
+        or not _is_hex64(checkpoint.get("entry_hash"))
+        or not isinstance(checkpoint.get("index"), int)
+        or checkpoint["index"] < 0
+    ):
+        raise ValueError("Chain checkpoint payload is malformed.")
+    return {
+        "chain_id": normalize_hex(checkpoint["chain_id"]),
+        "index": checkpoint["index"],
+        "entry_hash": normalize_hex(checkpoint["entry_hash"]),
+    }
+
+
+def _decode_all(verifier: Verifier, checkpoints: Iterable[str]) -> list[dict[str, Any]]:
+    by_index: dict[int, dict[str, Any]] = {}
+    for token in checkpoints:
+        checkpoint = decode_chain_checkpoint(token, verifier)
+        seen = by_index.setdefault(checkpoint["index"], checkpoint)
+        if seen != checkpoint:
+            raise ValueError(f"Conflicting chain checkpoints at index {checkpoint['index']}.")
+    return [by_index[index] for index in sorted(by_index)]
+
+
+def nearest_chain_checkpoint(
+    checkpoints: Iterable[str],
+    index: int,
+    public_key_pem: str | Verifier,
+) -> dict[str, Any] | None:
+    # The verified checkpoint with the greatest index before `index`: resume
+    # iter_verify_chain() there with start_index=checkpoint["index"] + 1 and
+    # previous_entry_hash=checkpoint["entry_hash"].
+    best: dict[str, Any] | None = None
+    for checkpoint in _decode_all(as_verifier(public_key_pem), checkpoints):
+        if checkpoint["index"] < index:
+            best = checkpoint
+    return best
+
+
+def _verify_segments(
+    verifier: Verifier,
+    segments: list[tuple[int, str | None, str | None, list[str]]],
+) -> list[dict[str, Any] | None]:
+    failures: list[dict[str, Any] | None] = []
+    for start_index, previous_entry_hash, expected_head, tokens in segments:
+        for record in iter_verify_chain(
+            tokens,
+            verifier,
+            start_index=start_index,
+            previous_entry_hash=previous_entry_hash,
+        ):
+            pass
+        if not record["ok"]:
+            failures.append(record["errors"][0])
+        elif expected_head is not None and record["head"] != expected_head:
+            failures.append(
+                _error(
+                    "CHECKPOINT_MISMATCH",
+                    "chain.entry_hash does not match the signed chain checkpoint.",
+                    start_index + len(tokens) - 1,
+                )
+            )
+        else:
+            failures.append(None)
+    return failures
+
+
+def verify_chain_segmented(
+    tokens: Sequence[str],
+    public_key_pem: str | Verifier,
+    checkpoints: Iterable[str],
+    *,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    # Signed checkpoints split the chain into segments that are verified
+    # independently (one per task on the pool): each segment starts from
+    # its opening checkpoint's entry_hash and must end on the next one's.
+    # The lowest failing index is reported, as verify_chain() would.
+    verifier = as_verifier(public_key_pem)
+    if not tokens:
+        return {"ok": True, "errors": []}
+    try:
+        anchors = _decode_all(verifier, checkpoints)
+    except ValueError as exc:
+        return {"ok": False, "errors": [_error("INVALID_CHECKPOINT", str(exc))]}
+
+    chain_id = _jws.untrusted_entry_hash(tokens[0])
+    for anchor in anchors:
+        if anchor["chain_id"] != chain_id:
+            return {
+                "ok": False,
+                "errors": [
+                    _error("CHECKPOINT_MISMATCH", "Chain checkpoint is for a different chain_id.")
+                ],
+            }
+        if anchor["index"] >= len(tokens):
+            return {
+                "ok": False,
+                "errors": [_error("CHECKPOINT_MISMATCH", "Proof chain is shorter than a checkpoint.")],
+            }
+
+    segments: list[tuple[int, str | None, str | None, list[str]]] = []
+    start = 0
+    previous_entry_hash: str | None = None
+    for anchor in anchors:
+        stop = anchor["index"] + 1
+        segments.append((start, previous_entry_hash, anchor["entry_hash"], list(tokens[start:stop])))
+        start, previous_entry_hash = stop, anchor["entry_hash"]
+    if start < len(tokens):
+        segments.append((start, previous_entry_hash, None, list(tokens[start:])))
+
+    failures = [
+        failure
+        for failure in map_chunks(
+            _verify_segments,
+            segments,
+            verifier,
+            workers=workers,
+            executor=executor,
+            chunk_size=1,
+        )
+        if failure is not None
+    ]
+    if failures:
+        return {"ok": False, "errors": [min(failures, key=lambda failure: failure["index"])]}
+    return {"ok": True, "errors": []}
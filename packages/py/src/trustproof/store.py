@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from hashlib import sha256
+from itertools import islice
+from typing import Any
+
+from jwt.exceptions import DecodeError
+
+from . import _jws
+from ._time import to_epoch
+from ._verify import Verifier, as_verifier
+
+DEFAULT_BATCH_SIZE = 10_000
+# Stays under SQLite's bound-parameter limit on older builds (999).
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS proofs ("
+    "id INTEGER PRIMARY KEY, "
+    "digest BLOB NOT NULL UNIQUE, "
+    "token TEXT NOT NULL, "
+    "jti TEXT, "
+    "subject_type TEXT, "
+    "subject_id TEXT, "
+    "action TEXT, "
+    "resource_type TEXT, "
+    "resource_id TEXT, "
+    "decision TEXT, "
+    "timestamp TEXT, "
+    "ts REAL, "
+    "entry_hash TEXT, "
+    # NULL = not checked yet, 1 = verified, 0 = failed verification.
+    "verified INTEGER, "
+    "key_fingerprint TEXT)",
+    "CREATE INDEX IF NOT EXISTS proofs_jti ON proofs (jti)",
+    "CREATE INDEX IF NOT EXISTS proofs_entry_hash ON proofs (entry_hash)",
+    "CREATE INDEX IF NOT EXISTS proofs_subject ON proofs (subject_type, subject_id, ts)",
+    "CREATE INDEX IF NOT EXISTS proofs_action ON proofs (action, ts)",
+    "CREATE INDEX IF NOT EXISTS proofs_resource ON proofs (resource_type, resource_id, ts)",
+    "CREATE INDEX IF NOT EXISTS proofs_decision ON proofs (decision, ts)",
+    "CREATE INDEX IF NOT EXISTS proofs_ts ON proofs (ts)",
+    "CREATE INDEX IF NOT EXISTS proofs_unverified ON proofs (id) WHERE verified IS NULL",
+)
+
+_COLUMNS = (
+    "id",
+    "token",
+    "jti",
+    "subject_type",
+    "subject_id",
+    "action",
+    "resource_type",
+    "resource_id",
+    "decision",
+    "timestamp",
+    "entry_hash",
+    "verified",
+    "key_fingerprint",
+)
+
+_FILTERS = (
+    "jti",
+    "subject_type",
+    "subject_id",
+    "action",
+    "resource_type",
+    "resource_id",
+    "decision",
+    "entry_hash",
+)
+
+
+def _str_or_none(value: Any) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _index_row(token: str, claims: dict[str, Any]) -> tuple[Any, ...]:
+    def _obj(name: str) -> dict[str, Any]:
+        value = claims.get(name)
+        return value if isinstance(value, dict) else {}
+
+    subject, resource = _obj("subject"), _obj("resource")
+    result, chain = _obj("result"), _obj("chain")
+    entry_hash = _str_or_none(chain.get("entry_hash"))
+    return (
+        sha256(token.encode("utf-8")).digest(),
+        token,
+        _str_or_none(claims.get("jti")),
+        _str_or_none(subject.get("type")),
+        _str_or_none(subject.get("id")),
+        _str_or_none(claims.get("action")),
+        _str_or_none(resource.get("type")),
+        _str_or_none(resource.get("id")),
+        _str_or_none(result.get("decision")),
+        _str_or_none(claims.get("timestamp")),
+        to_epoch(claims.get("timestamp")),
+        entry_hash.lower() if entry_hash else None,
+    )
+
+
+def _key_fingerprint(checker: Verifier, token: str) -> str | None:
+    # The key that verifies this token's kid, not the whole KeyRing.
+    try:
+        return checker.key_fingerprint(_jws.load_compact(token)[0].get("kid"))
+    except (DecodeError, KeyError, TypeError):
+        return None
+
+
+def _to_record(row: tuple[Any, ...]) -> dict[str, Any]:
+    record = dict(zip(_COLUMNS, row))
+    if record["verified"] is not None:
+        record["verified"] = bool(record["verified"])
+    return record
+
+
+class ProofStore:
+    # Local SQLite index over proof tokens. Claim fields are extracted
+    # without trusting the signature; the verified column records whether a
+    # row has been checked (and with which key) so queries can filter on it.
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def ingest(
+        self,
+        tokens: Iterable[str],
+        *,
+        verifier: str | Verifier | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        # Upserts one transaction per batch. Tokens already stored keep their
+        # row; with a verifier, rows not yet verified are checked and their
+        # verified flag only ever rises (NULL < 0 < 1), while rows already
+        # verified are not checked again. Returns the number of newly
+        # stored tokens.
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        checker = as_verifier(verifier) if verifier is not None else None
+
+        inserted = 0
+        iterator = iter(tokens)
+        position = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return inserted
+            digests = [sha256(token.encode("utf-8")).digest() for token in batch]
+            stored = self._stored_verified(digests)
+            rows = []
+            for token, digest in zip(batch, digests):
+                try:
+                    claims = _jws.decode_untrusted(token)
+                except DecodeError as exc:
+                    raise ValueError(f"Token {position} is not a decodable proof: {exc}") from exc
+                position += 1
+                if digest in stored and (checker is None or stored[digest] == 1):
+                    continue
+                if digest not in stored:
+                    inserted += 1
+                    # A token repeated within the batch counts once.
+                    stored[digest] = None
+                verified = fingerprint = None
+                if checker is not None:
+                    verified = 1 if checker.verify(token, check_replay=False)["ok"] else 0
+                    fingerprint = _key_fingerprint(checker, token)
+                rows.append((*_index_row(token, claims), verified, fingerprint))
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO proofs (digest, token, jti, subject_type, "
+                    "subject_id, action, resource_type, resource_id, decision, timestamp, "
+                    "ts, entry_hash, verified, key_fingerprint) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(digest) DO UPDATE SET "
+                    "verified = COALESCE(MAX(verified, excluded.verified), verified, "
+                    "excluded.verified), "
+                    "key_fingerprint = CASE WHEN excluded.verified > COALESCE(verified, -1) "
+                    "THEN excluded.key_fingerprint ELSE key_fingerprint END",
+                    rows,
+                )
+
+    def _stored_verified(self, digests: list[bytes]) -> dict[bytes, int | None]:
+        stored: dict[bytes, int | None] = {}
+        with self._lock:
+            for start in range(0, len(digests), _LOOKUP_CHUNK):
+                chunk = digests[start : start + _LOOKUP_CHUNK]
+                stored.update(
+                    self._conn.execute(
+                        "SELECT digest, verified FROM proofs WHERE digest IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                )
+        return stored
+
+    def verify_pending(
+        self,
+        verifier: str | Verifier,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> dict[str, int]:
+        # Signature-checks rows that have never been verified.
+        checker = as_verifier(verifier)
+        counts = {"verified": 0, "failed": 0}
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, token FROM proofs WHERE verified IS NULL AND id > ? "
+                    "ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return counts
+            updates = []
+            for row_id, token in rows:
+                ok = checker.verify(token, check_replay=False)["ok"]
+                counts["verified" if ok else "failed"] += 1
+                updates.append((1 if ok else 0, _key_fingerprint(checker, token), row_id))
+            last_id = rows[-1][0]
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE proofs SET verified = ?, key_fingerprint = ? WHERE id = ?",
+                    updates,
+                )
+
+    def _where(self, filters: dict[str, Any]) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        since = filters.pop("since", None)
+        until = filters.pop("until", None)
+        verified = filters.pop("verified", None)
+        for name, value in filters.items():
+            if name not in _FILTERS:
+                raise ValueError(f"Unknown proof store filter: {name}")
+            if value is None:
+                continue
+            if name == "entry_hash":
+                value = value.lower()
+            clauses.append(f"{name} = ?")
+            params.append(value)
+        for bound, op in ((since, ">="), (until, "<")):
+            if bound is None:
+                continue
+            epoch = to_epoch(bound)
+            if epoch is None:
+                raise ValueError(f"Invalid time bound: {bound!r}")
+            clauses.append(f"ts {op} ?")
+            params.append(epoch)
+        if verified is not None:
+            clauses.append("verified = ?")
+            params.append(1 if verified else 0)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, *, limit: int | None = None, **filters: Any) -> list[dict[str, Any]]:
+        # Filters: jti, subject_type, subject_id, action, resource_type,
+        # resource_id, decision, entry_hash, verified, and the half-open
+        # time range since <= timestamp < until (ISO string, datetime or
+        # epoch seconds). Results are ordered by timestamp.
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM proofs{where} ORDER BY ts, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_to_record(row) for row in rows]
+
+    def count(self, **filters: Any) -> int:
+        where, params = self._where(filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM proofs{where}", params).fetchone()[0]
+
+    def iter_tokens(
+        self, *, batch_size: int = DEFAULT_BATCH_SIZE, **filters: Any
+    ) -> Iterator[str]:
+        # Same filters and order as query(), streamed from the cursor
+        # batch_size rows at a time.
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        where, params = self._where(filters)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT token FROM proofs{where} ORDER BY ts, id", params
+            )
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for (token,) in rows:
+                    yield token
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from ._fs import write_json_atomic
+from ._generate import Signer, as_signer
+from .chain import GENESIS_PREV_HASH, link_claims, resolve_prev_hash
+
+
+class MemoryHeadStore:
+    def __init__(self) -> None:
+        self._heads: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, chain_id: str) -> str | None:
+        with self._lock:
+            return self._heads.get(chain_id)
+
+    def set(self, chain_id: str, entry_hash: str) -> None:
+        with self._lock:
+            self._heads[chain_id] = entry_hash
+
+
+class FileHeadStore(MemoryHeadStore):
+    # Whole-map JSON file, rewritten atomically (with an fsync) per flush;
+    # suited to a modest number of chains. Use SQLiteHeadStore for many.
+    # batch_size=1 makes every set() durable before it returns, but
+    # concurrent callers share one write (group commit): whoever holds the
+    # flush lock writes a snapshot that covers every update made so far.
+    # batch_size=N writes once per N updates (and on flush()/close()); a
+    # crash can then lose up to N-1 heads, and a writer restarted from a
+    # stale head forks that chain, so flush() at your own checkpoints.
+    def __init__(self, path: str | os.PathLike[str], *, batch_size: int = 1) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        super().__init__()
+        self._path = Path(path)
+        self.batch_size = batch_size
+        self._dirty = 0
+        self._flush_lock = threading.Lock()
+        if self._path.exists():
+            heads = json.loads(self._path.read_text(encoding="utf-8"))
+            if not isinstance(heads, dict):
+                raise ValueError(f"Head store file must contain a JSON object: {self._path}")
+            self._heads.update(heads)
+
+    def set(self, chain_id: str, entry_hash: str) -> None:
+        with self._lock:
+            self._heads[chain_id] = entry_hash
+            self._dirty += 1
+            due = self._dirty >= self.batch_size
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self._heads)
+                self._dirty = 0
+            write_json_atomic(self._path, snapshot)
+
+    def close(self) -> None:
+        self.flush()
+
+
+class SQLiteHeadStore:
+    # One row per chain. Updates are committed in batches with the same
+    # group-commit and batch_size trade-off as FileHeadStore; the default
+    # commits (and syncs) before set() returns.
+    def __init__(self, path: str | os.PathLike[str], *, batch_size: int = 1) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        self.batch_size = batch_size
+        self._pending: dict[str, str] = {}
+        self._inflight: dict[str, str] = {}
+        self._lock = threading.Lock()
+        # Guards the connection; held across a commit, never across set().
+        self._flush_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chain_heads ("
+                "chain_id TEXT PRIMARY KEY, entry_hash TEXT NOT NULL)"
+            )
+
+    def get(self, chain_id: str) -> str | None:
+        with self._lock:
+            head = self._pending.get(chain_id) or self._inflight.get(chain_id)
+        if head is not None:
+            return head
+        with self._flush_lock:
+            with self._lock:
+                # A commit may have finished while waiting for the lock.
+                head = self._pending.get(chain_id)
+            if head is not None:
+                return head
+            row = self._conn.execute(
+                "SELECT entry_hash FROM chain_heads WHERE chain_id = ?", (chain_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, chain_id: str, entry_hash: str) -> None:
+        with self._lock:
+            self._pending[chain_id] = entry_hash
+            due = len(self._pending) >= self.batch_size
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._inflight, self._pending = self._pending, {}
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO chain_heads (chain_id, entry_hash) VALUES (?, ?) "
+                        "ON CONFLICT(chain_id) DO UPDATE SET entry_hash = excluded.entry_hash",
+                        self._inflight.items(),
+                    )
+            except BaseException:
+                with self._lock:
+                    self._pending = {**self._inflight, **self._pending}
+                raise
+            finally:
+                with self._lock:
+                    self._inflight = {}
+
+    def close(self) -> None:
+        self.flush()
+        with self._flush_lock:
+            self._conn.close()
+
+
+class ChainWriter:
+    # Appends to many independent chains from concurrent threads. The head
+    # entry_hash of each chain is cached in memory (and handed to the head
+    # store before a token is returned; see its batch_size for when that is
+    # durable); appends to one chain are serialized by a per-chain lock, so
+    # unrelated chains only meet in the head store's group commit.
+    def __init__(
+        self,
+        private_key_pem: str | Signer,
+        kid: str | None = None,
+        head_store: MemoryHeadStore | SQLiteHeadStore | None = None,
+    ) -> None:
+        self._signer = as_signer(private_key_pem)
+        self._kid = kid
+        self._store = head_store if head_store is not None else MemoryHeadStore()
+        self._heads: dict[str, str] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _chain_lock(self, chain_id: str) -> threading.Lock:
+        lock = self._locks.get(chain_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(chain_id, threading.Lock())
+        return lock
+
+    def _head_locked(self, chain_id: str) -> str | None:
+        head = self._heads.get(chain_id)
+        if head is None:
+            head = self._store.get(chain_id)
+            if head is not None:
+                self._heads[chain_id] = head
+        return head
+
+    def head(self, chain_id: str) -> str | None:
+        with self._chain_lock(chain_id):
+            return self._head_locked(chain_id)
+
+    def seed(self, chain_id: str, prev: str | dict[str, Any]) -> str:
+        # Adopt an existing chain from its last token or claims.
+        entry_hash = resolve_prev_hash(prev)
+        with self._chain_lock(chain_id):
+            self._store.set(chain_id, entry_hash)
+            self._heads[chain_id] = entry_hash
+        return entry_hash
+
+    def append(self, chain_id: str, next_claims: dict[str, Any]) -> str:
+        if not isinstance(chain_id, str) or not chain_id:
+            raise ValueError("chain_id must be a non-empty string.")
+
+        with self._chain_lock(chain_id):
+            prev_hash = self._head_locked(chain_id) or GENESIS_PREV_HASH
+            claims_to_sign = link_claims(prev_hash, next_claims)
+            token = self._signer.sign(claims_to_sign, kid=self._kid, copy_claims=False)
+            entry_hash = claims_to_sign["chain"]["entry_hash"]
+            self._store.set(chain_id, entry_hash)
+            self._heads[chain_id] = entry_hash
+        return token
+
+    def flush(self) -> None:
+        # Makes every head handed to a batching head store durable.
+        flush = getattr(self._store, "flush", None)
+        if flush is not None:
+            flush()
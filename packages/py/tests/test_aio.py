@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import aio, append, verify_chain  # noqa: E402
+from trustproof.archive import write_archive  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_async_generate_append_and_verify_round_trip() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+
+    async def scenario() -> None:
+        token = await aio.generate(claims, private_pem, kid="k1")
+        result = await aio.verify(token, public_pem)
+        assert result["ok"] is True
+
+        first = await aio.append(None, {**claims, "jti": "jti_0"}, private_pem)
+        second = await aio.append(first, {**claims, "jti": "jti_1"}, private_pem)
+        assert (await aio.verify_chain([first, second], public_pem))["ok"] is True
+        assert verify_chain([first, second], public_pem)["ok"] is True
+
+    asyncio.run(scenario())
+
+
+def test_async_verify_chain_streams_paths_archives_and_iterables(tmp_path: Path) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens: list[str] = []
+    prev = None
+    for i in range(4):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+    log_path = tmp_path / "chain.jsonl"
+    log_path.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+    archive_path = tmp_path / "chain.tpa"
+    write_archive(archive_path, tokens)
+
+    async def scenario() -> None:
+        for source in (str(log_path), log_path, archive_path, iter(tokens)):
+            result = await aio.verify_chain(source, public_pem)
+            assert result["ok"] is True, source
+
+    asyncio.run(scenario())
+
+
+def test_async_batches_keep_order() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    batch = [{**claims, "jti": f"jti_{i}"} for i in range(10)]
+
+    async def scenario() -> None:
+        tokens = await aio.generate_many(batch, private_pem, chunk_size=3)
+        results = await aio.verify_many(tokens, public_pem, chunk_size=4)
+        assert [result["claims"]["jti"] for result in results] == [c["jti"] for c in batch]
+        assert all(result["ok"] for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_async_runner_bounds_concurrency() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(value: int) -> int:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        runner = aio.AsyncRunner(pool, max_concurrency=2)
+
+        async def scenario() -> list[int]:
+            return await asyncio.gather(*(runner.run(work, i) for i in range(8)))
+
+        assert asyncio.run(scenario()) == [i * 2 for i in range(8)]
+        # A second event loop gets its own semaphore.
+        assert asyncio.run(scenario()) == [i * 2 for i in range(8)]
+    assert peak == 2
+
+    with pytest.raises(ValueError):
+        aio.AsyncRunner(max_concurrency=0)
+
+
+def test_async_batches_read_input_lazily_with_bounded_chunks() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    read = 0
+    started = 0
+    peak_ahead = 0
+
+    def claims_stream():
+        nonlocal read
+        for i in range(40):
+            read += 1
+            yield {**claims, "jti": f"jti_{i}"}
+
+    def sign(signer, kid, chunk):
+        nonlocal started, peak_ahead
+        started += 1
+        # Chunks read from the input but not yet signed stay bounded.
+        peak_ahead = max(peak_ahead, read // 2 - started)
+        return aio._generate_batch(signer, kid, chunk)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        runner = aio.AsyncRunner(pool, max_concurrency=1)
+
+        async def scenario() -> list[str]:
+            return await aio._gather_chunks(
+                runner, sign, claims_stream(), aio.as_signer(private_pem), None, chunk_size=2
+            )
+
+        tokens = asyncio.run(scenario())
+    assert started == 20
+    assert peak_ahead <= 2
+    results = asyncio.run(aio.verify_many(iter(tokens), public_pem, chunk_size=3))
+    assert [result["claims"]["jti"] for result in results] == [f"jti_{i}" for i in range(40)]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Signer, append, append_many, verify_chain  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _claims_batch(count: int, offset: int = 0) -> list[dict]:
+    claims = _load_allow_claims()
+    return [{**claims, "jti": f"jti_{offset + i}", "iat": 1_772_000_000} for i in range(count)]
+
+
+def test_append_many_matches_sequential_append() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+
+    expected: list[str] = []
+    prev = None
+    for claims in _claims_batch(9):
+        prev = append(prev, claims, signer, kid="k1")
+        expected.append(prev)
+
+    sequential = list(append_many(None, _claims_batch(9), signer, kid="k1", chunk_size=4))
+    processes = list(
+        append_many(None, iter(_claims_batch(9)), signer, kid="k1", workers=2, chunk_size=2)
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        threaded = list(
+            append_many(None, _claims_batch(9), private_pem, kid="k1", executor=pool, chunk_size=3)
+        )
+
+    assert sequential == expected
+    assert processes == expected
+    assert threaded == expected
+    assert verify_chain(expected, public_pem)["ok"] is True
+
+
+def test_append_many_continues_an_existing_chain() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    head = append(None, _claims_batch(1)[0], private_pem)
+
+    tail = list(append_many(head, _claims_batch(5, offset=1), private_pem))
+    assert verify_chain([head, *tail], public_pem)["ok"] is True
+
+
+def test_append_many_rejects_bad_prev_eagerly() -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    with pytest.raises(ValueError):
+        append_many(42, _claims_batch(1), private_pem)  # type: ignore[arg-type]
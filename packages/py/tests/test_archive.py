@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append, iter_verify_chain, verify_chain  # noqa: E402
+from trustproof.__main__ import main  # noqa: E402
+from trustproof.archive import ProofArchive, is_archive, write_archive  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _chain_tokens(private_pem: str, count: int) -> list[str]:
+    claims = _load_allow_claims()
+    tokens = []
+    prev = None
+    for i in range(count):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+    return tokens
+
+
+def _entry_hash(token: str) -> str:
+    import jwt
+
+    return jwt.decode(token, options={"verify_signature": False})["chain"]["entry_hash"]
+
+
+def test_archive_round_trip_and_random_access(tmp_path: Path) -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 7)
+    path = tmp_path / "chain.tpa"
+
+    summary = write_archive(path, iter(tokens))
+    assert summary == {"count": 7, "head": _entry_hash(tokens[-1])}
+    assert is_archive(path)
+
+    with ProofArchive(path) as archive:
+        assert len(archive) == 7
+        assert archive.head == summary["head"]
+        assert archive[3] == tokens[3]
+        assert archive[-1] == tokens[-1]
+        assert list(archive) == tokens
+        view = archive.raw(2)
+        assert bytes(view) == tokens[2].encode("ascii")
+        view.release()
+
+        part = archive[2:5]
+        assert len(part) == 3
+        assert list(part) == tokens[2:5]
+        assert part[-1] == tokens[4]
+        assert list(part[1:]) == tokens[3:5]
+        assert [len(s) for s in archive.slices(3)] == [3, 3, 1]
+
+        restored = pickle.loads(pickle.dumps(part))
+        assert list(restored) == tokens[2:5]
+        with pytest.raises(IndexError):
+            archive[7]
+
+    empty = write_archive(tmp_path / "empty.tpa", [])
+    assert empty == {"count": 0, "head": None}
+    with ProofArchive(tmp_path / "empty.tpa") as archive:
+        assert list(archive) == []
+
+
+def test_archive_rejects_foreign_and_truncated_files(tmp_path: Path) -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    jsonl = tmp_path / "chain.jsonl"
+    jsonl.write_text("\n".join(_chain_tokens(private_pem, 2)) + "\n", encoding="utf-8")
+    assert not is_archive(jsonl)
+    with pytest.raises(ValueError):
+        ProofArchive(jsonl)
+
+    path = tmp_path / "chain.tpa"
+    write_archive(path, _chain_tokens(private_pem, 2))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        ProofArchive(path)
+    with pytest.raises(ValueError):
+        write_archive(tmp_path / "bad.tpa", ["caf\u00e9"])
+
+
+def test_archive_reports_corrupt_offsets_as_value_errors(tmp_path: Path) -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    path = tmp_path / "chain.tpa"
+    write_archive(path, _chain_tokens(private_pem, 2))
+    data = bytearray(path.read_bytes())
+    data[-8:] = (len(data) * 4).to_bytes(8, "little")
+    path.write_bytes(bytes(data))
+
+    with ProofArchive(path) as archive:
+        assert archive[0]
+        with pytest.raises(ValueError, match="bad offset"):
+            archive[1]
+
+
+def test_chain_verification_validates_arguments_before_opening(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    path = tmp_path / "chain.tpa"
+    write_archive(path, _chain_tokens(private_pem, 2))
+    opened: list[object] = []
+
+    class _Spy(ProofArchive):
+        def __init__(self, *args: object) -> None:
+            opened.append(args)
+            super().__init__(*args)
+
+    monkeypatch.setattr("trustproof.archive.ProofArchive", _Spy)
+    with pytest.raises(ValueError, match="previous_entry_hash"):
+        next(iter_verify_chain(path, public_pem, previous_entry_hash="not-hex"))
+    assert opened == []
+
+
+def test_chain_verification_reads_archive(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 9)
+    path = tmp_path / "chain.tpa"
+    write_archive(path, tokens)
+
+    with ProofArchive(path) as archive:
+        for workers in (None, 2):
+            result = verify_chain(archive, public_pem, workers=workers, chunk_size=4)
+            assert result == {"ok": True, "errors": []}
+        assert verify_chain(archive[3:], public_pem)["ok"] is False
+
+    records = list(iter_verify_chain(path, public_pem, workers=2, chunk_size=2))
+    assert records[-1]["ok"] is True
+    assert records[-1]["count"] == 9
+    assert records[-1]["head"] == _entry_hash(tokens[-1])
+
+    tampered = list(tokens)
+    tampered[5] = tampered[5][:-4] + "AAAA"
+    write_archive(path, tampered)
+    result = verify_chain(ProofArchive(path), public_pem, workers=2, chunk_size=4)
+    assert result["ok"] is False
+    assert result["errors"][0]["index"] == 5
+
+
+def test_cli_archive_and_verify_chain(tmp_path: Path, capsys) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 4)
+    jsonl = tmp_path / "chain.jsonl"
+    jsonl.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    archive_path = tmp_path / "chain.tpa"
+
+    assert main(["archive", str(jsonl), str(archive_path)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["count"] == 4
+
+    argv = ["verify-chain", str(archive_path), "--pubkey", str(pubkey_path), "--json"]
+    assert main(argv + ["--jobs", "2"]) == 0
+    record = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert record["ok"] is True
+    assert record["count"] == 4
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import (  # noqa: E402
+    KeyRing,
+    Verifier,
+    VerifyCache,
+    VerifyLimits,
+    generate,
+    hash_payload,
+    verify,
+)
+from trustproof.metrics import InMemoryMetrics  # noqa: E402
+from trustproof.replay import MemoryReplayStore  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _claims_for(payload_in: dict, payload_out: dict, jti: str) -> dict:
+    claims = _load_allow_claims()
+    return {
+        **claims,
+        "hashes": {"input_hash": hash_payload(payload_in), "output_hash": hash_payload(payload_out)},
+        "jti": jti,
+    }
+
+
+def test_cache_hits_repeated_tokens_and_keys_on_expected_hashes() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    payload_in, payload_out = {"amount": 1}, {"status": "ok"}
+    token = generate(_claims_for(payload_in, payload_out, "jti_1"), private_pem)
+    cache = VerifyCache(max_entries=8)
+    verifier = Verifier(public_pem, cache=cache)
+
+    first = verifier.verify(token, payload_in, payload_out)
+    second = verifier.verify(token, payload_in, payload_out)
+    assert first == second
+    assert first["ok"] is True
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Different expected payloads are a different key, and failures are not cached.
+    mismatch = verifier.verify(token, {"amount": 2}, payload_out)
+    assert mismatch["errors"][0]["code"] == "INPUT_HASH_MISMATCH"
+    assert verifier.verify(token, {"amount": 2}, payload_out)["ok"] is False
+    assert cache.hits == 1
+    assert len(cache) == 1
+
+    # Results handed out are copies.
+    second["claims"]["jti"] = "tampered"
+    second["errors"].append({"code": "X"})
+    assert verify(token, public_pem, payload_in, payload_out, cache=cache) == first
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+    assert 0 < stats["hit_rate"] < 1
+
+
+def test_cache_respects_ttl_exp_and_bound(monkeypatch) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    claims = _load_allow_claims()
+    cache = VerifyCache(max_entries=2, ttl_seconds=30)
+    verifier = Verifier(public_pem, cache=cache)
+    now = time.time()
+    short = generate({**claims, "jti": "short", "exp": int(now) + 5}, private_pem)
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(3)]
+
+    for token in tokens:
+        verifier.verify(token)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    verifier.verify(short)
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    # Past exp the cached entry is gone; the token is checked again.
+    misses = cache.misses
+    verifier.verify(short)
+    assert cache.misses == misses + 1
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    hits = cache.hits
+    assert verifier.verify(tokens[-1])["ok"] is True
+    assert cache.hits == hits
+
+
+def test_cache_hits_still_check_replay() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate({**_load_allow_claims(), "jti": "jti_once"}, private_pem)
+    cache = VerifyCache()
+    verifier = Verifier(public_pem, MemoryReplayStore(), cache=cache)
+
+    assert verifier.verify(token, check_replay=False)["ok"] is True
+    replayed = [verifier.verify(token) for _ in range(2)]
+    assert cache.hits == 2
+    assert replayed[0]["ok"] is True
+    assert replayed[1]["errors"][0]["code"] == "REPLAY_DETECTED"
+
+
+def test_revoking_a_key_invalidates_cached_results() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    token = generate(_load_allow_claims(), private_pem, kid="k1")
+    cache = VerifyCache()
+    ring = KeyRing({"k1": public_pem, "k2": other_public}, cache=cache)
+    metrics = InMemoryMetrics()
+
+    assert ring.verify(token, metrics=metrics)["ok"] is True
+    assert ring.verify(token, metrics=metrics)["ok"] is True
+    counters = metrics.snapshot()["counters"]
+    assert counters["verify.cache.hit"] == 1
+    assert counters["verify.cache.miss"] == 1
+
+    ring.remove("k1")
+    assert len(cache) == 0
+    assert ring.verify(token)["ok"] is False
+
+    # A single-key verifier shares the cache under its own fingerprint.
+    single = Verifier(public_pem, cache=cache)
+    single.verify(token)
+    assert cache.invalidate(single.fingerprint) == 1
+    with pytest.raises(ValueError):
+        VerifyCache(max_entries=0)
+
+
+def test_shared_cache_keeps_each_verifiers_limits() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(_load_allow_claims(), private_pem, kid="k1")
+    cache = VerifyCache()
+    lax = Verifier(public_pem, cache=cache)
+    strict = Verifier(public_pem, cache=cache, limits=VerifyLimits(max_token_bytes=64))
+    pinned = Verifier(public_pem, cache=cache, limits=VerifyLimits(kids=["k2"]))
+
+    assert lax.verify(token)["ok"] is True
+    assert lax.verify(token)["ok"] is True
+    # A result cached by a lax verifier never skips a stricter one's precheck.
+    assert strict.verify(token)["ok"] is False
+    assert pinned.verify(token)["ok"] is False
+    assert Verifier(public_pem, cache=cache, fast_path=True).verify(token)["ok"] is True
+    assert cache.hits == 1
+    assert len(cache) == 2
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof.canonical import (  # noqa: E402
+    canonical_json,
+    compute_canonical_event_material,
+    hash_payload,
+    sha256_hex,
+)
+
+EVENT_FIELDS = ("subject", "action", "resource", "policy", "result", "hashes", "timestamp", "jti")
+
+
+def _reference_canonical_json(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _vectors() -> list[dict]:
+    repo_root = Path(__file__).resolve().parents[3]
+    vectors_dir = repo_root / "spec" / "vectors"
+    return [json.loads(p.read_text(encoding="utf-8")) for p in sorted(vectors_dir.glob("*.json"))]
+
+
+def _claims_from_vector(vector: dict) -> dict:
+    return {
+        "subject": vector["input"]["subject"],
+        "action": vector["input"]["action"],
+        "resource": vector["input"]["resource"],
+        "policy": vector["input"]["policy"],
+        "result": vector["output"],
+        "hashes": {
+            "input_hash": vector["expected"]["input_hash_hex"],
+            "output_hash": vector["expected"]["output_hash_hex"],
+        },
+        "timestamp": vector["input"]["timestamp"],
+        "jti": vector["input"]["jti"],
+    }
+
+
+def test_event_material_matches_reference_for_all_vectors() -> None:
+    vectors = _vectors()
+    assert any(v.get("id") == "v005_canonicalization_edge" for v in vectors)
+
+    # Run twice so the second pass is served from the fragment cache.
+    for _ in range(2):
+        for vector in vectors:
+            claims = _claims_from_vector(vector)
+            material = compute_canonical_event_material(claims)
+            reference = _reference_canonical_json({f: claims[f] for f in EVENT_FIELDS})
+            assert material == reference
+            assert material == vector["expected"]["canonical_event_material"]
+            assert canonical_json(vector["input"]) == vector["canonical_input"]
+
+
+def test_fragment_cache_distinguishes_json_types() -> None:
+    base = _claims_from_vector(_vectors()[0])
+    for value in (1, True, 1.0, "1", [1], (1,), None, {"n": 1}):
+        claims = {**base, "policy": {"policy_v": "v0", "constraints": {"limit": value}}}
+        expected = _reference_canonical_json({f: claims[f] for f in EVENT_FIELDS})
+        assert compute_canonical_event_material(claims) == expected
+
+
+def _large_payload() -> dict:
+    return {
+        "doc": [
+            {"id": i, "text": "lorem ipsum é " * 20, "vals": [1.5, 2, True, None]}
+            for i in range(8000)
+        ],
+        "rows": [[i, "x" * 10, {"a": {"b": [i, -0.0]}}] for i in range(3000)],
+        "meta": {"z": 1, "a": [{}, [], ""], "nested": {"deep": {"deeper": list(range(5000))}}},
+    }
+
+
+def test_hash_payload_matches_one_shot_digest() -> None:
+    payloads = [
+        {},
+        [],
+        "",
+        None,
+        1.25,
+        [[]],
+        {"a": []},
+        ("tuple", 1),
+        {"é": "ü", "a": {"z": 1, "b": [1, 2.5, False]}},
+        _large_payload(),
+        {i: {"row": [i, str(i)] * 4} for i in range(1500)},
+    ]
+    payloads.extend(vector["input"] for vector in _vectors())
+    for payload in payloads:
+        assert hash_payload(payload) == sha256_hex(canonical_json(payload))
+
+
+def test_hash_payload_streams_large_values_under_non_str_keys() -> None:
+    # Oversized values are walked piecewise; the key prefix must not carry
+    # the encoder's placeholder value.
+    for payload in ({1: list(range(5000))}, {True: [{"k": i} for i in range(3000)]}):
+        assert hash_payload(payload) == sha256_hex(canonical_json(payload))
+
+
+def test_hash_payload_keeps_peak_memory_below_payload_size() -> None:
+    payload = _large_payload()
+    canonical_size = len(canonical_json(payload).encode("utf-8"))
+
+    tracemalloc.start()
+    try:
+        hash_payload(payload)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < canonical_size // 4
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Signer, Verifier, append, generate, verify_chain  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _build_chain(length: int) -> tuple[list[str], Signer, str]:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+    tokens: list[str] = []
+    prev = None
+    for i in range(length):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, signer)
+        tokens.append(prev)
+    return tokens, signer, public_pem
+
+
+def _run_all_modes(tokens: list[str], public_pem: str) -> list[dict]:
+    verifier = Verifier(public_pem)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        threaded = verify_chain(tokens, verifier, executor=pool, chunk_size=4)
+    return [
+        verify_chain(tokens, public_pem),
+        verify_chain(tokens, verifier, workers=2, chunk_size=3),
+        threaded,
+    ]
+
+
+def test_parallel_verify_chain_accepts_valid_chain() -> None:
+    tokens, _signer, public_pem = _build_chain(17)
+    for result in _run_all_modes(tokens, public_pem):
+        assert result == {"ok": True, "errors": []}
+
+
+def test_parallel_verify_chain_reports_first_failing_index() -> None:
+    tokens, signer, public_pem = _build_chain(17)
+    claims = _load_allow_claims()
+
+    tampered = list(tokens)
+    tampered[5] = tokens[6]
+    tampered[11] = "a.b.c"
+    results = _run_all_modes(tampered, public_pem)
+    assert all(result == results[0] for result in results)
+    assert results[0]["errors"][0]["code"] == "CHAIN_LINK_MISMATCH"
+    assert results[0]["errors"][0]["index"] == 5
+
+    forged = list(tokens)
+    forged[9] = generate({**claims, "jti": "jti_forged"}, signer)
+    results = _run_all_modes(forged, public_pem)
+    assert all(result == results[0] for result in results)
+    assert results[0]["errors"][0]["code"] == "CHAIN_ENTRY_HASH_MISMATCH"
+    assert results[0]["errors"][0]["index"] == 9
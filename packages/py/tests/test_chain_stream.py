@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append, iter_jsonl_tokens, iter_verify_chain  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _build_chain(private_pem: str, length: int) -> list[str]:
+    claims = _load_allow_claims()
+    tokens: list[str] = []
+    prev = None
+    for i in range(length):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+    return tokens
+
+
+def test_iter_verify_chain_streams_jsonl_file(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _build_chain(private_pem, 7)
+
+    lines = []
+    for i, token in enumerate(tokens):
+        if i % 3 == 0:
+            lines.append(token)
+        elif i % 3 == 1:
+            lines.append(json.dumps(token))
+        else:
+            lines.append(json.dumps({"name": f"step_{i}", "jwt": token}))
+        lines.append("")
+    path = tmp_path / "chain.jsonl"
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    assert list(iter_jsonl_tokens(path)) == tokens
+
+    records = list(iter_verify_chain(path, public_pem, progress_every=3, chunk_size=2))
+    assert [r["count"] for r in records if r["event"] == "progress"] == [3, 6]
+    assert records[-1]["event"] == "result"
+    assert records[-1]["ok"] is True
+    assert records[-1]["count"] == 7
+    last_payload = json.loads(base64.urlsafe_b64decode(tokens[-1].split(".")[1] + "=="))
+    assert records[-1]["head"] == last_payload["chain"]["entry_hash"]
+
+
+def test_iter_verify_chain_yields_error_then_stops() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _build_chain(private_pem, 5)
+    tokens[3] = tokens[1]
+
+    records = list(iter_verify_chain(iter(tokens), public_pem))
+    assert [r["event"] for r in records] == ["error", "result"]
+    assert records[0]["code"] == "CHAIN_LINK_MISMATCH"
+    assert records[0]["index"] == 3
+    assert records[1]["ok"] is False
+    assert records[1]["count"] == 3
+
+
+def test_iter_jsonl_tokens_rejects_non_token_lines(tmp_path: Path) -> None:
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"name": "no token"}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_jsonl_tokens(path))
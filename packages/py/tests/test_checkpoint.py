@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append  # noqa: E402
+from trustproof.__main__ import main  # noqa: E402
+from trustproof.archive import write_archive  # noqa: E402
+from trustproof.checkpoint import (  # noqa: E402
+    follow_chain,
+    load_checkpoint,
+    save_checkpoint,
+    verify_chain_incremental,
+)
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+class _Log:
+    def __init__(self, path: Path, private_pem: str) -> None:
+        self.path = path
+        self.private_pem = private_pem
+        self.tokens: list[str] = []
+        path.write_text("", encoding="utf-8")
+
+    def extend(self, count: int) -> None:
+        claims = _load_allow_claims()
+        with self.path.open("a", encoding="utf-8") as handle:
+            for _ in range(count):
+                prev = self.tokens[-1] if self.tokens else None
+                token = append(prev, {**claims, "jti": f"jti_{len(self.tokens)}"}, self.private_pem)
+                self.tokens.append(token)
+                handle.write(f"{token}\n")
+
+
+def _result(records) -> dict:
+    return [record for record in records if record["event"] == "result"][-1]
+
+
+def test_incremental_verification_only_checks_the_tail(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(5)
+
+    first = _result(verify_chain_incremental(log.path, public_pem, chunk_size=2))
+    assert first["ok"] is True
+    assert first["count"] == 5
+    checkpoint = first["checkpoint"]
+    assert checkpoint["index"] == 4
+    assert checkpoint["offset"] == log.path.stat().st_size
+
+    checkpoint_path = tmp_path / "chain.checkpoint.json"
+    save_checkpoint(checkpoint_path, checkpoint)
+    assert load_checkpoint(checkpoint_path) == checkpoint
+
+    log.extend(3)
+    second = _result(verify_chain_incremental(log.path, public_pem, checkpoint))
+    assert second["ok"] is True
+    assert second["count"] == 3
+    assert second["checkpoint"]["index"] == 7
+    assert second["checkpoint"]["chain_id"] == checkpoint["chain_id"]
+
+    tail_only = _result(verify_chain_incremental(log.tokens[5:], public_pem, checkpoint))
+    assert tail_only["count"] == 3
+    assert tail_only["head"] == second["head"]
+    resumed_from_iterable = _result(
+        verify_chain_incremental(log.path, public_pem, {**checkpoint, "offset": None})
+    )
+    assert resumed_from_iterable["count"] == 3
+
+
+def test_incremental_verification_rejects_bad_tail_and_wrong_key(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(4)
+    checkpoint = _result(verify_chain_incremental(log.path, public_pem))["checkpoint"]
+
+    with log.path.open("a", encoding="utf-8") as handle:
+        handle.write(f"{log.tokens[1]}\n")
+    failed = _result(verify_chain_incremental(log.path, public_pem, checkpoint))
+    assert failed["ok"] is False
+    assert failed["errors"][0]["code"] == "CHAIN_LINK_MISMATCH"
+    assert failed["errors"][0]["index"] == 4
+
+    _other_private, other_public = _generate_pem_keypair()
+    wrong_key = _result(verify_chain_incremental(log.path, other_public, checkpoint))
+    assert wrong_key["errors"][0]["code"] == "CHECKPOINT_KEY_MISMATCH"
+
+
+def test_follow_chain_picks_up_appended_entries(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(2)
+    checkpoint_path = tmp_path / "follow.checkpoint.json"
+
+    records = follow_chain(log.path, public_pem, checkpoint_path=checkpoint_path, poll_interval=0)
+    assert next(records)["count"] == 2
+
+    log.extend(3)
+    with log.path.open("a", encoding="utf-8") as handle:
+        handle.write(log.tokens[0][:20])
+    update = next(records)
+    assert update["count"] == 3
+    assert load_checkpoint(checkpoint_path)["index"] == 4
+    records.close()
+
+
+def test_cli_verify_chain_with_checkpoint(tmp_path: Path, capsys) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(3)
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    checkpoint_path = tmp_path / "cli.checkpoint.json"
+
+    argv = [
+        "verify-chain",
+        str(log.path),
+        "--pubkey",
+        str(pubkey_path),
+        "--checkpoint",
+        str(checkpoint_path),
+        "--json",
+    ]
+    assert main(argv) == 0
+    assert json.loads(capsys.readouterr().out)["count"] == 3
+
+    log.extend(2)
+    assert main(argv) == 0
+    assert json.loads(capsys.readouterr().out)["count"] == 2
+    assert load_checkpoint(checkpoint_path)["index"] == 4
+
+
+def test_incremental_verification_resumes_archives_by_index(tmp_path: Path, capsys) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(3)
+    archive_path = tmp_path / "chain.tpa"
+    write_archive(archive_path, log.tokens)
+
+    first = _result(verify_chain_incremental(archive_path, public_pem))
+    assert first["ok"] is True
+    assert first["checkpoint"]["index"] == 2
+    assert first["checkpoint"]["offset"] is None
+
+    log.extend(2)
+    write_archive(archive_path, log.tokens)
+    second = _result(verify_chain_incremental(archive_path, public_pem, first["checkpoint"]))
+    assert second["ok"] is True
+    assert second["count"] == 2
+    assert second["checkpoint"]["index"] == 4
+
+    write_archive(archive_path, log.tokens[:2])
+    shorter = _result(verify_chain_incremental(archive_path, public_pem, second["checkpoint"]))
+    assert shorter["errors"][0]["code"] == "CHECKPOINT_MISMATCH"
+
+    write_archive(archive_path, log.tokens)
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    checkpoint_path = tmp_path / "archive.checkpoint.json"
+    save_checkpoint(checkpoint_path, first["checkpoint"])
+    argv = ["verify-chain", str(archive_path), "--pubkey", str(pubkey_path)]
+    assert main([*argv, "--checkpoint", str(checkpoint_path), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["count"] == 2
+    assert load_checkpoint(checkpoint_path)["index"] == 4
+
+    records = follow_chain(archive_path, public_pem, poll_interval=0)
+    assert next(records)["count"] == 5
+    records.close()
+
+
+def test_malformed_checkpoints_are_rejected(tmp_path: Path, capsys) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    log = _Log(tmp_path / "chain.jsonl", private_pem)
+    log.extend(2)
+    checkpoint = _result(verify_chain_incremental(log.path, public_pem))["checkpoint"]
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    checkpoint_path = tmp_path / "bad.checkpoint.json"
+
+    bad = [
+        {**checkpoint, "version": 2},
+        {**checkpoint, "index": -1},
+        {**checkpoint, "index": True},
+        {**checkpoint, "offset": "12"},
+        {**checkpoint, "chain_id": None},
+        {**checkpoint, "kid": 7},
+    ]
+    for candidate in bad:
+        checkpoint_path.write_text(json.dumps(candidate), encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_checkpoint(checkpoint_path)
+        invalid = _result(verify_chain_incremental(log.path, public_pem, candidate))
+        assert invalid["errors"][0]["code"] == "CHECKPOINT_INVALID"
+
+    # The CLI reports a bad or truncated checkpoint file as an input error.
+    for text in (json.dumps({**checkpoint, "index": "4"}), '{"version": 1'):
+        checkpoint_path.write_text(text, encoding="utf-8")
+        argv = ["verify-chain", str(log.path), "--pubkey", str(pubkey_path)]
+        assert main([*argv, "--checkpoint", str(checkpoint_path), "--json"]) == 1
+        error = json.loads(capsys.readouterr().out)["errors"][0]
+        assert error["code"] == "INPUT_ERROR"
+        assert "Invalid checkpoint file" in error["message"]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append, generate  # noqa: E402
+from trustproof.__main__ import main  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_cli_verify_batch_emits_jsonl_and_stats(tmp_path: Path, monkeypatch, capsys) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(4)]
+    tokens[2] = tokens[2][:-4] + "AAAA"
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    tokens_path = tmp_path / "tokens.txt"
+    tokens_path.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+
+    for jobs in ("1", "2"):
+        argv = ["verify-batch", str(tokens_path), "--pubkey", str(pubkey_path), "--jobs", jobs]
+        assert main([*argv, "--json"]) == 1
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert [line["ok"] for line in lines] == [True, True, False, True]
+        assert lines[0]["jti"] == "jti_0"
+        stats = json.loads(captured.err)
+        assert stats["tokens"] == 4
+        assert stats["first_failing_index"] == 2
+        assert stats["p99_ms"] >= stats["p50_ms"] > 0
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(tokens[0] + "\n"))
+    assert main(["verify-batch", "--pubkey", other_public]) == 1
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["errors"][0]["code"] == "INVALID_SIGNATURE"
+    assert "first failing index: 0" in captured.err
+
+
+def test_cli_verify_chain_reports_stats(tmp_path: Path, capsys) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = []
+    prev = None
+    for i in range(5):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+    log_path = tmp_path / "chain.jsonl"
+    log_path.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+
+    argv = ["verify-chain", str(log_path), "--pubkey", str(pubkey_path), "--jobs", "2"]
+    assert main([*argv, "--json"]) == 0
+    record = json.loads(capsys.readouterr().out)
+    assert record["stats"]["tokens"] == 5
+    assert record["stats"]["first_failing_index"] is None
+
+    log_path.write_text("\n".join([tokens[0], tokens[2]]) + "\n", encoding="utf-8")
+    assert main(argv) == 1
+    captured = capsys.readouterr()
+    assert "CHAIN_LINK_MISMATCH" in captured.err
+    assert "first failing index: 1" in captured.err
+
+
+def test_cli_reports_malformed_lines_and_missing_files(tmp_path: Path, capsys) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(claims, private_pem)
+    pubkey_path = tmp_path / "pub.pem"
+    pubkey_path.write_text(public_pem, encoding="utf-8")
+    tokens_path = tmp_path / "tokens.txt"
+    tokens_path.write_text(f'{token}\n{{"jwt": 5}}\n{{not json\n{token}\n', encoding="utf-8")
+
+    for jobs in ("1", "2"):
+        argv = ["verify-batch", str(tokens_path), "--pubkey", str(pubkey_path), "--jobs", jobs]
+        assert main([*argv, "--json"]) == 1
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert [line["ok"] for line in lines] == [True, False, False, True]
+        assert lines[1]["errors"][0]["code"] == "INPUT_ERROR"
+        assert "Line 2" in lines[1]["errors"][0]["message"]
+        assert json.loads(captured.err)["tokens"] == 2
+
+    missing = str(tmp_path / "missing.jsonl")
+    assert main(["verify-batch", missing, "--pubkey", str(pubkey_path)]) == 1
+    assert capsys.readouterr().err.startswith("FAIL\n")
+    assert main(["verify-chain", missing, "--pubkey", str(pubkey_path), "--json"]) == 1
+    assert json.loads(capsys.readouterr().out)["errors"][0]["code"] == "INPUT_ERROR"
+    assert main(["verify-chain", str(tokens_path), "--pubkey", str(pubkey_path)]) == 1
+    assert "Line 2" in capsys.readouterr().err
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import ProofStore, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.columnar import ColumnarClaims, export_columnar  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _chain_tokens(private_pem: str, count: int) -> list[str]:
+    claims = _load_allow_claims()
+    tokens = []
+    prev = None
+    for i in range(count):
+        prev = append(
+            prev,
+            {
+                **claims,
+                "resource": {"type": "payout", "id": f"po_{i}"},
+                "result": {"decision": "deny" if i % 3 == 0 else "allow", "reason_codes": []},
+                "timestamp": f"2026-02-2{i % 10}T12:00:00Z",
+                "jti": f"jti_{i}",
+            },
+            private_pem,
+            "k1",
+        )
+        tokens.append(prev)
+    return tokens
+
+
+def test_export_round_trips_tokens_for_reverification(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 12)
+    claims = _load_allow_claims()
+    # Irregular shapes fall back to the per-row extra object.
+    odd = generate(
+        {
+            **claims,
+            "hashes": {
+                "output_hash": claims["hashes"]["output_hash"],
+                "input_hash": claims["hashes"]["input_hash"],
+            },
+            "custom": [1, 2.5, None, "caf\u00e9"],
+            "resource": {"id": "po_x", "type": "payout", "region": "eu"},
+        },
+        private_pem,
+    )
+    forged = tokens[4][:-4] + "AAAA"
+
+    table, rejected = export_columnar([*tokens, odd, forged], public_pem, chunk_size=5)
+    assert rejected == [13]
+    assert len(table) == 13
+    assert list(table.iter_tokens()) == [*tokens, odd]
+    assert table.claims(12)["custom"] == [1, 2.5, None, "caf\u00e9"]
+
+    path = tmp_path / "claims.tpc"
+    table.save(path)
+    loaded = ColumnarClaims.load(path)
+    assert list(loaded.iter_tokens()) == [*tokens, odd]
+    assert verify_chain(loaded.iter_tokens(range(12)), public_pem)["ok"] is True
+    assert verify(loaded.token(-1), public_pem)["ok"] is True
+    assert loaded.claims(3) == table.claims(3)
+    # Repeated sub-objects are stored once.
+    assert len(loaded._dictionaries["policy"].values) == 2
+    assert path.stat().st_size < sum(len(token) for token in tokens) / 2
+
+
+def test_select_filters_without_decoding_rows(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 12)
+    table, _rejected = export_columnar(tokens, public_pem)
+    path = tmp_path / "claims.tpc"
+    table.save(path)
+    loaded = ColumnarClaims.load(path)
+
+    assert loaded.select(decision="deny") == [0, 3, 6, 9]
+    assert loaded.select(since="2026-02-25T00:00:00Z", until="2026-02-27T23:59:59Z") == [5, 6, 7]
+    assert loaded.select(decision="allow", since="2026-02-28T00:00:00Z") == [8]
+    assert loaded.select(action="payout.initiate", resource_type="payout") == list(range(12))
+    assert loaded.select(subject_id="user_001") == list(range(12))
+    assert loaded.select(action="missing") == []
+    assert [c["jti"] for c in loaded.iter_claims(loaded.select(decision="deny"))] == [
+        "jti_0",
+        "jti_3",
+        "jti_6",
+        "jti_9",
+    ]
+    with pytest.raises(ValueError):
+        loaded.select(since="not a date")
+
+
+def test_select_time_range_is_half_open_like_proof_store(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 12)
+    table, _rejected = export_columnar(tokens, public_pem)
+    store = ProofStore(tmp_path / "proofs.sqlite")
+    store.ingest(tokens)
+
+    window = {"since": "2026-02-25T12:00:00Z", "until": "2026-02-27T12:00:00Z"}
+    assert table.select(**window) == [5, 6]
+    assert [record["jti"] for record in store.query(**window)] == ["jti_5", "jti_6"]
+    assert table.select(until="2026-02-20T12:00:00Z") == []
+    store.close()
+
+
+def test_load_rejects_foreign_and_truncated_files(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    table, _rejected = export_columnar(_chain_tokens(private_pem, 3), public_pem)
+    path = tmp_path / "claims.tpc"
+    table.save(path)
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(ValueError):
+        ColumnarClaims.load(path)
+    other = tmp_path / "other.json"
+    other.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ColumnarClaims.load(other)
+    with pytest.raises(IndexError):
+        table.token(3)
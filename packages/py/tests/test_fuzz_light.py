@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import base64
 import json
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -13,7 +15,7 @@ from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from trustproof import generate, verify, verify_chain  # noqa: E402
+from trustproof import Verifier, generate, verify, verify_chain  # noqa: E402
 
 
 def _load_allow_claims() -> dict:
@@ -113,3 +115,72 @@ def test_large_claims_verify_or_fail_gracefully() -> None:
         assert result["errors"] == []
     else:
         assert len(result["errors"]) > 0
+
+
+def _signed(private_pem: str, header: object, payload: object) -> str:
+    private_key = serialization.load_pem_private_key(private_pem.encode("utf-8"), password=None)
+
+    def segment(value: object) -> str:
+        raw = value if isinstance(value, bytes) else json.dumps(value).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    signing_input = f"{segment(header)}.{segment(payload)}"
+    signature = private_key.sign(signing_input.encode("ascii"))
+    return f"{signing_input}.{segment(signature)}"
+
+
+def test_fast_path_matches_pyjwt_on_fuzz_corpus() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    valid_token = generate(claims, private_pem)
+    header, payload, signature = valid_token.split(".")
+    now = int(time.time())
+    alg = {"alg": "EdDSA", "typ": "JWT"}
+
+    corpus = [
+        "",
+        "abc",
+        "a.b",
+        "a.b.c",
+        "....",
+        ".".join(valid_token.split(".")[:2]) + ".",
+        "a.b.c$",
+        valid_token,
+        valid_token + "=",
+        f"{header}=.{payload}.{signature}",
+        f"{header}.{payload}.{signature}==",
+        f"{header}.{payload}.{signature[:-1]}",
+        f"{header} .{payload}.{signature}",
+        _signed(private_pem, {"alg": "none"}, claims),
+        _signed(private_pem, {"alg": "HS256"}, claims),
+        _signed(private_pem, {"typ": "JWT"}, claims),
+        _signed(private_pem, {**alg, "crit": ["exp"]}, claims),
+        _signed(private_pem, {**alg, "kid": 7}, claims),
+        _signed(private_pem, ["EdDSA"], claims),
+        _signed(private_pem, alg, [claims]),
+        _signed(private_pem, alg, b"{not json"),
+        _signed(private_pem, alg, {**claims, "exp": now - 10}),
+        _signed(private_pem, alg, {**claims, "exp": now + 3600}),
+        _signed(private_pem, alg, {**claims, "exp": "soon"}),
+        _signed(private_pem, alg, {**claims, "nbf": now + 3600}),
+        _signed(private_pem, alg, {**claims, "nbf": now - 10}),
+        _signed(private_pem, alg, {**claims, "iat": now + 3600}),
+        _signed(private_pem, alg, {**claims, "iat": "yesterday"}),
+        _signed(private_pem, alg, {**claims, "sub": 5}),
+        _signed(private_pem, alg, {**claims, "jti": 5}),
+    ]
+    # Single-character substitutions across every segment.
+    for position in range(0, len(valid_token), 7):
+        for replacement in "A_-.=":
+            corpus.append(valid_token[:position] + replacement + valid_token[position + 1 :])
+
+    pyjwt = Verifier(public_pem)
+    fast = Verifier(public_pem, fast_path=True)
+    for token in corpus:
+        expected = pyjwt.verify(token)
+        actual = fast.verify(token)
+        assert actual["ok"] is expected["ok"], token
+        assert actual.get("claims") == expected.get("claims"), token
+        assert [error["code"] for error in actual["errors"]] == [
+            error["code"] for error in expected["errors"]
+        ], token
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import base64
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import KeyRing, Verifier, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.__main__ import main  # noqa: E402
+from trustproof.cache import VerifyCache  # noqa: E402
+from trustproof.checkpoint import verify_chain_incremental  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _mixed_key_chain(count: int = 6) -> tuple[list[str], dict[str, str]]:
+    # Rotates from k1 to k2 halfway through, as after a key rotation.
+    claims = _load_allow_claims()
+    old_private, old_public = _generate_pem_keypair()
+    new_private, new_public = _generate_pem_keypair()
+    tokens = []
+    prev = None
+    for i in range(count):
+        key, kid = (old_private, "k1") if i < count // 2 else (new_private, "k2")
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, key, kid)
+        tokens.append(prev)
+    return tokens, {"k1": old_public, "k2": new_public}
+
+
+def _jwks(public_keys: dict[str, str]) -> dict:
+    keys = []
+    for kid, public_pem in public_keys.items():
+        public_key = serialization.load_pem_public_key(public_pem.encode("utf-8"))
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        x = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        keys.append({"kty": "OKP", "crv": "Ed25519", "kid": kid, "x": x})
+    return {"keys": keys}
+
+
+def test_key_ring_verifies_mixed_key_chain() -> None:
+    tokens, public_keys = _mixed_key_chain()
+    ring = KeyRing(public_keys)
+
+    assert verify_chain(tokens, ring)["ok"] is True
+    assert verify_chain(tokens, ring, workers=2)["ok"] is True
+    assert verify(tokens[-1], ring)["ok"] is True
+    # A single key only covers its own half of the chain.
+    single = verify_chain(tokens, Verifier(public_keys["k1"]))
+    assert single["ok"] is False
+    assert single["errors"][0]["index"] == 3
+
+
+def test_key_ring_rejects_unknown_and_missing_kid() -> None:
+    claims = _load_allow_claims()
+    tokens, public_keys = _mixed_key_chain()
+    ring = KeyRing({"k1": public_keys["k1"]})
+
+    result = verify(tokens[-1], ring)
+    assert result["ok"] is False
+    assert result["errors"][0]["code"] == "INVALID_SIGNATURE"
+    assert "Unknown kid" in result["errors"][0]["details"]
+
+    private_pem, public_pem = _generate_pem_keypair()
+    no_kid = generate(claims, private_pem)
+    assert verify(no_kid, KeyRing({"k3": public_pem}))["ok"] is False
+    assert verify(no_kid, KeyRing({"k3": public_pem}, default_kid="k3"))["ok"] is True
+
+    ring.remove("k1")
+    assert verify(tokens[0], ring)["ok"] is False
+    with pytest.raises(ValueError):
+        KeyRing({"k1": public_keys["k1"]}, default_kid="missing")
+    with pytest.raises(ValueError):
+        KeyRing({"k1": "not a pem"})
+
+
+def test_key_ring_loads_directory_and_jwks(tmp_path: Path) -> None:
+    tokens, public_keys = _mixed_key_chain()
+    key_dir = tmp_path / "keys"
+    key_dir.mkdir()
+    for kid, public_pem in public_keys.items():
+        (key_dir / f"{kid}.pem").write_text(public_pem, encoding="utf-8")
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(json.dumps(_jwks(public_keys)), encoding="utf-8")
+
+    from_dir = KeyRing.from_directory(key_dir)
+    from_jwks = KeyRing.from_jwks(jwks_path)
+    assert sorted(from_dir.kids) == sorted(from_jwks.kids) == ["k1", "k2"]
+    assert from_dir.fingerprint == from_jwks.fingerprint
+    assert verify_chain(tokens, from_jwks)["ok"] is True
+
+    restored = pickle.loads(pickle.dumps(from_dir))
+    assert isinstance(restored, KeyRing)
+    assert restored.fingerprint == from_dir.fingerprint
+
+    with pytest.raises(ValueError):
+        KeyRing.from_jwks({"keys": [{"kty": "RSA", "kid": "r1"}]})
+    with pytest.raises(ValueError):
+        KeyRing.from_directory(tmp_path / "missing")
+
+
+def test_cli_accepts_key_directory_and_jwks(tmp_path: Path, capsys) -> None:
+    tokens, public_keys = _mixed_key_chain()
+    key_dir = tmp_path / "keys"
+    key_dir.mkdir()
+    for kid, public_pem in public_keys.items():
+        (key_dir / f"{kid}.pem").write_text(public_pem, encoding="utf-8")
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(json.dumps(_jwks(public_keys)), encoding="utf-8")
+    log_path = tmp_path / "chain.jsonl"
+    log_path.write_text("\n".join(tokens) + "\n", encoding="utf-8")
+
+    for pubkey in (key_dir, jwks_path):
+        assert main(["verify-chain", str(log_path), "--pubkey", str(pubkey), "--json"]) == 0
+        assert json.loads(capsys.readouterr().out.splitlines()[-1])["ok"] is True
+        assert main(["verify", tokens[0], "--pubkey", str(pubkey), "--json"]) == 0
+        capsys.readouterr()
+
+
+def test_key_rotation_keeps_checkpoints_and_cache_for_unchanged_keys() -> None:
+    tokens, public_keys = _mixed_key_chain()
+    cache = VerifyCache()
+    ring = KeyRing({"k1": public_keys["k1"]}, cache=cache, fast_path=True)
+    # KeyRing runs the Verifier initializer, so no option is left unset.
+    assert ring.fast_path is True
+    assert ring.strict_replay is True
+
+    *_, first = verify_chain_incremental(tokens[:3], ring)
+    assert first["ok"] is True
+    assert first["checkpoint"]["kid"] == "k1"
+    assert first["checkpoint"]["key_fingerprint"] == ring.key_fingerprint("k1")
+    assert ring.verify(tokens[0])["ok"] is True
+
+    # Rotating in k2 changes the ring but not k1's checkpoint or cache entries.
+    cached = len(cache)
+    ring.add("k2", public_keys["k2"])
+    assert len(cache) == cached
+    *_, resumed = verify_chain_incremental(tokens[3:], ring, first["checkpoint"])
+    assert resumed["ok"] is True
+    assert resumed["checkpoint"]["kid"] == "k2"
+    hits = cache.hits
+    assert ring.verify(tokens[0])["ok"] is True
+    assert cache.hits == hits + 1
+
+    # Revoking k1 invalidates what depended on it.
+    ring.remove("k1")
+    assert len(cache) == len(tokens) - cached
+    *_, refused = verify_chain_incremental(tokens[3:], ring, first["checkpoint"])
+    assert refused["errors"][0]["code"] == "CHECKPOINT_KEY_MISMATCH"
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append  # noqa: E402
+from trustproof.merkle import (  # noqa: E402
+    MerkleTree,
+    _leaf_hash,
+    _node_hash,
+    root_from_inclusion_proof,
+    sign_root,
+    verify_inclusion,
+)
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _reference_root(leaves: list[bytes]) -> bytes:
+    # RFC 6962 MTH: split at the largest power of two smaller than n.
+    if len(leaves) == 1:
+        return leaves[0]
+    split = 1
+    while split * 2 < len(leaves):
+        split *= 2
+    return _node_hash(_reference_root(leaves[:split]), _reference_root(leaves[split:]))
+
+
+def test_merkle_tree_matches_rfc6962_for_every_prefix() -> None:
+    entry_hashes = [os.urandom(32).hex() for _ in range(19)]
+    tree = MerkleTree(entry_hashes)
+
+    for size in range(1, len(entry_hashes) + 1):
+        leaves = [_leaf_hash(entry_hash) for entry_hash in entry_hashes[:size]]
+        root = tree.root(size)
+        assert root == _reference_root(leaves).hex()
+        for index in range(size):
+            proof = tree.inclusion_proof(index, size)
+            assert len(proof) <= size.bit_length()
+            assert root_from_inclusion_proof(entry_hashes[index], index, size, proof) == root
+
+
+def test_verify_inclusion_against_signed_root() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    other_private, _other_public = _generate_pem_keypair()
+    tokens = []
+    prev = None
+    for i in range(11):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+
+    tree = MerkleTree.from_tokens(tokens)
+    chain_id = tree.chain_id
+    signed_root = sign_root(tree, private_pem, kid="merkle-1")
+    proof = tree.inclusion_proof(6)
+
+    result = verify_inclusion(tokens[6], 6, proof, signed_root, public_pem, chain_id=chain_id)
+    assert result["ok"] is True
+    assert result["size"] == 11
+
+    wrong_index = verify_inclusion(tokens[5], 6, proof, signed_root, public_pem, chain_id=chain_id)
+    assert wrong_index["errors"][0]["code"] == "INCLUSION_PROOF_INVALID"
+
+    truncated = verify_inclusion(
+        tokens[6], 6, proof[:-1], signed_root, public_pem, chain_id=chain_id
+    )
+    assert truncated["errors"][0]["code"] == "INCLUSION_PROOF_INVALID"
+
+    foreign_root = sign_root(tree, other_private)
+    rejected = verify_inclusion(tokens[6], 6, proof, foreign_root, public_pem, chain_id=chain_id)
+    assert rejected["errors"][0]["code"] == "INVALID_SIGNED_ROOT"
+
+    old_root = sign_root(tree, private_pem, size=8)
+    old_proof = tree.inclusion_proof(3, size=8)
+    assert verify_inclusion(
+        tokens[3], 3, old_proof, old_root, public_pem, chain_id=chain_id
+    )["ok"] is True
+
+    with pytest.raises(ValueError):
+        tree.inclusion_proof(11)
+
+
+def test_signed_root_is_bound_to_its_chain() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    chains = []
+    for name in ("a", "b"):
+        tokens = []
+        prev = None
+        for i in range(4):
+            prev = append(prev, {**claims, "jti": f"{name}_{i}"}, private_pem)
+            tokens.append(prev)
+        chains.append((tokens, MerkleTree.from_tokens(tokens)))
+    (tokens_a, tree_a), (tokens_b, tree_b) = chains
+    assert tree_a.chain_id != tree_b.chain_id
+
+    root_b = sign_root(tree_b, private_pem)
+    proof = tree_b.inclusion_proof(2)
+    own = verify_inclusion(tokens_b[2], 2, proof, root_b, public_pem, chain_id=tree_b.chain_id)
+    assert own["ok"] is True
+    assert own["chain_id"] == tree_b.chain_id
+    # Chain b's root does not vouch for anything claimed to be in chain a.
+    foreign = verify_inclusion(tokens_b[2], 2, proof, root_b, public_pem, chain_id=tree_a.chain_id)
+    assert foreign["errors"][0]["code"] == "CHAIN_ID_MISMATCH"
+
+    with pytest.raises(ValueError):
+        sign_root(MerkleTree(), private_pem)
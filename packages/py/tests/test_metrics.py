@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.canonical import canonical_json  # noqa: E402
+from trustproof.metrics import InMemoryMetrics  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_verify_records_phases_and_error_counters() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    metrics = InMemoryMetrics()
+    payload = {"amount_cents": 1200, "currency": "USD"}
+    token = generate(claims, private_pem, metrics=metrics)
+
+    plain = verify(token, public_pem, payload)
+    metered = verify(token, public_pem, payload, metrics=metrics)
+    assert metered == plain
+    verify(token, other_public, metrics=metrics)
+
+    snapshot = metrics.snapshot()
+    phases = snapshot["phases"]
+    for phase in (
+        "generate.prepare",
+        "generate.serialize",
+        "generate.signature",
+        "verify.decode",
+        "verify.signature",
+        "verify.schema",
+        "verify.hash_input",
+        "verify.total",
+    ):
+        assert phases[phase]["count"] >= 1, phase
+    assert phases["verify.signature"]["count"] == 2
+    assert "verify.claims" not in phases
+    assert phases["verify.total"]["p99"] >= phases["verify.total"]["min"]
+    assert sum(count for _bound, count in phases["verify.total"]["buckets"]) == 2
+
+    counters = snapshot["counters"]
+    assert counters["generate.tokens"] == 1
+    assert counters["verify.failed"] == 2
+    assert counters["verify.errors.INPUT_HASH_MISMATCH"] == 1
+    assert counters["verify.errors.INVALID_SIGNATURE"] == 1
+    assert counters["bytes_hashed"] == len(canonical_json(payload).encode("utf-8"))
+
+    metrics.reset()
+    assert metrics.snapshot() == {"phases": {}, "counters": {}}
+
+    # The fast path checks registered claims separately from the signature.
+    assert Verifier(public_pem, fast_path=True).verify(token, metrics=metrics)["ok"] is True
+    assert metrics.snapshot()["phases"]["verify.claims"]["count"] == 1
+
+
+def test_verify_chain_records_entry_phases() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = []
+    prev = None
+    for i in range(4):
+        prev = append(prev, {**claims, "jti": f"jti_{i}"}, private_pem)
+        tokens.append(prev)
+
+    metrics = InMemoryMetrics()
+    verifier = Verifier(public_pem, metrics=metrics)
+    assert verify_chain(tokens, verifier)["ok"] is True
+    assert verify_chain([tokens[0], tokens[2]], verifier, metrics=metrics)["ok"] is False
+
+    # A Verifier's own sink sees every signature; chain phases need metrics=.
+    snapshot = metrics.snapshot()
+    assert snapshot["phases"]["verify.signature"]["count"] == 6
+    assert snapshot["phases"]["chain.entry"]["count"] == 2
+    assert snapshot["phases"]["chain.canonical_material"]["count"] == 2
+    assert snapshot["counters"]["chain.entries"] == 1
+    assert snapshot["counters"]["chain.errors.CHAIN_LINK_MISMATCH"] == 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, VerifyLimits, generate, verify_chain  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_precheck_rejects_before_decoding() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(claims, private_pem, kid="k1")
+    limits = VerifyLimits(max_token_bytes=4096, max_payload_bytes=2048, kids=["k1"])
+    verifier = Verifier(public_pem, limits=limits)
+    assert verifier.verify(token)["ok"] is True
+
+    header, payload, signature = token.split(".")
+    rejected = {
+        "oversized": token + "A" * 4096,
+        "two segments": f"{header}.{payload}",
+        "bad characters": f"{header}.{payload}!.{signature}",
+        "large payload": f"{header}.{'A' * 3000}.{signature}",
+        "wrong kid": generate(claims, private_pem, kid="k2"),
+        "no kid": generate(claims, private_pem),
+    }
+    for label, candidate in rejected.items():
+        result = verifier.verify(candidate)
+        assert result["ok"] is False, label
+        assert result["errors"][0]["code"] == "INVALID_SIGNATURE", label
+
+    assert "exceeds 4096 bytes" in verifier.verify(rejected["oversized"])["errors"][0]["details"]
+    assert "Payload exceeds" in verifier.verify(rejected["large payload"])["errors"][0]["details"]
+
+    with pytest.raises(ValueError):
+        VerifyLimits(algorithms=("HS256",))
+
+
+def test_limits_survive_pickling_for_worker_pools() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    verifier = Verifier(public_pem, limits=VerifyLimits(kids=["k1"]))
+    clone = pickle.loads(pickle.dumps(verifier))
+    assert clone.limits.kids == frozenset({"k1"})
+
+    token = generate(claims, private_pem)
+    assert verify_chain([token], verifier, workers=2)["errors"][0]["code"] == "INVALID_PROOF"
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import jwt  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Proof, Verifier, VerifyResult, aio, generate  # noqa: E402
+from trustproof.replay import MemoryReplayStore  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_proof_splits_once_and_decodes_claims_lazily() -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    token = generate(_load_allow_claims(), private_pem, kid="k1")
+
+    proof = Proof(token)
+    assert proof.kid == "k1"
+    assert proof._claims is None
+    assert proof.jti == _load_allow_claims()["jti"]
+    assert proof["chain"]["entry_hash"] == proof.entry_hash
+    assert proof.claims is proof.claims
+    assert not hasattr(proof, "__dict__")
+    assert pickle.loads(pickle.dumps(proof)).claims == proof.claims
+
+    with pytest.raises(jwt.DecodeError):
+        Proof("not-a-token")
+
+
+def test_verify_proof_matches_the_dict_result() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    claims = _load_allow_claims()
+    token = generate(claims, private_pem)
+    verifier = Verifier(public_pem)
+
+    cases = [
+        (verifier, token, {}),
+        (verifier, token, {"expected_input": {"different": True}}),
+        (Verifier(other_public), token, {}),
+        (verifier, "not-a-token", {}),
+    ]
+    for case_verifier, case_token, kwargs in cases:
+        expected = case_verifier.verify(case_token, **kwargs)
+        result = case_verifier.verify_proof(case_token, **kwargs)
+        assert isinstance(result, VerifyResult)
+        assert result.to_dict() == expected
+        assert result.ok is expected["ok"]
+        assert result.codes == tuple(error["code"] for error in expected["errors"])
+
+    passing = verifier.verify_proof(Proof(token))
+    assert passing.ok and passing.claims is passing.proof.claims
+    assert passing._errors is verifier.verify_proof(token)._errors
+    assert not hasattr(passing, "__dict__")
+
+
+def test_verify_proof_consumes_jti_once() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(_load_allow_claims(), private_pem)
+    verifier = Verifier(public_pem, MemoryReplayStore())
+
+    first = verifier.verify_proof(token)
+    second = verifier.verify_proof(token)
+    assert first.ok and first.replay_risk is False
+    assert not second.ok and second.replay_risk is True
+    assert second.codes == ("REPLAY_DETECTED",)
+    assert verifier.verify_proof(token, check_replay=False).replay_risk is None
+
+
+def test_verify_result_pickles_without_its_proof() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(_load_allow_claims(), private_pem)
+    result = Verifier(public_pem).verify_proof(token, {"different": True})
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored.proof is None
+    assert restored.to_dict() == result.to_dict()
+
+
+def test_async_verify_many_can_return_result_objects() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    claims = _load_allow_claims()
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(5)]
+    tokens.append("not-a-token")
+
+    results = asyncio.run(aio.verify_many(tokens, public_pem, chunk_size=2, as_objects=True))
+    assert [result.ok for result in results] == [True] * 5 + [False]
+    assert results[-1].codes == ("INVALID_SIGNATURE",)
+    assert results[0].claims["jti"] == "jti_0"
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append  # noqa: E402
+from trustproof.__main__ import main  # noqa: E402
+from trustproof._jws import decode_untrusted  # noqa: E402
+from trustproof.archive import ProofArchive, write_archive  # noqa: E402
+from trustproof.rebuild import ChainIndex, rebuild_chains  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _chain_tokens(private_pem: str, count: int, prev: str | None = None, tag: str = "a") -> list[str]:
+    claims = _load_allow_claims()
+    tokens = []
+    for i in range(count):
+        prev = append(prev, {**claims, "jti": f"jti_{tag}_{i}"}, private_pem)
+        tokens.append(prev)
+    return tokens
+
+
+def test_rebuilds_shuffled_chains_and_verifies_them() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    first = _chain_tokens(private_pem, 12, tag="a")
+    second = _chain_tokens(private_pem, 5, tag="b")
+    shuffled = first + second
+    random.Random(7).shuffle(shuffled)
+
+    report = rebuild_chains(iter(shuffled), public_pem)
+    assert report["ok"] is True, report["errors"]
+    assert report["count"] == 17
+    assert sorted(chain["length"] for chain in report["chains"]) == [5, 12]
+    assert all(chain["root"] == "genesis" and chain["ok"] for chain in report["chains"])
+    assert report["forks"] == [] and report["gaps"] == [] and report["orphans"] == []
+
+    with ChainIndex(shuffled) as index:
+        rebuilt = sorted((list(index.tokens(segment)) for _r, _p, segment in index.chains), key=len)
+    assert rebuilt == [second, first]
+
+
+def test_reports_forks_gaps_duplicates_and_invalid_entries() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    trunk = _chain_tokens(private_pem, 4, tag="trunk")
+    branch = _chain_tokens(private_pem, 2, prev=trunk[1], tag="branch")
+    detached = _chain_tokens(private_pem, 3, tag="detached")
+    tokens = trunk + branch + detached[1:] + [trunk[0], "not-a-token"]
+
+    report = rebuild_chains(tokens, public_pem)
+    assert report["ok"] is False
+    codes = {error["code"] for error in report["errors"]}
+    assert codes == {"CHAIN_FORK", "CHAIN_GAP", "INVALID_PROOF"}
+    assert report["forks"][0]["position"] == 1
+    assert report["forks"][0]["children"] == [2, 4]
+    missing_hash = decode_untrusted(detached[0])["chain"]["entry_hash"]
+    assert report["gaps"] == [{"missing_hash": missing_hash, "children": [6]}]
+    assert report["duplicates"] == 1 and report["conflicting_duplicates"] == []
+    assert report["invalid"] == [9]
+    # Every rebuilt segment still verifies against its claimed parent.
+    assert all(chain["ok"] for chain in report["chains"])
+    assert sorted((chain["root"], chain["length"]) for chain in report["chains"]) == [
+        ("fork", 2),
+        ("fork", 2),
+        ("gap", 2),
+        ("genesis", 2),
+    ]
+
+
+def test_reports_failed_signatures_with_input_positions() -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 3)
+
+    report = rebuild_chains(list(reversed(tokens)), other_public)
+    assert report["ok"] is False
+    assert report["chains"][0]["ok"] is False
+    assert report["errors"][0]["position"] == 2
+    assert report["errors"][0]["chain"] == 0
+
+
+def test_rebuild_reads_archives_in_place(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 6)
+    path = tmp_path / "shuffled.tpa"
+    write_archive(path, [tokens[i] for i in (3, 0, 5, 1, 4, 2)])
+
+    with ProofArchive(path) as archive:
+        report = rebuild_chains(archive, public_pem, workers=2)
+    assert report["ok"] is True
+    assert report["chains"][0]["start"] == 1
+    assert report["chains"][0]["length"] == 6
+
+
+def test_cli_rebuild_chains(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _chain_tokens(private_pem, 4)
+    log = tmp_path / "proofs.jsonl"
+    log.write_text("".join(json.dumps({"token": t}) + "\n" for t in tokens[::-1]), encoding="utf-8")
+    pubkey = tmp_path / "pub.pem"
+    pubkey.write_text(public_pem, encoding="utf-8")
+
+    assert main(["rebuild-chains", str(log), "--pubkey", str(pubkey), "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["ok"] is True
+    assert report["chains"][0]["length"] == 4
+
+    log.write_text("".join(json.dumps({"token": t}) + "\n" for t in tokens[1:]), encoding="utf-8")
+    assert main(["rebuild-chains", str(log)]) == 1
+    captured = capsys.readouterr()
+    assert "gaps: 1" in captured.out
+    assert "CHAIN_GAP" in captured.err
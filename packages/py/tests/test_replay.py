@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.replay import (  # noqa: E402
+    BloomReplayStore,
+    MemoryReplayStore,
+    ReplayStore,
+    ReplayStoreFull,
+    SQLiteReplayStore,
+)
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_memory_replay_store_purges_by_expiry_and_fails_closed_when_full() -> None:
+    store = MemoryReplayStore(max_entries=3)
+    now = time.time()
+    far = now + 3600
+    assert store.check_and_add("a", far) is True
+    assert store.check_and_add("a", far) is False
+    assert store.check_and_add("soon", now + 0.05) is True
+    # A hit on "a" must not hide the expiring entry behind it.
+    assert store.check_and_add("a", far) is False
+    assert store.check_and_add("b", far) is True
+    with pytest.raises(ReplayStoreFull):
+        store.check_and_add("c", far)
+    # Live jtis are never dropped to make room.
+    assert store.check_and_add("a", far) is False
+
+    time.sleep(0.06)
+    assert store.check_and_add("c", far) is True
+    assert len(store) == 3
+
+    fresh = MemoryReplayStore(max_entries=1)
+    assert fresh.check_and_add("expired", time.time() - 1) is True
+    assert fresh.check_and_add("expired", far) is True
+
+
+def test_verify_fails_closed_when_the_replay_store_is_full() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    verifier = Verifier(public_pem, MemoryReplayStore(max_entries=1), strict_replay=False)
+    first = generate({**claims, "jti": "jti_0"}, private_pem)
+    second = generate({**claims, "jti": "jti_1"}, private_pem)
+
+    assert verifier.verify(first)["ok"] is True
+    rejected = verifier.verify(second)
+    assert rejected["ok"] is False
+    assert rejected["replay_risk"] is True
+    assert rejected["errors"][0]["code"] == "REPLAY_STORE_FULL"
+    assert verifier.verify_proof(second).codes == ("REPLAY_STORE_FULL",)
+
+
+def test_bloom_store_warms_from_a_persistent_backing(tmp_path: Path) -> None:
+    class CountingStore(SQLiteReplayStore):
+        lookups = 0
+
+        def check_and_add(self, jti: str, expires_at: float) -> bool:
+            self.lookups += 1
+            return super().check_and_add(jti, expires_at)
+
+    path = tmp_path / "replay.sqlite3"
+    far = time.time() + 3600
+    store = BloomReplayStore(CountingStore(path), capacity=1000)
+    assert store.check_and_add("jti_a", far) is True
+    assert store.check_and_add("jti_a", far) is False
+    store.backing.close()
+
+    # After a restart the filter knows jti_a; new jtis skip SQLite.
+    restarted = BloomReplayStore(CountingStore(path), capacity=1000)
+    assert restarted.check_and_add("jti_a", far) is False
+    assert restarted.backing.lookups == 1
+    assert all(restarted.check_and_add(f"jti_{i}", far) for i in range(50))
+    assert restarted.backing.lookups < 5
+    restarted.backing.close()
+
+
+def test_bloom_store_checks_a_backing_that_cannot_list_jtis() -> None:
+    class OpaqueStore(ReplayStore):
+        def __init__(self) -> None:
+            self.seen = {"jti_a"}
+            self.lookups = 0
+
+        def check_and_add(self, jti: str, expires_at: float) -> bool:
+            self.lookups += 1
+            if jti in self.seen:
+                return False
+            self.seen.add(jti)
+            return True
+
+    store = BloomReplayStore(OpaqueStore(), capacity=1000)
+    assert store.check_and_add("jti_a", time.time() + 60) is False
+    assert store.check_and_add("jti_b", time.time() + 60) is True
+    assert store.backing.lookups == 2
+
+
+def test_bloom_store_admits_a_racing_new_jti_once() -> None:
+    class SlowStore(MemoryReplayStore):
+        def add(self, jti: str, expires_at: float) -> None:
+            time.sleep(0.05)
+            super().add(jti, expires_at)
+
+    store = BloomReplayStore(SlowStore(), capacity=1000)
+    results: list[bool] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.check_and_add("jti", time.time() + 60)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [False, True]
+
+
+@pytest.mark.parametrize("backend", ["memory", "bloom", "sqlite"])
+def test_verify_rejects_replayed_jti(tmp_path: Path, backend: str) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    if backend == "memory":
+        store = MemoryReplayStore()
+    elif backend == "bloom":
+        store = BloomReplayStore(MemoryReplayStore(), capacity=1000)
+    else:
+        store = SQLiteReplayStore(tmp_path / "replay.sqlite3", batch_size=2)
+
+    tokens = [generate({**claims, "jti": f"jti_{i}"}, private_pem) for i in range(3)]
+    for token in tokens:
+        result = verify(token, public_pem, replay_store=store)
+        assert result["ok"] is True
+        assert result["replay_risk"] is False
+
+    replayed = verify(tokens[0], public_pem, replay_store=store)
+    assert replayed["ok"] is False
+    assert replayed["replay_risk"] is True
+    assert replayed["errors"][0]["code"] == "REPLAY_DETECTED"
+
+    if backend == "sqlite":
+        store.close()
+        reopened = SQLiteReplayStore(tmp_path / "replay.sqlite3")
+        assert reopened.check_and_add("jti_2", time.time() + 60) is False
+        reopened.close()
+
+
+def test_replay_store_only_consumes_valid_proofs() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    store = MemoryReplayStore()
+    token = generate(claims, private_pem)
+
+    assert verify(token, other_public, replay_store=store)["ok"] is False
+    assert len(store) == 0
+
+    advisory = Verifier(public_pem, store, strict_replay=False)
+    assert advisory.verify(token)["replay_risk"] is False
+    second = advisory.verify(token)
+    assert second["ok"] is True
+    assert second["replay_risk"] is True
+
+
+def test_verify_chain_ignores_replay_store() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    first = append(None, {**claims, "jti": "jti_0"}, private_pem)
+    second = append(first, {**claims, "jti": "jti_1"}, private_pem)
+    verifier = Verifier(public_pem, MemoryReplayStore())
+
+    assert verify_chain([first, second], verifier)["ok"] is True
+    assert verify_chain([first, second], verifier)["ok"] is True
+
+
+def test_replay_store_requires_check_and_add() -> None:
+    class Incomplete(ReplayStore):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import append, iter_verify_chain, verify_chain  # noqa: E402
+from trustproof.segments import (  # noqa: E402
+    iter_chain_checkpoints,
+    nearest_chain_checkpoint,
+    sign_chain_checkpoint,
+    verify_chain_segmented,
+)
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _build_chain(private_pem: str, length: int, tag: str = "") -> list[str]:
+    claims = _load_allow_claims()
+    tokens = []
+    prev = None
+    for i in range(length):
+        prev = append(prev, {**claims, "jti": f"jti{tag}_{i}"}, private_pem)
+        tokens.append(prev)
+    return tokens
+
+
+def test_segmented_verification_matches_verify_chain() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _build_chain(private_pem, 10)
+    checkpoints = list(iter_chain_checkpoints(tokens, private_pem, every=3))
+    assert len(checkpoints) == 3
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert verify_chain_segmented(tokens, public_pem, checkpoints, executor=pool) == {
+            "ok": True,
+            "errors": [],
+        }
+
+    tampered = list(tokens)
+    tampered[7] = _build_chain(private_pem, 8, tag="x")[7]
+    segmented = verify_chain_segmented(tampered, public_pem, checkpoints)
+    assert segmented["ok"] is False
+    assert segmented["errors"] == verify_chain(tampered, public_pem)["errors"]
+
+    # Entry 5 is replaced but still links from 4; only the checkpoint at 5 catches it.
+    forked = tokens[:5] + [append(tokens[4], {**_load_allow_claims(), "jti": "fork"}, private_pem)]
+    forked += tokens[6:]
+    result = verify_chain_segmented(forked, public_pem, checkpoints)
+    assert result["errors"][0]["code"] == "CHECKPOINT_MISMATCH"
+    assert result["errors"][0]["index"] == 5
+
+
+def test_segmented_verification_rejects_foreign_checkpoints() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    other_private, _other_public = _generate_pem_keypair()
+    tokens = _build_chain(private_pem, 4)
+
+    foreign = list(iter_chain_checkpoints(tokens, other_private, every=2))
+    assert verify_chain_segmented(tokens, public_pem, foreign)["errors"][0]["code"] == (
+        "INVALID_CHECKPOINT"
+    )
+
+    other_chain = _build_chain(private_pem, 4, tag="o")
+    wrong_chain = list(iter_chain_checkpoints(other_chain, private_pem, every=2))
+    assert verify_chain_segmented(tokens, public_pem, wrong_chain)["errors"][0]["code"] == (
+        "CHECKPOINT_MISMATCH"
+    )
+
+    with pytest.raises(ValueError):
+        sign_chain_checkpoint("zz", 0, "00" * 32, private_pem)
+
+
+def test_resume_from_nearest_chain_checkpoint() -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    tokens = _build_chain(private_pem, 9)
+    checkpoints = list(iter_chain_checkpoints(tokens, private_pem, every=4))
+
+    assert nearest_chain_checkpoint(checkpoints, 3, public_pem) is None
+    anchor = nearest_chain_checkpoint(checkpoints, 8, public_pem)
+    assert anchor is not None and anchor["index"] == 7
+
+    start = anchor["index"] + 1
+    records = list(
+        iter_verify_chain(
+            tokens[start:],
+            public_pem,
+            start_index=start,
+            previous_entry_hash=anchor["entry_hash"],
+        )
+    )
+    assert records[-1]["ok"] is True
+    assert records[-1]["count"] == 1
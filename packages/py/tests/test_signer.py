@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import jwt  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Signer, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.generate import as_signer  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+@pytest.mark.parametrize("kid", [None, "key-2026-01"])
+def test_signer_output_is_byte_identical_to_pyjwt(kid: str | None) -> None:
+    claims = {**_load_allow_claims(), "iat": 1_772_000_000}
+    private_pem, _public_pem = _generate_pem_keypair()
+
+    headers = {"alg": "EdDSA", "typ": "JWT"}
+    if kid is not None:
+        headers["kid"] = kid
+    expected = jwt.encode(claims, private_pem, algorithm="EdDSA", headers=headers)
+
+    assert Signer(private_pem).sign(claims, kid=kid) == expected
+    assert generate(claims, private_pem, kid=kid) == expected
+
+
+def test_signer_copy_modes() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+
+    signer.sign(claims)
+    assert "iat" not in claims
+
+    owned = json.loads(json.dumps(claims))
+    token = signer.sign(owned, copy_claims=False)
+    assert "iat" in owned
+    assert verify(token, public_pem)["claims"] == owned
+
+
+def test_signer_rejects_invalid_claims() -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    signer = Signer(private_pem)
+    with pytest.raises(ValueError):
+        signer.sign({"jti": ""})
+    with pytest.raises(ValueError):
+        signer.sign("not-a-dict")  # type: ignore[arg-type]
+
+
+def test_append_accepts_signer() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    signer = pickle.loads(pickle.dumps(Signer(private_pem)))
+
+    first = append(None, {**claims, "jti": "jti_1"}, signer, kid="k1")
+    second = append(first, {**claims, "jti": "jti_2"}, signer, kid="k1")
+
+    assert jwt.get_unverified_header(second)["kid"] == "k1"
+    assert verify_chain([first, second], public_pem)["ok"] is True
+
+
+def test_pem_strings_are_not_cached_at_module_level() -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    assert as_signer(private_pem) is not as_signer(private_pem)
+    signer = Signer(private_pem)
+    assert as_signer(signer) is signer
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+_CRYPTO_CHECK = (
+    "import sys\n"
+    "{body}\n"
+    "loaded = sorted(m for m in sys.modules if m.split('.')[0] in ('jwt', 'cryptography'))\n"
+    "print(','.join(loaded))\n"
+)
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SRC, os.environ.get("PYTHONPATH", "")])}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def test_import_does_not_load_crypto_stack() -> None:
+    result = _run(_CRYPTO_CHECK.format(body="import trustproof"))
+    assert result.stdout.strip() == ""
+
+
+def test_inspect_and_help_do_not_load_crypto_stack() -> None:
+    body = (
+        "import contextlib, io\n"
+        "from trustproof.__main__ import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    assert main(['inspect', 'e30.eyJhIjoxfQ.sig']) == 0\n"
+        "    try:\n"
+        "        main(['--help'])\n"
+        "    except SystemExit:\n"
+        "        pass"
+    )
+    result = _run(_CRYPTO_CHECK.format(body=body))
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes_resolve_to_public_api() -> None:
+    import trustproof
+    from trustproof.generate import generate
+    from trustproof.verify import Verifier, verify
+
+    assert trustproof.verify is verify
+    assert trustproof.generate is generate
+    assert trustproof.Verifier is Verifier
+    assert set(trustproof.__all__) <= set(dir(trustproof))
+
+
+def test_functions_survive_later_submodule_imports() -> None:
+    # aio imports the generate/verify submodules, which must not replace the
+    # package-level functions of the same name.
+    body = (
+        "import trustproof.aio, trustproof\n"
+        "assert callable(trustproof.generate) and callable(trustproof.verify)\n"
+        "assert not isinstance(trustproof.verify, type(trustproof))"
+    )
+    _run(body)
+    # Nor may importing them directly, before the package names are used.
+    body = (
+        "import sys\n"
+        "from trustproof.verify import Verifier, verify\n"
+        "import trustproof.generate, trustproof\n"
+        "assert trustproof.verify is verify and callable(trustproof.generate)\n"
+        "assert type(trustproof) is type(sys)"
+    )
+    _run(body)
+
+
+def test_import_time_is_below_crypto_stack() -> None:
+    # Relative budget: importing trustproof must cost less than importing
+    # PyJWT alone, which it used to pull in eagerly.
+    result = _run("import trustproof\nimport jwt", "-X", "importtime")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, total, name = line[len("import time:") :].split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    assert cumulative["trustproof"] < cumulative["jwt"]
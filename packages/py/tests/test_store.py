@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import ProofStore, append, generate  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def _build_store(tmp_path: Path, private_pem: str) -> tuple[ProofStore, list[str]]:
+    claims = _load_allow_claims()
+    tokens = []
+    prev = None
+    for i in range(6):
+        decision = "deny" if i % 2 else "allow"
+        agent = f"agent_{i % 3}"
+        token = append(
+            prev,
+            {
+                **claims,
+                "subject": {"type": "agent", "id": agent},
+                "result": {"decision": decision, "reason_codes": []},
+                "timestamp": f"2026-02-2{i}T12:00:00Z",
+                "jti": f"jti_{i}",
+            },
+            private_pem,
+        )
+        tokens.append(token)
+        prev = token
+    store = ProofStore(tmp_path / "proofs.sqlite3")
+    assert store.ingest(tokens, batch_size=4) == 6
+    assert store.ingest(tokens) == 0
+    return store, tokens
+
+
+def test_proof_store_queries_indexed_fields(tmp_path: Path) -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    store, tokens = _build_store(tmp_path, private_pem)
+
+    denies = store.query(subject_type="agent", subject_id="agent_1", decision="deny")
+    assert [row["jti"] for row in denies] == ["jti_1"]
+    assert denies[0]["token"] == tokens[1]
+
+    window = store.query(since="2026-02-21T00:00:00Z", until="2026-02-24T00:00:00Z")
+    assert [row["jti"] for row in window] == ["jti_1", "jti_2", "jti_3"]
+    assert store.count(action="payout.initiate") == 6
+    assert store.query(jti="jti_4", limit=1)[0]["verified"] is None
+
+    with pytest.raises(ValueError):
+        store.query(colour="red")
+
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM proofs "
+        "WHERE subject_type = ? AND subject_id = ? AND ts >= ?",
+        ("agent", "agent_1", 0),
+    ).fetchall()
+    assert "proofs_subject" in " ".join(str(row) for row in plan)
+    store.close()
+
+
+def test_proof_store_tracks_verification(tmp_path: Path) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    _other_private, other_public = _generate_pem_keypair()
+    store, _tokens = _build_store(tmp_path, private_pem)
+
+    forged = generate({**_load_allow_claims(), "jti": "forged"}, _other_private)
+    assert store.ingest([forged], verifier=public_pem) == 1
+    assert store.query(jti="forged")[0]["verified"] is False
+
+    assert store.verify_pending(public_pem, batch_size=4) == {"verified": 6, "failed": 0}
+    assert store.count(verified=True) == 6
+    assert store.count(verified=False) == 1
+    assert store.verify_pending(other_public) == {"verified": 0, "failed": 0}
+
+    with pytest.raises(ValueError):
+        store.ingest(["not-a-token"])
+    store.close()
+
+
+def test_ingest_upgrades_verified_flags_without_rechecking(tmp_path: Path, monkeypatch) -> None:
+    private_pem, public_pem = _generate_pem_keypair()
+    other_private, other_public = _generate_pem_keypair()
+    store, tokens = _build_store(tmp_path, private_pem)
+    forged = generate({**_load_allow_claims(), "jti": "forged"}, other_private)
+
+    assert store.ingest([forged, *tokens[:2]], verifier=public_pem) == 1
+    assert store.count(verified=True) == 2
+    assert store.query(jti="forged")[0]["verified"] is False
+    # A later check with the right key raises the flag; a failing one never lowers it.
+    assert store.ingest([forged], verifier=other_public) == 0
+    assert store.ingest(tokens[:1], verifier=other_public) == 0
+    assert store.query(jti="forged")[0]["verified"] is True
+    assert store.query(jti="jti_0")[0]["verified"] is True
+
+    from trustproof.verify import Verifier
+
+    checked: list[str] = []
+    original = Verifier.verify
+
+    def counting(self, token, *args, **kwargs):
+        checked.append(token)
+        return original(self, token, *args, **kwargs)
+
+    monkeypatch.setattr(Verifier, "verify", counting)
+    assert store.ingest(tokens, verifier=public_pem) == 0
+    assert checked == tokens[2:]
+    assert store.count(verified=True) == 7
+    store.close()
+
+
+def test_iter_tokens_streams_in_batches(tmp_path: Path) -> None:
+    private_pem, _public_pem = _generate_pem_keypair()
+    store, tokens = _build_store(tmp_path, private_pem)
+
+    stream = store.iter_tokens(batch_size=4, since="2026-02-21T00:00:00Z")
+    assert next(stream) == tokens[1]
+    # Other calls can use the store between batches.
+    assert store.count() == 6
+    assert list(stream) == tokens[2:]
+    assert list(store.iter_tokens(batch_size=1, decision="deny")) == tokens[1::2]
+    with pytest.raises(ValueError):
+        next(store.iter_tokens(batch_size=0))
+    store.close()
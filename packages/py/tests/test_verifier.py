@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+import jwt  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import Verifier, append, generate, verify, verify_chain  # noqa: E402
+from trustproof.verify import as_verifier  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_verifier_matches_verify_function() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(claims, private_pem, kid="k1")
+
+    verifier = Verifier(public_pem)
+    result = verifier.verify(token)
+
+    assert result["ok"] is True
+    assert result == verify(token, public_pem)
+    assert result["claims"] == jwt.decode(token, public_pem, algorithms=["EdDSA"])
+
+
+def test_verifier_rejects_what_pyjwt_rejects() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    token = generate(claims, private_pem)
+    header, payload, signature = token.split(".")
+    flipped = signature[:-2] + ("A" if signature[-2] != "A" else "B") + signature[-1]
+
+    none_header = jwt.utils.base64url_encode(b'{"alg":"none","typ":"JWT"}').decode("ascii")
+    bad_tokens = [
+        f"{header}.{payload}.{flipped}",
+        f"{none_header}.{payload}.{signature}",
+        f"{header}.{payload}!.{signature}",
+        f"{header}.{payload}",
+        generate({**claims, "exp": int(time.time()) - 10}, private_pem),
+        generate({**claims, "nbf": int(time.time()) + 3600}, private_pem),
+    ]
+
+    verifier = Verifier(public_pem)
+    for bad_token in bad_tokens:
+        with pytest.raises(jwt.InvalidTokenError):
+            jwt.decode(bad_token, public_pem, algorithms=["EdDSA"])
+        result = verifier.verify(bad_token)
+        assert result["ok"] is False
+        assert result["errors"][0]["code"] == "INVALID_SIGNATURE"
+
+
+def test_verifier_rejects_non_ed25519_key() -> None:
+    with pytest.raises(ValueError):
+        Verifier("-----BEGIN PUBLIC KEY-----\nnot-a-key\n-----END PUBLIC KEY-----\n")
+
+
+def test_verifier_is_picklable_and_reused_by_verify_chain() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    first = append(None, {**claims, "jti": "jti_1"}, private_pem)
+    second = append(first, {**claims, "jti": "jti_2"}, private_pem)
+
+    verifier = pickle.loads(pickle.dumps(Verifier(public_pem)))
+    assert verify_chain([first, second], verifier) == {"ok": True, "errors": []}
+
+
+def test_pem_strings_are_not_cached_at_module_level() -> None:
+    _private_pem, public_pem = _generate_pem_keypair()
+    assert as_verifier(public_pem) is not as_verifier(public_pem)
+    verifier = Verifier(public_pem)
+    assert as_verifier(verifier) is verifier
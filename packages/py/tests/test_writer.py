@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from trustproof import ChainWriter, append, verify_chain  # noqa: E402
+from trustproof.writer import FileHeadStore, SQLiteHeadStore  # noqa: E402
+
+
+def _load_allow_claims() -> dict:
+    repo_root = Path(__file__).resolve().parents[3]
+    allow_path = repo_root / "spec" / "examples" / "allow.json"
+    return json.loads(allow_path.read_text(encoding="utf-8"))
+
+
+def _generate_pem_keypair() -> tuple[str, str]:
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+    public_pem = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("utf-8")
+
+    return private_pem, public_pem
+
+
+def test_chain_writer_handles_concurrent_chains() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    writer = ChainWriter(private_pem)
+    chain_ids = [f"session-{i}" for i in range(4)]
+
+    def write(chain_id: str) -> list[str]:
+        return [
+            writer.append(chain_id, {**claims, "jti": f"{chain_id}-{i}"}) for i in range(6)
+        ]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        chains = dict(zip(chain_ids, pool.map(write, chain_ids)))
+
+    for chain_id, tokens in chains.items():
+        assert verify_chain(tokens, public_pem)["ok"] is True
+        assert writer.head(chain_id) is not None
+
+
+@pytest.mark.parametrize("store_kind", ["file", "sqlite"])
+def test_chain_writer_resumes_from_persisted_heads(tmp_path: Path, store_kind: str) -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+
+    def make_store():
+        if store_kind == "file":
+            return FileHeadStore(tmp_path / "heads.json")
+        return SQLiteHeadStore(tmp_path / "heads.sqlite")
+
+    first_writer = ChainWriter(private_pem, head_store=make_store())
+    tokens = [first_writer.append("agent-1", {**claims, "jti": f"jti_{i}"}) for i in range(2)]
+
+    restarted = ChainWriter(private_pem, head_store=make_store())
+    tokens.append(restarted.append("agent-1", {**claims, "jti": "jti_2"}))
+    assert verify_chain(tokens, public_pem)["ok"] is True
+
+
+def test_chain_writer_seeds_existing_chain() -> None:
+    claims = _load_allow_claims()
+    private_pem, public_pem = _generate_pem_keypair()
+    existing = append(None, {**claims, "jti": "jti_0"}, private_pem)
+
+    writer = ChainWriter(private_pem, kid="k1")
+    writer.seed("legacy", existing)
+    token = writer.append("legacy", {**claims, "jti": "jti_1"})
+    assert verify_chain([existing, token], public_pem)["ok"] is True
+
+    with pytest.raises(ValueError):
+        writer.append("", claims)
+
+
+@pytest.mark.parametrize("store_kind", ["file", "sqlite"])
+def test_head_stores_batch_commits_until_flushed(tmp_path: Path, store_kind: str) -> None:
+    def make_store(batch_size: int = 1):
+        if store_kind == "file":
+            return FileHeadStore(tmp_path / "heads.json", batch_size=batch_size)
+        return SQLiteHeadStore(tmp_path / "heads.sqlite", batch_size=batch_size)
+
+    store = make_store(batch_size=3)
+    store.set("a", "1" * 64)
+    store.set("b", "2" * 64)
+    assert store.get("a") == "1" * 64
+    assert make_store().get("a") is None
+
+    store.set("c", "3" * 64)
+    assert make_store().get("c") == "3" * 64
+    store.set("a", "4" * 64)
+    store.close()
+    reopened = make_store()
+    assert [reopened.get(chain) for chain in "abc"] == ["4" * 64, "2" * 64, "3" * 64]
+
+    with pytest.raises(ValueError):
+        make_store(batch_size=0)
+
+
+@pytest.mark.parametrize("store_kind", ["file", "sqlite"])
+def test_concurrent_appends_share_durable_head_commits(tmp_path: Path, store_kind: str) -> None:
+    claims = _load_allow_claims()
+    private_pem, _public_pem = _generate_pem_keypair()
+    if store_kind == "file":
+        store = FileHeadStore(tmp_path / "heads.json")
+    else:
+        store = SQLiteHeadStore(tmp_path / "heads.sqlite")
+    writer = ChainWriter(private_pem, head_store=store)
+    chain_ids = [f"session-{i}" for i in range(8)]
+
+    def write(chain_id: str) -> None:
+        for i in range(5):
+            writer.append(chain_id, {**claims, "jti": f"{chain_id}-{i}"})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, chain_ids))
+
+    # batch_size=1: every head is durable once append() has returned.
+    if store_kind == "file":
+        reopened = FileHeadStore(tmp_path / "heads.json")
+    else:
+        reopened = SQLiteHeadStore(tmp_path / "heads.sqlite")
+    assert all(reopened.get(chain_id) == writer.head(chain_id) for chain_id in chain_ids)